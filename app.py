@@ -1,7 +1,8 @@
 import streamlit as st
 from dotenv import load_dotenv
 from collections import defaultdict
-from supabase import create_client
+from creator_pipeline.utils.db import iter_rows
+from creator_pipeline.utils.http_pool import connect_supabase, pooled_http_client
 import json
 import os
 from datetime import datetime
@@ -10,7 +11,15 @@ load_dotenv()
 
 supabase_url = os.environ.get("SUPABASE_URL")
 supabase_api_key = os.environ.get("SUPBASE_KEY")
-supabase = create_client(supabase_url, supabase_api_key)
+
+
+@st.cache_resource
+def get_supabase():
+    # One client and connection pool per server process, not one per script rerun
+    return connect_supabase(supabase_url, supabase_api_key, pooled_http_client())
+
+
+supabase = get_supabase()
 
 st.set_page_config(page_title="Krux", layout="centered")
 
@@ -146,9 +155,15 @@ def build_sources_html(raw_sources):
 
 
 # ── Fetch data ──
+_ARTICLE_COLUMNS = ['id', 'event_id', 'model_provider', 'news_date', 'created_at', 'headline', 'output', 'sources']
+
+
 @st.cache_data(ttl=300)
 def get_all_articles():
-    return supabase.table('hundred_word_articles').select("*").order('news_date', desc=True).execute().data
+    # Keyset pages, so every article is read however large the table grows
+    articles = list(iter_rows(supabase, 'hundred_word_articles', _ARTICLE_COLUMNS))
+    articles.sort(key=lambda a: a.get('news_date') or '', reverse=True)
+    return articles
 
 articles = get_all_articles()
 
@@ -3,14 +3,17 @@ import json
 import os
 from parallel import Parallel
 from dotenv import load_dotenv
-from supabase  import create_client, Client
+from supabase import Client
+from creator_pipeline.utils.bulk_writer import BulkWriter
+from creator_pipeline.utils.http_pool import connect_supabase, pooled_http_client
 load_dotenv()
 api_key = os.environ.get("PARALLEL_API_KEY")
 client = Parallel(api_key=api_key)
 
 supabase_url = os.environ.get("SUPABASE_URL")
 supabase_api_key = os.environ.get("SUPBASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_api_key)
+# Every request handler shares one pooled HTTP/2 connection to Supabase
+supabase: Client = connect_supabase(supabase_url, supabase_api_key, pooled_http_client())
 from httpx import Response
 
 app = Flask(__name__)
@@ -32,13 +35,18 @@ def load_monitor_type_map():
 
 MONITOR_TYPE_MAP = load_monitor_type_map()
 
-def save_webhook(data):
+def save_webhooks(rows):
+    # One multi-row insert per event group instead of one request per event
+    writer = BulkWriter(supabase, 'webhooks')
     try:
-        result = supabase.table('webhooks').insert(data).execute()
-        return result.data[0]
+        writer.extend(rows)
+        writer.flush()
     except Exception as e:
         print(f"Error in Supabase: {e}")
-        return None
+        return []
+    if writer.conflicts:
+        print(f"Skipped {len(writer.conflicts)} duplicate webhook rows")
+    return writer.written
 
 @app.route('/')
 def home():
@@ -70,6 +78,7 @@ def receive_webhook():
 
             print(group['events'])
 
+            rows = []
             for event in group.get('events',[]):
                 news_data = {
                     "timestamp": webhook_data.get('timestamp'),
@@ -82,8 +91,9 @@ def receive_webhook():
                     "source_urls": event.get('source_urls',[]),
                     "full_data": webhook_data
                 }
+                rows.append(news_data)
 
-                save_webhook(news_data)
+            save_webhooks(rows)
 
         except Exception as e:
             print("Error in finding the data")
@@ -1,10 +1,35 @@
 from openai import OpenAI
-from supabase import create_client
 
-from .config import OPENAI_API_KEY, SUPABASE_KEY, SUPABASE_URL
+from .config import (
+    LLM_CACHE_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_HOURS,
+    LLM_RATE_LIMITS,
+    OPENAI_API_KEY,
+    SUPABASE_HTTP2,
+    SUPABASE_KEY,
+    SUPABASE_MAX_CONNECTIONS,
+    SUPABASE_TIMEOUT_SECONDS,
+    SUPABASE_URL,
+)
+from .repository import Repository
+from .utils.http_pool import connect_supabase, pooled_http_client
+from .utils.llm_cache import ResponseCache
+from .utils.rate_limit import configure_limits, parse_limits
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase_http = pooled_http_client(SUPABASE_MAX_CONNECTIONS, SUPABASE_TIMEOUT_SECONDS, http2=SUPABASE_HTTP2)
+supabase = connect_supabase(SUPABASE_URL, SUPABASE_KEY, supabase_http)
+repo = Repository(supabase)
+repo.requests.instrument(supabase_http)
 openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+configure_limits(parse_limits(LLM_RATE_LIMITS))
+llm_cache = ResponseCache(
+    LLM_CACHE_DIR,
+    ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    enabled=LLM_CACHE_ENABLED,
+)
 
 
 def require_openai_client() -> OpenAI:
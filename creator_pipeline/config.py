@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(ROOT_DIR / ".env")
+CACHE_DIR = ROOT_DIR / ".cache"  # local state that must survive a crashed run
 
 IST = ZoneInfo("Asia/Kolkata")
 
@@ -45,3 +46,18 @@ CREATOR_WEBHOOK_URL = optional_env(
     "CREATOR_PARALLEL_WEBHOOK_URL",
     "https://ai-times-6utx.onrender.com/parallel-webhooks",
 )
+
+# One pooled HTTP/2 client carries every Supabase request; SUPABASE_HTTP2=0 uses HTTP/1.1
+SUPABASE_MAX_CONNECTIONS = int(optional_env("SUPABASE_MAX_CONNECTIONS") or 10)
+SUPABASE_HTTP2 = optional_env("SUPABASE_HTTP2", "1") != "0"
+SUPABASE_TIMEOUT_SECONDS = float(optional_env("SUPABASE_TIMEOUT_SECONDS") or 60)
+
+# Disk cache for LLM responses, shared with krux-pipeline; LLM_CACHE=0 disables it
+LLM_CACHE_ENABLED = optional_env("LLM_CACHE", "1") != "0"
+LLM_CACHE_DIR = Path(optional_env("LLM_CACHE_DIR") or CACHE_DIR / "llm")
+LLM_CACHE_TTL_HOURS = float(optional_env("LLM_CACHE_TTL_HOURS") or 72)
+LLM_CACHE_MAX_ENTRIES = int(optional_env("LLM_CACHE_MAX_ENTRIES") or 5000)
+
+# Shared LLM quota, e.g. "openai=500/200000,openai:gpt-5.4=100/100000"
+# (requests/min[/input tokens/min] per provider or provider:model)
+LLM_RATE_LIMITS = optional_env("LLM_RATE_LIMITS")
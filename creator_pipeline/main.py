@@ -2,7 +2,9 @@ import argparse
 import json
 import logging
 
+from .clients import repo
 from .steps import hourly, selector
+from .utils.retry import circuit_states
 
 
 def main() -> None:
@@ -28,6 +30,8 @@ def main() -> None:
         results["youtube_processed"] = youtube_monitor.run(youtube_monitor.DEFAULT_CREATORS)
     if args.step in {"selector", "all"}:
         results["candidates_selected"] = selector.run(dry_run=args.dry_run)
+    results["circuits"] = circuit_states()
+    results["supabase"] = repo.requests.summary()
     print(json.dumps(results, indent=2))
 
 
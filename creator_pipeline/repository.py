@@ -0,0 +1,108 @@
+from typing import TypedDict
+
+from .utils.bulk_writer import BulkWriter
+from .utils.http_pool import RequestCounter
+
+
+class TopicCandidateRow(TypedDict, total=False):
+    id: str
+    candidate_key: str
+    raw_webhook_ids: list
+    source_type: str
+    title: str
+    summary: str
+    category: str
+    suggested_angle: str
+    why_relevant: str
+    recommended_format: str | None
+    language: str | None
+    score: int
+    status: str
+    selection_reason: str
+    source_urls: list[dict]
+    metadata: dict
+
+
+class ResearchBriefRow(TypedDict, total=False):
+    id: str
+    topic_id: str
+    brief: str
+    key_facts: list
+    examples: list
+    caveats: list
+    source_urls: list[dict]
+    metadata: dict
+
+
+class Repository:
+    """The creator tables behind one Supabase client.
+
+    clients.py builds it on the process-wide connection pool; `requests`
+    counts and times each table's traffic.
+    """
+
+    def __init__(self, client, requests: RequestCounter | None = None):
+        self.client = client
+        self.requests = requests or RequestCounter()
+
+    def writer(self, table: str, **kwargs) -> BulkWriter:
+        return BulkWriter(self.client, table, **kwargs)
+
+    def upsert_many(self, table: str, rows: list[dict], on_conflict: str, **kwargs) -> list[dict]:
+        """Upsert rows in multi-row requests. Returns the rows written."""
+        with self.writer(table, on_conflict=on_conflict, **kwargs) as writer:
+            writer.extend(rows)
+        return writer.written
+
+    # ── webhooks / creator_raw_webhooks ──
+
+    def recent_monitor_webhooks(self, monitor_ids: list[str], columns: str = "*", limit: int = 500) -> list[dict]:
+        """The newest `limit` webhooks rows from the given Parallel monitors."""
+        return (
+            self.client.table("webhooks")
+            .select(columns)
+            .in_("monitor_id", monitor_ids)
+            .order("created_at", desc=True)
+            .limit(limit)
+            .execute()
+            .data
+        )
+
+    def upsert_raw_webhook(self, record: dict) -> dict | None:
+        result = self.client.table("creator_raw_webhooks").upsert(record, on_conflict="dedupe_hash").execute()
+        return result.data[0] if result.data else None
+
+    def raw_webhook_writer(self, chunk_size: int = 200) -> BulkWriter:
+        return self.writer("creator_raw_webhooks", chunk_size=chunk_size, on_conflict="dedupe_hash")
+
+    # ── creator_topic_candidates ──
+
+    def get_topic(self, topic_id: str) -> TopicCandidateRow:
+        return self.client.table("creator_topic_candidates").select("*").eq("id", topic_id).single().execute().data
+
+    def upsert_topic_candidates(self, rows: list[TopicCandidateRow]) -> list[TopicCandidateRow]:
+        # One upsert can't touch the same row twice, so the last row per key wins
+        unique = list({row["candidate_key"]: row for row in rows}.values())
+        return self.upsert_many("creator_topic_candidates", unique, on_conflict="candidate_key")
+
+    def set_topic_status(self, topic_id: str, status: str) -> None:
+        self.client.table("creator_topic_candidates").update({"status": status}).eq("id", topic_id).execute()
+
+    # ── creator_research_briefs / creator_scripts ──
+
+    def insert_research_brief(self, record: ResearchBriefRow) -> ResearchBriefRow:
+        return self.client.table("creator_research_briefs").insert(record).execute().data[0]
+
+    def latest_research_brief(self, topic_id: str) -> ResearchBriefRow | None:
+        result = (
+            self.client.table("creator_research_briefs")
+            .select("*")
+            .eq("topic_id", topic_id)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def insert_script(self, record: dict) -> dict:
+        return self.client.table("creator_scripts").insert(record).execute().data[0]
@@ -2,8 +2,9 @@ import argparse
 import json
 from pathlib import Path
 
-from ..clients import require_openai_client
+from ..clients import llm_cache, require_openai_client
 from ..reference_library import DEFAULT_REFERENCE_FILE, DEFAULT_TAGS_FILE, load_reference_examples
+from ..utils.rate_limit import rate_limited
 
 DEFAULT_OUTPUT_FILE = Path(__file__).resolve().parent.parent / "data" / "tej_style_profile.md"
 
@@ -66,7 +67,9 @@ def build_payload(limit_transcript_chars: int = 2500) -> list[dict]:
 
 
 def build_style_profile(output_file: Path = DEFAULT_OUTPUT_FILE) -> str:
-    response = require_openai_client().responses.create(
+    response = llm_cache.create(
+        rate_limited("openai", require_openai_client().responses.create),
+        "openai.responses",
         model="gpt-5-nano",
         instructions=SYSTEM_PROMPT,
         input="Reference transcripts and metadata:\n\n"
@@ -3,9 +3,10 @@ import json
 import logging
 import re
 
-from ..clients import require_openai_client, supabase
+from ..clients import llm_cache, repo, require_openai_client
 from ..prompts.deep_research import SYSTEM_PROMPT
 from ..utils.json import safe_load_json
+from ..utils.rate_limit import rate_limited
 from ..utils.retry import retry
 
 logger = logging.getLogger(__name__)
@@ -34,23 +35,19 @@ def validate_research_language(research: dict) -> None:
 
 
 def fetch_topic(topic_id: str) -> dict:
-    result = (
-        supabase.table("creator_topic_candidates")
-        .select("*")
-        .eq("id", topic_id)
-        .single()
-        .execute()
-    )
-    return result.data
+    return repo.get_topic(topic_id)
 
 
-@retry(max_attempts=4)
+@retry(max_attempts=4, circuit="openai")
 def research_topic(topic: dict) -> dict:
     research_topic_payload = dict(topic)
     research_topic_payload.pop("language", None)
     research_topic_payload.pop("recommended_format", None)
 
-    response = require_openai_client().responses.create(
+    response = llm_cache.create(
+        rate_limited("openai", require_openai_client().responses.create),
+        "openai.responses",
+        validate=lambda r: validate_research_language(safe_load_json(r.output_text)),
         model="gpt-5-nano",
         tools=[{"type": "web_search"}],
         include=["web_search_call.action.sources"],
@@ -75,9 +72,9 @@ def save_research(topic_id: str, research: dict) -> dict:
         "source_urls": research.get("source_urls", []),
         "metadata": {"audience_takeaways": research.get("audience_takeaways", [])},
     }
-    result = supabase.table("creator_research_briefs").insert(record).execute()
-    supabase.table("creator_topic_candidates").update({"status": "researched"}).eq("id", topic_id).execute()
-    return result.data[0]
+    saved = repo.insert_research_brief(record)
+    repo.set_topic_status(topic_id, "researched")
+    return saved
 
 
 def run(topic_id: str) -> dict:
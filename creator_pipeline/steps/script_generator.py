@@ -4,13 +4,19 @@ import logging
 import re
 import time
 
-from ..clients import require_openai_client, supabase
+from ..clients import llm_cache, repo, require_openai_client
 from ..prompts.script_writer import SYSTEM_PROMPT
 from ..reference_library import load_style_profile, select_reference_examples
 from ..utils.json import safe_load_json
+from ..utils.prompt_packer import pack_record, pack_records, truncate_tokens
+from ..utils.rate_limit import rate_limited
 
 logger = logging.getLogger(__name__)
 
+_REFERENCE_TOKEN_BUDGET = 2_500
+_TOPIC_FIELDS = ["summary", "suggested_angle", "why_relevant", "recommended_format", "language", "source_urls"]
+_RESEARCH_FIELDS = ["key_facts", "examples", "caveats", "source_urls", "metadata"]
+
 
 BAD_SCRIPT_PATTERNS = [
     r"\b3[- ]step\b",
@@ -75,31 +81,17 @@ def validate_script_quality(script: dict) -> None:
 
 
 def fetch_topic(topic_id: str) -> dict:
-    return (
-        supabase.table("creator_topic_candidates")
-        .select("*")
-        .eq("id", topic_id)
-        .single()
-        .execute()
-        .data
-    )
+    return repo.get_topic(topic_id)
 
 
 def fetch_latest_research(topic_id: str) -> dict:
-    result = (
-        supabase.table("creator_research_briefs")
-        .select("*")
-        .eq("topic_id", topic_id)
-        .order("created_at", desc=True)
-        .limit(1)
-        .execute()
-    )
-    if not result.data:
+    research = repo.latest_research_brief(topic_id)
+    if research is None:
         raise ValueError(f"No research brief found for topic {topic_id}")
-    return result.data[0]
+    return research
 
 
-def build_reference_payload(topic: dict, limit: int = 4, transcript_chars: int = 1800) -> list[dict]:
+def build_reference_payload(topic: dict, limit: int = 4, transcript_tokens: int = 450) -> list[dict]:
     examples = select_reference_examples(topic, limit=limit)
     payload = []
     for example in examples:
@@ -114,7 +106,7 @@ def build_reference_payload(topic: dict, limit: int = 4, transcript_chars: int =
                 "language": example.get("language"),
                 "views": example.get("views"),
                 "performance_score": example.get("performance_score"),
-                "transcript_excerpt": transcript[:transcript_chars],
+                "transcript_excerpt": truncate_tokens(transcript, transcript_tokens),
             }
         )
     return payload
@@ -127,11 +119,21 @@ def _build_generation_payload(
     reference_examples: list[dict],
     validation_feedback: dict | None = None,
 ) -> dict:
+    # Row ids, timestamps and status columns are dropped; references fill a fixed budget
+    packed_topic = pack_record(topic, ["title", "category"], _TOPIC_FIELDS, label="script topic")
+    packed_research = pack_record(research, ["brief"], _RESEARCH_FIELDS, label="script research")
+    packed_references = pack_records(
+        reference_examples,
+        required=["title", "transcript_excerpt"],
+        optional=["topic_category", "content_format", "language", "views", "performance_score"],
+        budget=_REFERENCE_TOKEN_BUDGET,
+        label="script references",
+    )
     payload = {
-        "topic": topic,
-        "research": research,
+        "topic": packed_topic.items[0],
+        "research": packed_research.items[0],
         "style_profile": style_profile,
-        "reference_transcript_examples": reference_examples,
+        "reference_transcript_examples": packed_references.items,
     }
     if validation_feedback:
         payload["validation_feedback_from_previous_attempt"] = validation_feedback
@@ -153,7 +155,10 @@ def generate_script(topic: dict, research: dict, style_profile: str, reference_e
             reference_examples,
             validation_feedback,
         )
-        response = require_openai_client().responses.create(
+        response = llm_cache.create(
+            rate_limited("openai", require_openai_client().responses.create),
+            "openai.responses",
+            validate=lambda r: safe_load_json(r.output_text),
             model="gpt-5.4",
             instructions=SYSTEM_PROMPT,
             input=json.dumps(payload, default=str, ensure_ascii=False),
@@ -214,9 +219,9 @@ def save_script(topic_id: str, research_id: str, script: dict, reference_example
             ],
         },
     }
-    result = supabase.table("creator_scripts").insert(record).execute()
-    supabase.table("creator_topic_candidates").update({"status": "scripted"}).eq("id", topic_id).execute()
-    return result.data[0]
+    saved = repo.insert_script(record)
+    repo.set_topic_status(topic_id, "scripted")
+    return saved
 
 
 def run(topic_id: str) -> dict:
@@ -1,17 +1,21 @@
 import argparse
-import json
 import logging
 from datetime import datetime
 
-from ..clients import require_openai_client, supabase
+from ..clients import llm_cache, repo, require_openai_client
 from ..parallel_monitors import load_map
 from ..prompts.topic_selector import SYSTEM_PROMPT
+from ..utils.dedup import dedupe_by_text
 from ..utils.hash import stable_hash
 from ..utils.json import safe_load_json
+from ..utils.prompt_packer import pack_records
+from ..utils.rate_limit import rate_limited
 from ..utils.retry import retry
 
 logger = logging.getLogger(__name__)
 
+_SELECT_TOKEN_BUDGET = 20_000
+
 
 def fetch_raw_webhooks(limit: int = 80) -> list[dict]:
     monitor_map = load_map()
@@ -20,38 +24,38 @@ def fetch_raw_webhooks(limit: int = 80) -> list[dict]:
         logger.warning("No creator monitor IDs found in creator_monitor_map.json.")
         return []
 
-    result = (
-        supabase.table("webhooks")
-        .select("id, news_output, news_date, source_urls, monitor_type, monitor_id, event_group_id, created_at")
-        .in_("monitor_id", monitor_ids)
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
+    rows = repo.recent_monitor_webhooks(
+        monitor_ids,
+        "id, news_output, news_date, source_urls, monitor_type, monitor_id, event_group_id, created_at",
+        limit=limit,
     )
 
-    unique = []
-    seen = set()
-    for row in result.data:
-        key = (row.get("news_output") or "").strip()
-        if not key or key in seen:
-            continue
-        seen.add(key)
-        unique.append(row)
-    return unique
+    return dedupe_by_text(rows, "news_output")
 
 
-@retry(max_attempts=4)
+@retry(max_attempts=4, circuit="openai")
 def select_topics(raw_items: list[dict]) -> dict:
-    response = require_openai_client().responses.create(
+    packed = pack_records(
+        raw_items,
+        required=["id", "news_output"],
+        optional=["news_date", "source_urls", "monitor_type"],
+        budget=_SELECT_TOKEN_BUDGET,
+        caps={"news_output": 400},
+        label="topic selection",
+    )
+    response = llm_cache.create(
+        rate_limited("openai", require_openai_client().responses.create),
+        "openai.responses",
+        validate=lambda r: safe_load_json(r.output_text),
         model="gpt-5-nano",
         instructions=SYSTEM_PROMPT,
-        input="Raw monitor events:\n\n" + json.dumps(raw_items, default=str, ensure_ascii=False),
+        input="Raw monitor events:\n\n" + packed.to_json(),
     )
     return safe_load_json(response.output_text)
 
 
 def save_candidates(selection: dict, dry_run: bool = False) -> int:
-    count = 0
+    records = []
     for item in selection.get("items", []):
         candidate_key = stable_hash(
             {
@@ -78,12 +82,10 @@ def save_candidates(selection: dict, dry_run: bool = False) -> int:
         }
         if dry_run:
             logger.info("[DRY RUN] Would save candidate: %s", record["title"])
-        else:
-            supabase.table("creator_topic_candidates").upsert(
-                record, on_conflict="candidate_key"
-            ).execute()
-        count += 1
-    return count
+        records.append(record)
+    if not dry_run:
+        repo.upsert_topic_candidates(records)
+    return len(records)
 
 
 def run(limit: int = 80, dry_run: bool = False) -> int:
@@ -2,7 +2,7 @@ import argparse
 import json
 from datetime import datetime
 
-from ..clients import supabase
+from ..clients import repo
 from ..parallel_monitors import load_map
 from ..utils.hash import stable_hash
 
@@ -21,15 +21,7 @@ def fetch_creator_rows(limit: int = 500) -> list[dict]:
     monitor_ids = list(monitor_map.keys())
     if not monitor_ids:
         return []
-    result = (
-        supabase.table("webhooks")
-        .select("*")
-        .in_("monitor_id", monitor_ids)
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return result.data
+    return repo.recent_monitor_webhooks(monitor_ids, limit=limit)
 
 
 def to_creator_record(row: dict) -> dict:
@@ -61,16 +53,18 @@ def to_creator_record(row: dict) -> dict:
     }
 
 
-def sync(limit: int = 500, dry_run: bool = False) -> int:
+def sync(limit: int = 500, dry_run: bool = False, chunk_size: int = 200) -> int:
     rows = fetch_creator_rows(limit=limit)
+    writer = repo.raw_webhook_writer(chunk_size=chunk_size)
     count = 0
     for row in rows:
         record = to_creator_record(row)
         if dry_run:
             print(json.dumps(record, ensure_ascii=False, default=str)[:800])
         else:
-            supabase.table("creator_raw_webhooks").upsert(record, on_conflict="dedupe_hash").execute()
+            writer.add(record)
         count += 1
+    writer.flush()
     return count
 
 
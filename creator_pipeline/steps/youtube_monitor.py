@@ -1,5 +1,6 @@
 import argparse
 import json
+import logging
 import os
 import tempfile
 from datetime import datetime, timedelta
@@ -10,10 +11,12 @@ from googleapiclient.discovery import build
 from pydub import AudioSegment
 from sarvamai import SarvamAI
 
-from ..clients import require_openai_client, supabase
-from ..config import SARVAM_API_KEY, YOUTUBE_API_KEY
+from ..clients import llm_cache, repo, require_openai_client
+from ..config import CACHE_DIR, SARVAM_API_KEY, YOUTUBE_API_KEY
 from ..utils.hash import stable_hash
 from ..utils.json import safe_load_json
+from ..utils.openai_batch import ResponsesBatch
+from ..utils.rate_limit import rate_limited
 from ..utils.retry import retry
 
 DEFAULT_CREATORS = [
@@ -24,6 +27,10 @@ DEFAULT_CREATORS = [
     "@daminitripathi",
 ]
 
+TAG_BATCH_STATE_PATH = CACHE_DIR / "youtube_tag_batch.json"
+
+logger = logging.getLogger(__name__)
+
 TRANSCRIPT_TAGGER_PROMPT = """Classify this short-form YouTube video for a creator content library.
 
 Return strict JSON only:
@@ -45,7 +52,7 @@ def youtube_client():
     return build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
 
 
-@retry(max_attempts=4)
+@retry(max_attempts=4, circuit="youtube")
 def find_channel_id(youtube, handle: str) -> str:
     response = youtube.channels().list(forHandle=handle, part="id,snippet").execute()
     if not response.get("items"):
@@ -53,7 +60,7 @@ def find_channel_id(youtube, handle: str) -> str:
     return response["items"][0]["id"]
 
 
-@retry(max_attempts=4)
+@retry(max_attempts=4, circuit="youtube")
 def fetch_recent_videos(youtube, channel_id: str, days: int = 7) -> list[dict]:
     after = (datetime.utcnow() - timedelta(days=days)).isoformat("T") + "Z"
     search = (
@@ -111,7 +118,7 @@ def chunk_audio(audio_path: str, chunk_duration_ms: int = 29_000) -> list[str]:
     return chunks
 
 
-@retry(max_attempts=4)
+@retry(max_attempts=4, circuit="sarvam")
 def transcribe_chunk(client: SarvamAI, chunk_path: str) -> str:
     with open(chunk_path, "rb") as f:
         result = client.speech_to_text.transcribe(file=f, model="saaras:v3", mode="transcribe")
@@ -134,22 +141,56 @@ def transcribe_audio(audio_path: str) -> str:
     return " ".join(t for t in transcripts if t).strip()
 
 
-@retry(max_attempts=4)
-def tag_transcript(video: dict, transcript: str) -> dict:
+def _tag_params(video: dict, transcript: str) -> dict:
     payload = {
         "title": video["snippet"]["title"],
         "views": video.get("statistics", {}).get("viewCount"),
         "duration_secs": _duration_secs(video),
         "transcript": transcript,
     }
-    response = require_openai_client().responses.create(
-        model="gpt-5-nano",
-        instructions=TRANSCRIPT_TAGGER_PROMPT,
-        input=json.dumps(payload, ensure_ascii=False, default=str),
+    return {
+        "model": "gpt-5-nano",
+        "instructions": TRANSCRIPT_TAGGER_PROMPT,
+        "input": json.dumps(payload, ensure_ascii=False, default=str),
+    }
+
+
+@retry(max_attempts=4, circuit="openai")
+def tag_transcript(video: dict, transcript: str) -> dict:
+    response = llm_cache.create(
+        rate_limited("openai", require_openai_client().responses.create),
+        "openai.responses",
+        validate=lambda r: safe_load_json(r.output_text),
+        **_tag_params(video, transcript),
     )
     return safe_load_json(response.output_text)
 
 
+def _batch_tags(output: str | None, video: dict, transcript: str) -> dict:
+    """Tags from a batch output, or from a live call if the batch had none usable."""
+    try:
+        return safe_load_json(output) if output else tag_transcript(video, transcript)
+    except ValueError:
+        return tag_transcript(video, transcript)
+
+
+def _upsert_tag_batch_results(results: dict) -> int:
+    """Upsert every tagged video from a finished batch; failed tags are redone live.
+
+    A video that still fails is logged and skipped so the rest of the paid
+    results are kept.
+    """
+    processed = 0
+    for video_id, (context, output) in results.items():
+        creator, video, transcript = context["creator"], context["video"], context["transcript"]
+        try:
+            upsert_youtube_candidate(creator, video, transcript, _batch_tags(output, video, transcript))
+            processed += 1
+        except Exception as e:
+            logger.error("Saving batch tags for %s (%s) failed: %s", video_id, creator, e)
+    return processed
+
+
 def _performance_score(views: int) -> int:
     if views >= 1_000_000:
         return 100
@@ -186,12 +227,26 @@ def upsert_youtube_candidate(creator: str, video: dict, transcript: str, tags: d
         "source_urls": [{"name": "YouTube", "url": url}],
         "metadata": {"creator": creator, "video_id": video_id, "views": views},
     }
-    supabase.table("creator_topic_candidates").upsert(candidate, on_conflict="candidate_key").execute()
+    repo.upsert_topic_candidates([candidate])
+
 
+def run(creators: list[str], days: int = 7, min_views: int = 10_000, batch: bool = False) -> int:
+    """Transcribe and tag recent high-view videos. Returns how many were upserted.
 
-def run(creators: list[str], days: int = 7, min_views: int = 10_000) -> int:
+    With batch=True the tagging calls are queued into one OpenAI Batch job
+    (submitted once all transcripts are ready); a job left behind by a
+    crashed run is finished first.
+    """
     youtube = youtube_client()
     processed = 0
+    tag_batch = None
+    if batch:
+        tag_batch = ResponsesBatch(require_openai_client(), TAG_BATCH_STATE_PATH)
+        if tag_batch.load():
+            processed += _upsert_tag_batch_results(tag_batch.wait())
+            tag_batch.done()
+        tag_batch = ResponsesBatch(require_openai_client(), TAG_BATCH_STATE_PATH)
+
     for creator in creators:
         channel_id = find_channel_id(youtube, creator)
         videos = filter_videos(fetch_recent_videos(youtube, channel_id, days=days), min_views=min_views)
@@ -201,12 +256,23 @@ def run(creators: list[str], days: int = 7, min_views: int = 10_000) -> int:
             try:
                 audio_path = download_audio(url)
                 transcript = transcribe_audio(audio_path)
+                if tag_batch is not None:
+                    tag_batch.add(
+                        video["id"],
+                        context={"creator": creator, "video": video, "transcript": transcript},
+                        **_tag_params(video, transcript),
+                    )
+                    continue
                 tags = tag_transcript(video, transcript)
                 upsert_youtube_candidate(creator, video, transcript, tags)
                 processed += 1
             finally:
                 if audio_path and os.path.exists(audio_path):
                     os.remove(audio_path)
+
+    if tag_batch is not None and len(tag_batch):
+        processed += _upsert_tag_batch_results(tag_batch.run())
+        tag_batch.done()
     return processed
 
 
@@ -215,8 +281,10 @@ def main() -> None:
     parser.add_argument("--creators", nargs="*", default=DEFAULT_CREATORS)
     parser.add_argument("--days", type=int, default=7)
     parser.add_argument("--min-views", type=int, default=10_000)
+    parser.add_argument("--batch", action="store_true", help="Tag transcripts through the OpenAI Batch API.")
     args = parser.parse_args()
-    print(json.dumps({"processed": run(args.creators, days=args.days, min_views=args.min_views)}))
+    processed = run(args.creators, days=args.days, min_views=args.min_views, batch=args.batch)
+    print(json.dumps({"processed": processed}))
 
 
 if __name__ == "__main__":
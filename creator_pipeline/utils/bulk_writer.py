@@ -0,0 +1,105 @@
+import logging
+import threading
+
+from postgrest.exceptions import APIError
+
+logger = logging.getLogger(__name__)
+
+_UNIQUE_VIOLATION = "23505"
+
+
+class BulkWriter:
+    """Buffer rows for a Supabase table and write them in multi-row requests.
+
+    Without ``on_conflict`` each chunk is one insert. If the chunk hits a
+    unique violation it is replayed row by row so only the offending rows land
+    in ``conflicts``. With ``on_conflict`` each chunk is one upsert; when
+    ``ignore_duplicates`` is set, rows the database skipped are reported as
+    conflicts.
+    """
+
+    def __init__(
+        self,
+        client,
+        table: str,
+        chunk_size: int = 500,
+        on_conflict: str | None = None,
+        ignore_duplicates: bool = False,
+    ):
+        self.client = client
+        self.table = table
+        self.chunk_size = max(1, chunk_size)
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        self.written: list[dict] = []
+        self.conflicts: list[dict] = []
+        self.requests = 0
+        self._buffer: list[dict] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BulkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def add(self, record: dict) -> None:
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.chunk_size:
+                self._write(self._take())
+
+    def extend(self, records) -> None:
+        for record in records:
+            self.add(record)
+
+    def flush(self) -> list[dict]:
+        """Write everything buffered. Returns the rows written by this flush."""
+        with self._lock:
+            before = len(self.written)
+            while self._buffer:
+                self._write(self._take())
+            return self.written[before:]
+
+    def _take(self) -> list[dict]:
+        chunk = self._buffer[:self.chunk_size]
+        del self._buffer[:self.chunk_size]
+        return chunk
+
+    def _write(self, chunk: list[dict]) -> None:
+        if self.on_conflict:
+            self._upsert(chunk)
+            return
+        try:
+            self.requests += 1
+            result = self.client.table(self.table).insert(chunk).execute()
+            self.written.extend(result.data or [])
+        except APIError as e:
+            if e.code != _UNIQUE_VIOLATION:
+                raise
+            if len(chunk) == 1:
+                self.conflicts.extend(chunk)
+                return
+            logger.warning(
+                "%s: batch of %d hit a unique violation, retrying row by row",
+                self.table, len(chunk),
+            )
+            for row in chunk:
+                self._write([row])
+
+    def _upsert(self, chunk: list[dict]) -> None:
+        self.requests += 1
+        result = (
+            self.client.table(self.table)
+            .upsert(chunk, on_conflict=self.on_conflict, ignore_duplicates=self.ignore_duplicates)
+            .execute()
+        )
+        rows = result.data or []
+        self.written.extend(rows)
+        if self.ignore_duplicates and len(rows) < len(chunk):
+            keys = [k.strip() for k in self.on_conflict.split(",")]
+            returned = {tuple(row.get(k) for k in keys) for row in rows}
+            self.conflicts.extend(
+                row for row in chunk if tuple(row.get(k) for k in keys) not in returned
+            )
@@ -1,25 +1,169 @@
 import functools
 import logging
+import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 logger = logging.getLogger(__name__)
 
 
-def retry(max_attempts: int = 4, backoff_base: int = 2, exceptions: tuple = (Exception,)):
+def status_code(exc: BaseException) -> int | None:
+    """HTTP status of an SDK / requests error, if it carries one."""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Delay requested by the provider via Retry-After(-ms) on the error's response."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        millis = headers.get("retry-after-ms")
+        if millis:
+            return max(0.0, float(millis) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            when = parsedate_to_datetime(value)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+def backoff_delay(attempt: int, backoff_base: float, exc: BaseException | None = None) -> float:
+    """Provider Retry-After (+ up to 20%), else full jitter over backoff_base ** attempt."""
+    retry_after = retry_after_seconds(exc) if exc is not None else None
+    if retry_after is not None:
+        return retry_after * random.uniform(1.0, 1.2)
+    return random.uniform(0, backoff_base ** attempt)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+def is_provider_failure(exc: BaseException) -> bool:
+    """Whether an error says the provider is down or overloaded (vs. a bad request)."""
+    code = status_code(exc)
+    if code is not None:
+        return code == 429 or code >= 500
+    name = type(exc).__name__
+    return isinstance(exc, (ConnectionError, TimeoutError)) or "Connection" in name or "Timeout" in name
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive provider failures, fails fast for
+    `reset_seconds`, then lets one probe through; its result closes or re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.trips = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(
+                    f"{self.name} circuit open after {self.failures} consecutive failures"
+                    + (f"; retrying in {remaining:.0f}s" if remaining > 0 else "; probe in flight")
+                )
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("%s circuit closed", self.name)
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        with self._lock:
+            probing, self._probing = self._probing, False
+            if not is_provider_failure(exc):
+                return
+            self.failures += 1
+            if probing or (self._opened_at is None and self.failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                logger.error(
+                    "%s circuit OPEN after %d consecutive failures; failing fast for %.0fs",
+                    self.name,
+                    self.failures,
+                    self.reset_seconds,
+                )
+
+
+_circuits: dict[str, CircuitBreaker] = {}
+_circuits_lock = threading.Lock()
+
+
+def circuit_for(name: str) -> CircuitBreaker:
+    with _circuits_lock:
+        if name not in _circuits:
+            _circuits[name] = CircuitBreaker(name)
+        return _circuits[name]
+
+
+def circuit_states() -> dict[str, str]:
+    with _circuits_lock:
+        circuits = list(_circuits.values())
+    return {c.name: c.state + (f" (tripped {c.trips}x)" if c.trips else "") for c in circuits}
+
+
+def retry(
+    max_attempts: int = 4,
+    backoff_base: int = 2,
+    exceptions: tuple = (Exception,),
+    circuit: str | None = None,
+):
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            breaker = circuit_for(circuit) if circuit else None
             last_error = None
             for attempt in range(1, max_attempts + 1):
+                if breaker:
+                    breaker.before_call()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                except CircuitOpenError:
+                    raise
                 except exceptions as exc:
                     last_error = exc
+                    if breaker:
+                        breaker.record_failure(exc)
                     if attempt == max_attempts:
                         break
-                    wait = backoff_base ** attempt
+                    wait = backoff_delay(attempt, backoff_base, exc)
                     logger.warning(
-                        "%s attempt %d/%d failed: %s. Retrying in %ds",
+                        "%s attempt %d/%d failed: %s. Retrying in %.1fs",
                         func.__name__,
                         attempt,
                         max_attempts,
@@ -27,9 +171,12 @@ def retry(max_attempts: int = 4, backoff_base: int = 2, exceptions: tuple = (Exc
                         wait,
                     )
                     time.sleep(wait)
+                else:
+                    if breaker:
+                        breaker.record_success()
+                    return result
             raise last_error
 
         return wrapper
 
     return decorator
-
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from .clients import supabase
+from .clients import repo
 from .utils.hash import stable_hash
 from .utils.retry import retry
 
@@ -53,10 +53,5 @@ def build_creator_webhook_record(
 
 @retry(max_attempts=4)
 def save_creator_webhook(record: dict) -> dict | None:
-    result = (
-        supabase.table("creator_raw_webhooks")
-        .upsert(record, on_conflict="dedupe_hash")
-        .execute()
-    )
-    return result.data[0] if result.data else None
+    return repo.upsert_raw_webhook(record)
 
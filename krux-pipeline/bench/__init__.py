@@ -0,0 +1,14 @@
+"""Offline benchmarks: run pipeline steps against in-memory Supabase, LLM and feed fakes.
+
+    python -m bench --steps research summary --scale 100 1000 10000
+"""
+import os
+
+# src.config refuses to import without credentials; the fakes never use them
+for _name, _value in (
+    ("SUPABASE_URL", "https://bench.supabase.co"),
+    ("SUPBASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.bench"),
+    ("CLAUDE_API_KEY", "bench"),
+    ("OPENAI_API_KEY", "bench"),
+):
+    os.environ.setdefault(_name, _value)
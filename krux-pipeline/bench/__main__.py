@@ -0,0 +1,78 @@
+import argparse
+import json
+import logging
+
+from .fakes import DEFAULT_PROFILES, Profile
+from .harness import STEPS, format_report, run_step
+
+
+def _profile_overrides(args: argparse.Namespace) -> dict[str, Profile]:
+    """--latency SERVICE=MEDIAN[:P95] and --errors SERVICE=RATE[:STATUS] on top of the defaults."""
+    profiles = {name: Profile(**vars(profile)) for name, profile in DEFAULT_PROFILES.items()}
+    for spec in args.latency:
+        name, _, value = spec.partition("=")
+        median, _, p95 = value.partition(":")
+        profiles[name].median_ms = float(median)
+        profiles[name].p95_ms = float(p95) if p95 else None
+    for spec in args.errors:
+        name, _, value = spec.partition("=")
+        rate, _, status = value.partition(":")
+        profiles[name].error_rate = float(rate)
+        if status:
+            profiles[name].error_status = int(status)
+    return profiles
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline steps against offline fakes")
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=list(STEPS))
+    parser.add_argument(
+        "--scale", nargs="+", type=int, default=[100, 1000],
+        help="Input items per step (feed entries, webhooks, curated items, briefs or articles).",
+    )
+    parser.add_argument(
+        "--time-scale", type=float, default=0.01,
+        help="Multiplier on every simulated latency, rate limit and backoff (0 = no waiting).",
+    )
+    parser.add_argument(
+        "--latency", action="append", default=[], metavar="SERVICE=MEDIAN[:P95]",
+        help=f"Latency in ms for one of: {', '.join(DEFAULT_PROFILES)}.",
+    )
+    parser.add_argument(
+        "--errors", action="append", default=[], metavar="SERVICE=RATE[:STATUS]",
+        help="Fraction of a service's calls that fail (HTTP 503 unless STATUS is given).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--curate-size", type=int, default=20, help="Stories the fake curator selects.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON, for comparing runs.")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own INFO logs.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    profiles = _profile_overrides(args)
+
+    results = []
+    for step in args.steps:
+        for scale in args.scale:
+            result = run_step(
+                step, scale, profiles, time_scale=args.time_scale, seed=args.seed, curate_size=args.curate_size,
+            )
+            results.append(result)
+            print(format_report([result], args.time_scale)[-1], flush=True)
+
+    print()
+    print("\n".join(format_report(results, args.time_scale)))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"time_scale": args.time_scale, "results": [r.to_dict() for r in results]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
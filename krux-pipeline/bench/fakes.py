@@ -0,0 +1,537 @@
+import base64
+import functools
+import hashlib
+import json
+import math
+import operator
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from postgrest.exceptions import APIError
+
+from src.steps.research import TOPIC_PIPELINE
+from src.utils.metrics import metrics
+
+# Columns each table is unique on, so BulkWriter / idempotency paths behave as in production
+_UNIQUE = {
+    "webhooks": ("event_group_id", "monitor_id"),
+    "curation_selected_items": ("event_id",),
+    "research_assistant": ("event_id",),
+    "hundred_word_articles": ("event_id",),
+    "image_assets": ("prompt_hash",),
+}
+
+_TOPICS = [topic for topic, _ in TOPIC_PIPELINE]
+
+_WORDS = (
+    "agent model launch funding round benchmark reasoning open weights inference latency "
+    "enterprise startup series seed valuation chip cluster training dataset evaluation "
+    "safety policy report survey adoption workflow copilot coding assistant api pricing "
+    "context window multimodal vision speech robotics partnership acquisition research "
+    "paper release preview update fine-tuning retrieval memory tool browser developer"
+).split()
+
+
+def synthetic_text(rng: random.Random, words: int) -> str:
+    """Distinct filler text, so near-duplicate detection doesn't collapse synthetic rows."""
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+@dataclass
+class Profile:
+    """Latency and failure model for one fake service.
+
+    Latency is log-normal with the given median and p95 (a fixed median when
+    p95 is unset); `error_rate` of calls raise FakeServiceError with
+    `error_status`.
+    """
+
+    median_ms: float = 0.0
+    p95_ms: float | None = None
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    def sample_seconds(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        if not self.p95_ms or self.p95_ms <= self.median_ms:
+            return self.median_ms / 1000
+        sigma = math.log(self.p95_ms / self.median_ms) / 1.645
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000
+
+
+# Roughly what production sees per call
+DEFAULT_PROFILES: dict[str, Profile] = {
+    "supabase": Profile(40, 150),
+    "storage": Profile(250, 800),
+    "claude": Profile(2500, 8000),
+    "openai": Profile(12000, 30000),  # responses with web_search
+    "openai-images": Profile(15000, 25000),
+    "feeds": Profile(300, 1500),
+}
+
+
+class FakeServiceError(Exception):
+    """Simulated provider failure; carries status_code like the SDK errors do."""
+
+    def __init__(self, service: str, status_code: int):
+        super().__init__(f"{service}: simulated HTTP {status_code}")
+        self.status_code = status_code
+
+
+class Service:
+    """One fake backend: sleeps per its Profile (times `time_scale`) and injects errors."""
+
+    def __init__(self, name: str, profile: Profile, time_scale: float = 1.0, seed: int = 0):
+        self.name = name
+        self.profile = profile
+        self.time_scale = time_scale
+        self.calls = 0
+        self.errors = 0
+        self._rng = random.Random(f"{seed}:{name}")
+        self._lock = threading.Lock()
+
+    def call(self) -> None:
+        with self._lock:
+            delay = self.profile.sample_seconds(self._rng)
+            fail = self._rng.random() < self.profile.error_rate
+            self.calls += 1
+            self.errors += int(fail)
+        if delay and self.time_scale:
+            time.sleep(delay * self.time_scale)
+        if fail:
+            raise FakeServiceError(self.name, self.profile.error_status)
+
+
+# ── Supabase ──
+
+_OPS = {"eq": operator.eq, "neq": operator.ne, "gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+def _split_top_level(expr: str) -> list[str]:
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(expr):
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and ch == "," and depth == 0:
+            parts.append(expr[start:i])
+            start = i + 1
+    parts.append(expr[start:])
+    return parts
+
+
+def _condition(expr: str) -> Callable[[dict], bool]:
+    """A predicate for a PostgREST logic filter, e.g. 'a.gt.1,and(b.eq."x",c.lt.2)'."""
+    for name, combine in (("and", all), ("or", any)):
+        if expr.startswith(f"{name}("):
+            parts = [_condition(part) for part in _split_top_level(expr[len(name) + 1:-1])]
+            return lambda row: combine(part(row) for part in parts)
+    column, op, raw = expr.split(".", 2)
+    value = raw[1:-1] if raw.startswith('"') else raw
+    compare = _OPS[op]
+
+    def check(row: dict) -> bool:
+        current = row.get(column)
+        if current is None:
+            return False
+        return compare(current, type(current)(value) if isinstance(current, (int, float)) else value)
+
+    return check
+
+
+class _Query:
+    """The subset of the postgrest query builder the pipeline uses."""
+
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.columns: list[str] | None = None
+        self.payload: Any = None
+        self.on_conflict: tuple[str, ...] = ()
+        self.ignore_duplicates = False
+        self.filters: list[Callable[[dict], bool]] = []
+        self.order_by: list[tuple[str, bool]] = []
+        self.limit_rows: int | None = None
+
+    def select(self, *columns: str) -> "_Query":
+        names = [name.strip() for part in columns for name in part.split(",") if name.strip()]
+        self.columns = None if not names or "*" in names else names
+        return self
+
+    def insert(self, rows) -> "_Query":
+        self.op, self.payload = "insert", rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict: str = "", ignore_duplicates: bool = False) -> "_Query":
+        self.op, self.payload = "upsert", rows if isinstance(rows, list) else [rows]
+        self.on_conflict = tuple(c.strip() for c in on_conflict.split(",") if c.strip())
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: dict) -> "_Query":
+        self.op, self.payload = "update", values
+        return self
+
+    def delete(self) -> "_Query":
+        self.op = "delete"
+        return self
+
+    def _where(self, predicate: Callable[[dict], bool]) -> "_Query":
+        self.filters.append(predicate)
+        return self
+
+    def eq(self, column: str, value) -> "_Query":
+        return self._where(lambda row: row.get(column) == value)
+
+    def neq(self, column: str, value) -> "_Query":
+        return self._where(lambda row: row.get(column) != value)
+
+    def gt(self, column: str, value) -> "_Query":
+        return self._where(lambda row: row.get(column) is not None and row[column] > value)
+
+    def gte(self, column: str, value) -> "_Query":
+        return self._where(lambda row: row.get(column) is not None and row[column] >= value)
+
+    def lt(self, column: str, value) -> "_Query":
+        return self._where(lambda row: row.get(column) is not None and row[column] < value)
+
+    def lte(self, column: str, value) -> "_Query":
+        return self._where(lambda row: row.get(column) is not None and row[column] <= value)
+
+    def in_(self, column: str, values) -> "_Query":
+        wanted = set(values)
+        return self._where(lambda row: row.get(column) in wanted)
+
+    def is_(self, column: str, value) -> "_Query":
+        if value in ("null", None):
+            return self._where(lambda row: row.get(column) is None)
+        return self._where(lambda row: row.get(column) is value)
+
+    def or_(self, filters: str) -> "_Query":
+        parts = [_condition(part) for part in _split_top_level(filters)]
+        return self._where(lambda row: any(part(row) for part in parts))
+
+    def order(self, column: str, desc: bool = False) -> "_Query":
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, count: int) -> "_Query":
+        self.limit_rows = count
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        start = time.monotonic()
+        try:
+            self.db.service.call()
+            return SimpleNamespace(data=self.db.apply(self))
+        finally:
+            metrics.record_db(time.monotonic() - start, "db")
+
+
+class _Bucket:
+    def __init__(self, db: "FakeSupabase", bucket: str):
+        self.db = db
+        self.bucket = bucket
+
+    def upload(self, path: str, file: bytes, file_options: dict | None = None) -> SimpleNamespace:
+        start = time.monotonic()
+        try:
+            self.db.storage_service.call()
+            with self.db.lock:
+                self.db.objects[(self.bucket, path)] = bytes(file)
+            return SimpleNamespace(path=path, full_path=f"{self.bucket}/{path}")
+        finally:
+            metrics.record_db(time.monotonic() - start, "storage")
+
+    def get_public_url(self, path: str) -> str:
+        return f"https://bench.invalid/storage/v1/object/public/{self.bucket}/{path}"
+
+
+class FakeSupabase:
+    """In-memory stand-in for the Supabase client: tables, filters, ordering,
+    unique constraints and a storage bucket store. `max_rows` caps every
+    select like PostgREST's db-max-rows setting.
+
+    Every request sleeps per the `service` / `storage_service` profiles and is
+    recorded in the run metrics like the real (instrumented) client.
+    """
+
+    def __init__(self, service: Service, storage_service: Service, created_at: str, max_rows: int | None = None):
+        self.service = service
+        self.max_rows = max_rows
+        self.storage_service = storage_service
+        self.created_at = created_at
+        self.tables: dict[str, list[dict]] = defaultdict(list)
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.lock = threading.Lock()
+        self.storage = SimpleNamespace(from_=lambda bucket: _Bucket(self, bucket))
+        self._next_id = 1
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def seed(self, table: str, rows: list[dict]) -> None:
+        """Load rows directly, with no latency or constraint checks."""
+        with self.lock:
+            for row in rows:
+                self.tables[table].append(self._stamp(row))
+
+    def _stamp(self, row: dict) -> dict:
+        row = {"created_at": self.created_at, **row}
+        if row.get("id") is None:
+            row["id"] = self._next_id
+        self._next_id = max(self._next_id, row["id"]) + 1
+        return row
+
+    def _unique_key(self, table: str, row: dict, columns: tuple[str, ...] = ()) -> tuple | None:
+        columns = columns or _UNIQUE.get(table, ())
+        return tuple(row.get(c) for c in columns) if columns else None
+
+    def apply(self, query: _Query) -> list[dict]:
+        with self.lock:
+            rows = self.tables[query.table]
+            if query.op == "insert":
+                return self._insert(query.table, query.payload)
+            if query.op == "upsert":
+                return self._upsert(query)
+            matched = [row for row in rows if all(f(row) for f in query.filters)]
+            if query.op == "update":
+                for row in matched:
+                    row.update(query.payload)
+                return [dict(row) for row in matched]
+            if query.op == "delete":
+                self.tables[query.table] = [row for row in rows if row not in matched]
+                return [dict(row) for row in matched]
+
+            for column, desc in reversed(query.order_by):
+                matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+            if query.limit_rows is not None:
+                matched = matched[:query.limit_rows]
+            if self.max_rows is not None:
+                matched = matched[:self.max_rows]
+            if query.columns is None:
+                return [dict(row) for row in matched]
+            return [{c: row.get(c) for c in query.columns} for row in matched]
+
+    def _insert(self, table: str, payload: list[dict]) -> list[dict]:
+        existing = {self._unique_key(table, row) for row in self.tables[table]}
+        for row in payload:
+            key = self._unique_key(table, row)
+            if key is not None and key in existing:
+                raise APIError({
+                    "code": "23505",
+                    "message": f'duplicate key value violates unique constraint "{table}_key"',
+                })
+            existing.add(key)
+        inserted = [self._stamp(dict(row)) for row in payload]
+        self.tables[table].extend(inserted)
+        return [dict(row) for row in inserted]
+
+    def _upsert(self, query: _Query) -> list[dict]:
+        rows = self.tables[query.table]
+        index = {self._unique_key(query.table, row, query.on_conflict): row for row in rows}
+        out = []
+        for payload in query.payload:
+            key = self._unique_key(query.table, payload, query.on_conflict)
+            current = index.get(key) if key is not None else None
+            if current is None:
+                current = self._stamp(dict(payload))
+                rows.append(current)
+                index[key] = current
+            elif query.ignore_duplicates:
+                continue
+            else:
+                current.update(payload)
+            out.append(dict(current))
+        return out
+
+
+# ── LLMs ──
+
+
+def _usage_tokens(params: dict, text: str) -> tuple[int, int]:
+    # ~4 characters per token is close enough for cost estimates
+    return len(json.dumps(params, default=str)) // 4, max(1, len(text) // 4)
+
+
+class FakeClaude:
+    """messages.create for the three prompts the pipeline sends Claude.
+
+    Curation returns the first `curate_size` rows it is shown (`shortlist_size`
+    for a map-reduce shard), summaries return a write_article tool call, and
+    anything else gets a short image prompt.
+    """
+
+    def __init__(self, service: Service, seed: int = 0, curate_size: int = 20, shortlist_size: int = 8):
+        self.service = service
+        self.curate_size = curate_size
+        self.shortlist_size = shortlist_size
+        self.messages = SimpleNamespace(create=self._create)
+        self._rng = random.Random(f"{seed}:claude-text")
+        self._lock = threading.Lock()
+
+    def _text(self, words: int) -> str:
+        with self._lock:
+            return synthetic_text(self._rng, words)
+
+    def _curation(self, content: str) -> str:
+        rows = json.loads(content[content.index("\n\n[") + 2:])
+        limit = self.shortlist_size if "in this shard" in content else self.curate_size
+        items = [
+            {
+                "id": row["id"],
+                "output": row["news_output"],
+                "news_date": row["news_date"],
+                "sources": row.get("source_urls") or [],
+                "topic": _TOPICS[i % len(_TOPICS)],
+            }
+            for i, row in enumerate(rows[:limit])
+        ]
+        mix = {key: 0 for key in ("funding", "model_announcements_enhancements", "workflow_improvement", "report", "others")}
+        return json.dumps({
+            "selected_total": len(items),
+            "mix_summary": mix,
+            "selection_notes": "benchmark selection",
+            "items": items,
+        })
+
+    def _create(self, **params: Any) -> SimpleNamespace:
+        self.service.call()
+        content = params["messages"][-1]["content"]
+        if params.get("tools"):
+            block = SimpleNamespace(
+                type="tool_use",
+                name=params["tools"][-1]["name"],
+                input={
+                    "headline": self._text(6),
+                    "output": self._text(100),
+                    "sources": [{"name": "Bench", "url": "https://bench.invalid/source"}],
+                },
+            )
+            text = json.dumps(block.input)
+        else:
+            if "raw news articles" in content:
+                text = self._curation(content)
+            else:
+                text = f"Editorial illustration: {self._text(20)}"
+            block = SimpleNamespace(type="text", text=text)
+
+        input_tokens, output_tokens = _usage_tokens(params, text)
+        return SimpleNamespace(
+            content=[block],
+            stop_reason="tool_use" if params.get("tools") else "end_turn",
+            usage=SimpleNamespace(
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cache_read_input_tokens=0,
+                cache_creation_input_tokens=0,
+            ),
+        )
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+@functools.lru_cache(maxsize=8)
+def _png_pixels(width: int, height: int) -> bytes:
+    scanline = b"\x00" + bytes((90, 120, 200)) * width
+    return _png_chunk(b"IDAT", zlib.compress(scanline * height, 1))
+
+
+def png_bytes(width: int, height: int, comment: str = "") -> bytes:
+    """A valid solid-colour RGB PNG; `comment` goes in a tEXt chunk so images differ byte-wise."""
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        _png_pixels(width, height),
+        _png_chunk(b"tEXt", b"Comment\x00" + comment.encode()) if comment else b"",
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+class FakeOpenAI:
+    """responses.create (research briefs) and images.generate (PNG per prompt)."""
+
+    def __init__(self, service: Service, images_service: Service, seed: int = 0):
+        self.service = service
+        self.images_service = images_service
+        self.responses = SimpleNamespace(create=self._respond)
+        self.images = SimpleNamespace(generate=self._generate)
+        self._rng = random.Random(f"{seed}:openai-text")
+        self._lock = threading.Lock()
+
+    def _respond(self, **params: Any) -> SimpleNamespace:
+        self.service.call()
+        with self._lock:
+            text = synthetic_text(self._rng, 300)
+        input_tokens, output_tokens = _usage_tokens(params, text)
+        return SimpleNamespace(
+            output_text=text,
+            usage=SimpleNamespace(
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                input_tokens_details=SimpleNamespace(cached_tokens=0),
+            ),
+        )
+
+    def _generate(self, **params: Any) -> SimpleNamespace:
+        self.images_service.call()
+        width, height = (int(n) for n in params.get("size", "1024x1024").split("x"))
+        # tagged with the prompt's hash, so distinct prompts give distinct files
+        image = png_bytes(width, height, hashlib.sha256(params.get("prompt", "").encode()).hexdigest())
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=base64.b64encode(image).decode())])
+
+
+# ── RSS ──
+
+
+class _FeedResponse:
+    def __init__(self, status_code: int, content: bytes = b"", headers: dict | None = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeFeedServer:
+    """Stands in for `requests` in rss_monitor: serves synthetic feeds by URL and
+    answers 304 to a matching If-None-Match.
+    """
+
+    def __init__(self, service: Service, entries: dict[str, list[dict]]):
+        self.service = service
+        self.entries = entries
+
+    def get(self, url: str, headers: dict | None = None, timeout: float | None = None) -> _FeedResponse:
+        self.service.call()
+        etag = f'"{hashlib.sha1(url.encode()).hexdigest()[:12]}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return _FeedResponse(304)
+        return _FeedResponse(200, url.encode(), {"ETag": etag})
+
+
+class FakeFeedparser:
+    """Stands in for `feedparser`: "parses" a FakeFeedServer body back into its entries."""
+
+    USER_AGENT = "krux-bench"
+
+    def __init__(self, server: FakeFeedServer):
+        self.server = server
+
+    def parse(self, content: bytes) -> SimpleNamespace:
+        return SimpleNamespace(bozo=0, bozo_exception=None, entries=self.server.entries[content.decode()])
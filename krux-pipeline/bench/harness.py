@@ -0,0 +1,250 @@
+import random
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest.mock import patch
+
+from src.clients import llm_cache, repo
+from src.feeds import FeedSource
+from src.steps import content_selector, images, research, rss_monitor, summary
+from src.utils import rate_limit
+from src.utils import retry as retry_module
+from src.utils.feed_cache import FeedValidatorCache
+from src.utils.image_store import ImageStore
+from src.utils.metrics import metrics
+from src.utils.retry import CircuitBreaker
+
+from .fakes import (
+    DEFAULT_PROFILES,
+    FakeClaude,
+    FakeFeedparser,
+    FakeFeedServer,
+    FakeOpenAI,
+    FakeSupabase,
+    Profile,
+    Service,
+    synthetic_text,
+)
+
+STEPS = ("rss", "curation", "research", "summary", "images")
+
+BENCH_DATE, BENCH_NEXT_DATE = "2025-01-01", "2025-01-02"
+_CREATED_AT = f"{BENCH_DATE}T06:00:00+00:00"
+
+_ENTRIES_PER_FEED = 50
+_CIRCUITS = ("anthropic", "openai", "supabase-storage")
+
+
+@dataclass
+class BenchResult:
+    step: str
+    scale: int
+    seconds: float
+    succeeded: int
+    calls: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    metrics: dict = field(default_factory=dict)  # Metrics.summary_rows() merged for the step
+
+    @property
+    def throughput(self) -> float:
+        """Input items per second of wall time."""
+        return self.scale / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "step": self.step, "scale": self.scale, "seconds": round(self.seconds, 3),
+            "succeeded": self.succeeded, "throughput": round(self.throughput, 2),
+            "calls": self.calls, "errors": self.errors, "metrics": self.metrics,
+        }
+
+
+# ── synthetic inputs, one table per step ──
+
+
+def _feeds(scale: int, rng: random.Random) -> tuple[list[FeedSource], dict[str, list[dict]]]:
+    count = max(1, -(-scale // _ENTRIES_PER_FEED))
+    feeds = [
+        FeedSource(f"bench_{i}", f"Bench Feed {i}", f"https://feed{i}.bench.invalid/rss.xml", f"Company{i}")
+        for i in range(count)
+    ]
+    now = time.time()
+    entries: dict[str, list[dict]] = {feed.url: [] for feed in feeds}
+    for n in range(scale):
+        feed = feeds[n % count]
+        entries[feed.url].append({
+            "id": f"{feed.feed_id}-{n}",
+            "link": f"https://feed{n % count}.bench.invalid/posts/{n}",
+            "title": synthetic_text(rng, 8),
+            "summary": f"<p>{synthetic_text(rng, 60)}</p>",
+            "published": time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(now - n)),
+            "published_parsed": time.gmtime(now - n),
+        })
+    return feeds, entries
+
+
+def _seed(step: str, scale: int, db: FakeSupabase, rng: random.Random) -> None:
+    topics = [topic for topic, _ in research.TOPIC_PIPELINE]
+    if step == "curation":
+        db.seed("webhooks", [{
+            "id": n + 1,
+            "event_group_id": "bench",
+            "monitor_id": f"guid-{n}",
+            "monitor_type": "rss",
+            "news_output": synthetic_text(rng, 60),
+            "news_date": BENCH_DATE,
+            "source_urls": [{"name": "Bench", "url": f"https://bench.invalid/posts/{n}"}],
+        } for n in range(scale)])
+    elif step == "research":
+        db.seed("curation_selected_items", [{
+            "event_id": f"{n + 1}_{BENCH_DATE}",
+            "output": synthetic_text(rng, 60),
+            "sources": [{"name": "Bench", "url": f"https://bench.invalid/posts/{n}"}],
+            "news_date": BENCH_DATE,
+            "topic": topics[n % len(topics)],
+        } for n in range(scale)])
+    elif step == "summary":
+        db.seed("research_assistant", [{
+            "event_id": f"{n + 1}_{BENCH_DATE}",
+            "model_provider": "openai",
+            "news_date": BENCH_DATE,
+            "output": synthetic_text(rng, 300),
+            "topic": topics[n % len(topics)],
+        } for n in range(scale)])
+    elif step == "images":
+        db.seed("hundred_word_articles", [{
+            "event_id": f"{n + 1}_{BENCH_DATE}",
+            "news_date": BENCH_DATE,
+            "headline": synthetic_text(rng, 6),
+            "output": synthetic_text(rng, 100),
+            "topic": topics[n % len(topics)],
+            "image_url": None,
+        } for n in range(scale)])
+
+
+def _merge_rows(step: str, rows: list[dict]) -> dict:
+    """One row for the step: counts summed over every metrics stage the step ran
+    (e.g. image-prompt/-generate/-upload), item latency from its last stage.
+    """
+    if not rows:
+        return {}
+    merged = dict(next((r for r in rows if r["stage"] == step), rows[0]))
+    for row in rows:
+        if row is merged or row["stage"] == step:
+            continue
+        for name, value in row.items():
+            if not name.endswith(("_p50", "_p95")) and isinstance(value, (int, float)) and name != "wall_seconds":
+                merged[name] = merged.get(name, 0) + value
+    item_rows = [r for r in rows if r["items"]]
+    if item_rows and not any(r["stage"] == step for r in item_rows):
+        merged["item_p50"], merged["item_p95"] = item_rows[-1]["item_p50"], item_rows[-1]["item_p95"]
+    return merged
+
+
+def _run(step: str) -> int:
+    if step == "rss":
+        return rss_monitor.run()
+    if step == "curation":
+        return content_selector.run(BENCH_DATE, BENCH_NEXT_DATE, map_reduce=None)
+    if step == "research":
+        return sum(n for n in research.run(BENCH_DATE, BENCH_NEXT_DATE).values() if isinstance(n, int))
+    if step == "summary":
+        return summary.run(BENCH_DATE, BENCH_NEXT_DATE)
+    return images.run()
+
+
+def run_step(
+    step: str,
+    scale: int,
+    profiles: dict[str, Profile] | None = None,
+    time_scale: float = 0.01,
+    seed: int = 0,
+    curate_size: int = 20,
+) -> BenchResult:
+    """Run one pipeline step against fresh fakes seeded with `scale` input items.
+
+    Every simulated latency, rate limit, retry backoff and circuit reset is
+    multiplied by `time_scale`, so production's shape plays out in a fraction
+    of the time. The LLM response cache is bypassed.
+    """
+    if step not in STEPS:
+        raise ValueError(f"Unknown step {step!r}; expected one of {STEPS}")
+    profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+    services = {name: Service(name, profile, time_scale, seed) for name, profile in profiles.items()}
+    rng = random.Random(seed)
+
+    db = FakeSupabase(services["supabase"], services["storage"], _CREATED_AT)
+    claude = FakeClaude(services["claude"], seed, curate_size=curate_size)
+    openai_client = FakeOpenAI(services["openai"], services["openai-images"], seed)
+    feeds, entries = _feeds(scale, rng) if step == "rss" else ([], {})
+    feed_server = FakeFeedServer(services["feeds"], entries)
+    _seed(step, scale, db, rng)
+
+    scaled_limits = {
+        provider: (rpm / time_scale, tpm / time_scale if tpm else None) if time_scale else (1e9, None)
+        for provider, (rpm, tpm) in rate_limit._limits.items()
+    }
+    circuits = {name: CircuitBreaker(name, reset_seconds=60 * time_scale) for name in _CIRCUITS}
+    backoff_delay = retry_module.backoff_delay
+
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as tmp:
+        fakes = {"claude": claude, "openai_client": openai_client, "image_store": ImageStore(repo)}
+        stack.enter_context(patch.object(repo, "client", db))
+        for module in (rss_monitor, content_selector, research, summary, images):
+            for name, fake in fakes.items():
+                if hasattr(module, name):
+                    stack.enter_context(patch.object(module, name, fake))
+        stack.enter_context(patch.object(rss_monitor, "FEEDS", feeds))
+        stack.enter_context(patch.object(rss_monitor, "requests", feed_server))
+        stack.enter_context(patch.object(rss_monitor, "feedparser", FakeFeedparser(feed_server)))
+        stack.enter_context(patch.object(
+            rss_monitor, "_validators", FeedValidatorCache(Path(tmp) / "rss_validators.json"),
+        ))
+        stack.enter_context(patch.object(rss_monitor, "_seen", set()))
+        stack.enter_context(patch.object(rss_monitor, "_host_slots", {}))
+        stack.enter_context(patch.object(llm_cache, "enabled", False))
+        stack.enter_context(patch.dict(rate_limit._limits, scaled_limits))
+        stack.callback(rate_limit._limiters.clear)
+        rate_limit._limiters.clear()
+        stack.enter_context(patch.dict(retry_module._circuits, circuits, clear=True))
+        stack.enter_context(patch.object(
+            retry_module, "backoff_delay", lambda *args: backoff_delay(*args) * time_scale,
+        ))
+
+        metrics.reset()
+        metrics.begin_step(step)
+        start = time.monotonic()
+        succeeded = _run(step)
+        seconds = time.monotonic() - start
+        metrics.end_step()
+
+    row = _merge_rows(step, metrics.summary_rows())
+    return BenchResult(
+        step=step,
+        scale=scale,
+        seconds=seconds,
+        succeeded=succeeded,
+        calls={name: s.calls for name, s in services.items() if s.calls},
+        errors={name: s.errors for name, s in services.items() if s.errors},
+        metrics=row,
+    )
+
+
+def format_report(results: list[BenchResult], time_scale: float) -> list[str]:
+    """The results as table lines (latencies are measured, i.e. already time-scaled)."""
+    lines = [
+        f"time scale {time_scale:g} (simulated latencies x{time_scale:g})",
+        f"{'step':<9} {'scale':>6} {'ok':>6} {'wall':>8} {'items/s':>9} {'item p50/p95':>14} "
+        f"{'llm':>6} {'db':>6} {'retry':>5}  errors",
+    ]
+    for r in results:
+        m = r.metrics
+        item = f"{m['item_p50']:.3f}/{m['item_p95']:.3f}s" if m.get("items") else "—"
+        errors = ", ".join(f"{name}={n}" for name, n in r.errors.items()) or "—"
+        lines.append(
+            f"{r.step:<9} {r.scale:>6} {r.succeeded:>6} {r.seconds:>7.2f}s {r.throughput:>9.1f} {item:>14} "
+            f"{m.get('llm_calls', 0):>6} {m.get('db_calls', 0) + m.get('storage_calls', 0):>6} "
+            f"{m.get('retries', 0):>5}  {errors}"
+        )
+    return lines
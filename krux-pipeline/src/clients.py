@@ -1,9 +1,30 @@
-from supabase import create_client
 import anthropic
 from openai import OpenAI
 
-from .config import SUPABASE_URL, SUPABASE_KEY, CLAUDE_API_KEY, OPENAI_API_KEY
+from .config import (
+    SUPABASE_URL, SUPABASE_KEY, CLAUDE_API_KEY, OPENAI_API_KEY,
+    SUPABASE_MAX_CONNECTIONS, SUPABASE_HTTP2, SUPABASE_TIMEOUT_SECONDS,
+    LLM_CACHE_ENABLED, LLM_CACHE_DIR, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES, LLM_RATE_LIMITS,
+)
+from .repository import Repository
+from .utils.http_pool import connect_supabase, pooled_http_client, request_kind
+from .utils.image_store import ImageStore
+from .utils.llm_cache import ResponseCache
+from .utils.metrics import metrics
+from .utils.rate_limit import configure_limits, parse_limits
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase_http = pooled_http_client(SUPABASE_MAX_CONNECTIONS, SUPABASE_TIMEOUT_SECONDS, http2=SUPABASE_HTTP2)
+metrics.instrument_httpx(supabase_http, request_kind)
+supabase = connect_supabase(SUPABASE_URL, SUPABASE_KEY, supabase_http)
+repo = Repository(supabase)
+repo.requests.instrument(supabase_http)
 claude = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
+configure_limits(parse_limits(LLM_RATE_LIMITS))
+llm_cache = ResponseCache(
+    LLM_CACHE_DIR,
+    ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    enabled=LLM_CACHE_ENABLED,
+)
+image_store = ImageStore(repo)
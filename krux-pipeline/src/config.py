@@ -46,3 +46,36 @@ SUPABASE_URL = _require_env("SUPABASE_URL")
 SUPABASE_KEY = _require_env("SUPBASE_KEY")  # typo preserved to match existing env
 CLAUDE_API_KEY = _require_env("CLAUDE_API_KEY")
 OPENAI_API_KEY = _require_env("OPENAI_API_KEY")
+
+# One pooled HTTP/2 client carries every Supabase request; size it to cover the
+# busiest step's workers (RSS fetches 16 feeds at once). SUPABASE_HTTP2=0 uses HTTP/1.1
+SUPABASE_MAX_CONNECTIONS = int(os.environ.get("SUPABASE_MAX_CONNECTIONS") or 20)
+SUPABASE_HTTP2 = os.environ.get("SUPABASE_HTTP2", "1") != "0"
+SUPABASE_TIMEOUT_SECONDS = float(os.environ.get("SUPABASE_TIMEOUT_SECONDS") or 60)
+
+# Per-stage concurrency: parallel web_search calls (Step 2), Claude summaries
+# (Step 3) and image generations (Step 4), plus Step 4's image prompts and uploads
+RESEARCH_MAX_WORKERS = int(os.environ.get("RESEARCH_MAX_WORKERS") or 6)
+SUMMARY_MAX_WORKERS = int(os.environ.get("SUMMARY_MAX_WORKERS") or 4)
+IMAGE_MAX_WORKERS = int(os.environ.get("IMAGE_MAX_WORKERS") or 2)
+IMAGE_PROMPT_WORKERS = int(os.environ.get("IMAGE_PROMPT_WORKERS") or 2)
+IMAGE_UPLOAD_WORKERS = int(os.environ.get("IMAGE_UPLOAD_WORKERS") or 2)
+
+# Compressed, resized copies uploaded next to each original PNG (needs Pillow);
+# IMAGE_VARIANTS=0 disables them, "webp,avif" adds AVIF
+IMAGE_VARIANTS_ENABLED = os.environ.get("IMAGE_VARIANTS", "1") != "0"
+IMAGE_VARIANT_FORMATS = [f.strip().lower() for f in (os.environ.get("IMAGE_VARIANT_FORMATS") or "webp").split(",") if f.strip()]
+IMAGE_VARIANT_WIDTHS = [int(w) for w in (os.environ.get("IMAGE_VARIANT_WIDTHS") or "480,768,1080,1536").split(",") if w.strip()]
+
+# Shared LLM quota, e.g. "openai=500/200000,anthropic:claude-sonnet-4-5=50/30000"
+# (requests/min[/input tokens/min] per provider or provider:model)
+LLM_RATE_LIMITS = os.environ.get("LLM_RATE_LIMITS", "")
+
+# Local state that should survive between runs (RSS validators, etc.)
+CACHE_DIR = Path(os.environ.get("KRUX_CACHE_DIR") or Path(__file__).resolve().parent.parent / ".cache")
+
+# Disk cache for LLM responses, shared with creator_pipeline; LLM_CACHE=0 disables it
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+LLM_CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR") or _env_path.parent / ".cache" / "llm")
+LLM_CACHE_TTL_HOURS = float(os.environ.get("LLM_CACHE_TTL_HOURS") or 72)
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES") or 5000)
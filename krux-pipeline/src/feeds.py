@@ -7,11 +7,12 @@ class FeedSource:
     name: str
     url: str
     company: str
+    timeout: float = 20.0  # seconds; raise for slow hosts such as the GitHub raw mirror
 
 
 FEEDS: list[FeedSource] = [
     FeedSource("openai_blog", "OpenAI Blog", "https://openai.com/blog/rss.xml", "OpenAI"),
-    FeedSource("anthropic_news", "Anthropic News", "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml", "Anthropic"),
+    FeedSource("anthropic_news", "Anthropic News", "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml", "Anthropic", timeout=30.0),
     FeedSource("google_ai_blog", "Google AI Blog", "https://blog.google/technology/ai/rss/", "Google"),
     FeedSource("deepmind_blog", "DeepMind Blog", "https://deepmind.google/blog/rss.xml", "DeepMind"),
     FeedSource("meta_ai_blog", "Meta Engineering (ML)", "https://engineering.fb.com/category/ml-applications/feed/", "Meta"),
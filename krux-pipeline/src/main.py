@@ -3,8 +3,12 @@ import logging
 import sys
 import time
 
-from .config import get_processing_dates, get_today_range
-from .steps import health_check, rss_monitor, content_selector, research, summary, images
+from .clients import llm_cache, repo
+from .config import CACHE_DIR, get_processing_dates, get_today_range
+from .utils.metrics import metrics
+from .utils.retry import circuit_states
+from .utils.run_manifest import RunManifest
+from .steps import health_check, rss_monitor, content_selector, research, summary, images, stream
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +17,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("krux-pipeline")
 
+_RUNS_DIR = CACHE_DIR / "runs"
+_METRICS_DIR = CACHE_DIR / "metrics"
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Krux daily content pipeline")
@@ -31,90 +38,187 @@ def parse_args() -> argparse.Namespace:
         choices=[0, 1, 2, 3, 4],
         help="Run only a specific step (0=rss, 1=curation, 2=research, 3=summary, 4=images).",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run Step 2 research (OpenAI Batch) and Step 3 summaries (Anthropic Message Batches) as batch jobs.",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run Steps 2-4 one after another instead of streaming each item through them.",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue an interrupted run from its manifest, with that run's dates and options.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk LLM response cache and call the models for every request.",
+    )
     return parser.parse_args()
 
 
+def _load_or_create_manifest(args: argparse.Namespace) -> RunManifest:
+    """The manifest to resume, or a new one pinning this run's dates and options."""
+    if args.resume:
+        try:
+            return RunManifest.load(_RUNS_DIR, args.resume)
+        except FileNotFoundError:
+            logger.error("No run manifest for %s in %s", args.resume, _RUNS_DIR)
+            sys.exit(1)
+
+    date, next_date = get_processing_dates(args.date)
+    today, tomorrow = get_today_range()
+    return RunManifest.create(_RUNS_DIR, {
+        "date": date,
+        "next_date": next_date,
+        "today": today,
+        "tomorrow": tomorrow,
+        "dry_run": args.dry_run,
+        "step": args.step,
+        "batch": args.batch,
+        "sequential": args.sequential,
+    })
+
+
 def run_pipeline() -> None:
     args = parse_args()
     start_time = time.time()
 
-    date, next_date = get_processing_dates(args.date)
-    today, tomorrow = get_today_range()
-    dry_run = args.dry_run
+    manifest = _load_or_create_manifest(args)
+    # A resumed run reuses the original dates and options, not today's
+    run_args = manifest.args
+    date, next_date = run_args["date"], run_args["next_date"]
+    today, tomorrow = run_args["today"], run_args["tomorrow"]
+    dry_run = run_args["dry_run"]
+    step = run_args["step"]
+    if args.no_cache:
+        llm_cache.enabled = False
 
     logger.info("=" * 60)
     logger.info("Krux Pipeline — processing news for %s", date)
+    if args.resume:
+        logger.info("Resuming run %s", manifest.run_id)
+    else:
+        logger.info("Run %s (resume with --resume %s)", manifest.run_id, manifest.run_id)
     if dry_run:
         logger.info("DRY RUN mode — no database writes")
-    if args.step:
-        logger.info("Running only step %d", args.step)
+    if step:
+        logger.info("Running only step %d", step)
     logger.info("=" * 60)
 
-    results: dict = {"date": date, "errors": []}
+    results: dict = {"date": date, "run_id": manifest.run_id, "errors": []}
+    metrics.start_run(_METRICS_DIR / f"{manifest.run_id}.jsonl")
+
+    def should_run(name: str) -> bool:
+        if manifest.step_done(name):
+            logger.info("Skipping %s — already finished in run %s", name, manifest.run_id)
+            return False
+        manifest.mark_step(name, "running")
+        metrics.begin_step(name)
+        return True
 
     # ── Health Check ──
-    if args.step is None:
+    if step is None and should_run("health_check"):
         try:
             healthy = health_check.run()
             results["health_check"] = "passed" if healthy else "alerts_sent"
+            manifest.mark_step("health_check", "done")
         except Exception as e:
             logger.error("Health check FAILED: %s", e, exc_info=True)
             results["errors"].append(f"health_check: {e}")
+            manifest.mark_step("health_check", "failed")
 
     # ── Step 0: RSS Feed Monitor ──
-    if args.step is None or args.step == 0:
+    if (step is None or step == 0) and should_run("rss_monitor"):
         try:
             rss_count = rss_monitor.run(dry_run=dry_run)
             results["rss_entries"] = rss_count
             logger.info("Step 0 complete: %d new RSS entries", rss_count)
+            manifest.mark_step("rss_monitor", "done")
         except Exception as e:
             logger.error("Step 0 FAILED: %s", e, exc_info=True)
             results["errors"].append(f"rss_monitor: {e}")
+            manifest.mark_step("rss_monitor", "failed")
 
     # ── Step 1: Content Selection ──
-    if args.step is None or args.step == 1:
+    if (step is None or step == 1) and should_run("content_selector"):
         try:
             count = content_selector.run(date, next_date, dry_run=dry_run)
             results["curated_stories"] = count
             logger.info("Step 1 complete: %d stories curated", count)
+            manifest.mark_step("content_selector", "done")
         except Exception as e:
             logger.error("Step 1 FAILED: %s", e, exc_info=True)
             results["errors"].append(f"content_selector: {e}")
-            if args.step is None:
+            manifest.mark_step("content_selector", "failed")
+            if step is None:
                 # Fatal — nothing downstream works without curation
                 _print_summary(results, time.time() - start_time)
                 sys.exit(1)
 
+    # ── Steps 2-4 streamed: each item moves on as soon as its upstream stage is done ──
+    streaming = step is None and not (run_args["batch"] or run_args["sequential"])
+    if streaming and should_run("stream"):
+        try:
+            counts = stream.run(today, tomorrow, dry_run=dry_run, manifest=manifest)
+            results["researched_events"] = counts["research"]
+            results["summaries_generated"] = counts["summary"]
+            results["images_generated"] = counts["images"]
+            logger.info("Steps 2-4 complete: %s", counts)
+            # Failed items keep the step open so --resume retries just those. Image
+            # jobs past the prompt aren't in the manifest, so compare the counts
+            unfinished = any(
+                state != "done" for states in manifest.counts().values() for state in states
+            ) or counts["images"] < counts[images.IMAGE_ROOT_STAGE]
+            manifest.mark_step("stream", "incomplete" if unfinished else "done")
+        except Exception as e:
+            logger.error("Steps 2-4 FAILED: %s", e, exc_info=True)
+            results["errors"].append(f"stream: {e}")
+            manifest.mark_step("stream", "failed")
+
     # ── Step 2: Research ──
-    if args.step is None or args.step == 2:
+    if not streaming and (step is None or step == 2) and should_run("research"):
         try:
-            topic_results = research.run(today, tomorrow, dry_run=dry_run)
+            topic_results = research.run(today, tomorrow, dry_run=dry_run, batch=run_args["batch"])
             results["researched_events"] = topic_results
             logger.info("Step 2 complete: %s", topic_results)
+            manifest.mark_step("research", "done")
         except Exception as e:
             logger.error("Step 2 FAILED: %s", e, exc_info=True)
             results["errors"].append(f"research: {e}")
+            manifest.mark_step("research", "failed")
 
     # ── Step 3: 100-Word Summaries ──
-    if args.step is None or args.step == 3:
+    if not streaming and (step is None or step == 3) and should_run("summary"):
         try:
-            summary_count = summary.run(today, tomorrow, dry_run=dry_run)
+            summary_count = summary.run(today, tomorrow, dry_run=dry_run, batch=run_args["batch"])
             results["summaries_generated"] = summary_count
             logger.info("Step 3 complete: %d summaries", summary_count)
+            manifest.mark_step("summary", "done")
         except Exception as e:
             logger.error("Step 3 FAILED: %s", e, exc_info=True)
             results["errors"].append(f"summary: {e}")
+            manifest.mark_step("summary", "failed")
 
     # ── Step 4: Image Generation ──
-    if args.step is None or args.step == 4:
+    if not streaming and (step is None or step == 4) and should_run("images"):
         try:
             image_count = images.run(dry_run=dry_run)
             results["images_generated"] = image_count
             logger.info("Step 4 complete: %d images", image_count)
+            manifest.mark_step("images", "done")
         except Exception as e:
             logger.error("Step 4 FAILED: %s", e, exc_info=True)
             results["errors"].append(f"images: {e}")
+            manifest.mark_step("images", "failed")
 
+    results["circuits"] = circuit_states()
+    results["llm_cache"] = f"{llm_cache.hits} hits / {llm_cache.misses} misses" if llm_cache.enabled else "off"
+    results["db_requests"] = repo.requests.summary()
     elapsed = time.time() - start_time
     _print_summary(results, elapsed)
 
@@ -124,16 +228,26 @@ def _print_summary(results: dict, elapsed: float) -> None:
     logger.info("=" * 60)
     logger.info("PIPELINE SUMMARY")
     logger.info("  Date:       %s", results.get("date"))
+    logger.info("  Run:        %s", results.get("run_id", "—"))
     logger.info("  RSS:        %s", results.get("rss_entries", "—"))
     logger.info("  Curated:    %s", results.get("curated_stories", "—"))
     logger.info("  Researched: %s", results.get("researched_events", "—"))
     logger.info("  Summaries:  %s", results.get("summaries_generated", "—"))
     logger.info("  Images:     %s", results.get("images_generated", "—"))
+    logger.info("  LLM cache:  %s", results.get("llm_cache", "—"))
+    logger.info("  Supabase:   %s", results.get("db_requests", "—"))
+    circuits = results.get("circuits") or {}
+    logger.info(
+        "  Circuits:   %s",
+        ", ".join(f"{name}={state}" for name, state in sorted(circuits.items())) or "—",
+    )
     logger.info("  Errors:     %d", len(errors))
     if errors:
         for err in errors:
             logger.info("    - %s", err)
     logger.info("  Time:       %.1fs", elapsed)
+    metrics.end_step()
+    metrics.log_summary()
     logger.info("=" * 60)
 
 
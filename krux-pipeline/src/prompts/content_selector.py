@@ -74,3 +74,11 @@ If more than 5 are pure funding with no product angle, drop the weakest ones and
   }}
 ]
   }}"""
+
+
+# Map step of map-reduce curation: each shard only proposes candidates,
+# the final selection of 15-16 happens in a separate reduce call.
+SHORTLIST_INSTRUCTIONS = """This is shard {shard} of {total} of today's raw news articles.
+Do NOT pick the final 15-16 stories. Instead shortlist at most {limit} of the strongest
+candidates from THIS shard only, using the same selection criteria and the same STRICT JSON
+format (selected_total, mix_summary, selection_notes, items). Copy each item's "id" exactly."""
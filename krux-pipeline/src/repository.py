@@ -0,0 +1,196 @@
+from typing import Any, Callable, Iterator, TypedDict
+
+from .utils.bulk_writer import BulkWriter
+from .utils.db import fetch_existing_values, iter_rows
+from .utils.http_pool import RequestCounter
+
+
+class WebhookRow(TypedDict, total=False):
+    id: int
+    event_type: str
+    event_group_id: str
+    monitor_id: str
+    monitor_type: str
+    news_output: str
+    news_date: str
+    source_urls: list[dict]
+    full_data: dict
+    created_at: str
+
+
+class CuratedItemRow(TypedDict, total=False):
+    event_id: str
+    output: str
+    news_date: str
+    sources: list[dict]
+    topic: str
+
+
+class ResearchRow(TypedDict, total=False):
+    id: int
+    event_id: str
+    model_provider: str
+    news_date: str
+    output: str
+    topic: str
+
+
+class ArticleRow(TypedDict, total=False):
+    id: int
+    event_id: str
+    model_provider: str
+    news_date: str
+    sources: str  # JSON-encoded list
+    output: str
+    headline: str
+    topic: str
+    image_url: str | None
+    image_variants: list[dict]
+
+
+class ImageAssetRow(TypedDict, total=False):
+    prompt_hash: str
+    content_hash: str
+    url: str
+    variants: list[dict]
+
+
+class Repository:
+    """Every Supabase table the pipeline reads or writes, behind one client.
+
+    Steps call these methods instead of building queries inline, so each
+    table's columns, filters and batching live in one place. clients.py builds
+    the process-wide instance on the shared connection pool, and `requests`
+    counts and times what each table costs.
+    """
+
+    def __init__(self, client, requests: RequestCounter | None = None):
+        self.client = client
+        self.requests = requests or RequestCounter()
+
+    # ── bulk primitives ──
+
+    def iter_rows(
+        self, table: str, columns: list[str], where: Callable[[Any], Any] | None = None,
+    ) -> Iterator[dict]:
+        """Every matching row, oldest first, in keyset pages (see utils.db.iter_rows)."""
+        return iter_rows(self.client, table, columns, where=where)
+
+    def existing(self, table: str, column: str, values: list) -> set:
+        """Which of `values` are already in `table.column`, 100 per query."""
+        return fetch_existing_values(self.client, table, column, values)
+
+    def writer(self, table: str, **kwargs) -> BulkWriter:
+        """A BulkWriter on this client; use as a context manager or flush() it."""
+        return BulkWriter(self.client, table, **kwargs)
+
+    def insert_many(self, table: str, rows: list[dict], **kwargs) -> list[dict]:
+        """Insert rows in multi-row requests. Returns the rows written."""
+        with self.writer(table, **kwargs) as writer:
+            writer.extend(rows)
+        return writer.written
+
+    # ── webhooks ──
+
+    def iter_webhooks(self, date: str, next_date: str, columns: list[str]) -> Iterator[WebhookRow]:
+        return self.iter_rows(
+            "webhooks", columns, where=lambda q: q.gte("created_at", date).lt("created_at", next_date),
+        )
+
+    def stored_rss_guids(self, feed_id: str, guids: list[str]) -> set[str]:
+        """Which of `guids` (one query's worth) are already stored for the feed."""
+        result = (
+            self.client.table("webhooks")
+            .select("monitor_id")
+            .eq("monitor_type", "rss")
+            .eq("event_group_id", feed_id)
+            .in_("monitor_id", guids)
+            .execute()
+        )
+        return {row["monitor_id"] for row in result.data}
+
+    def count_webhooks_since(self, cutoff: str) -> int:
+        result = (
+            self.client.table("webhooks")
+            .select("id", count="exact")
+            .gte("created_at", cutoff)
+            .execute()
+        )
+        return result.count if result.count is not None else len(result.data)
+
+    # ── curation ──
+
+    def insert_curation_audit(self, payload: dict) -> dict | None:
+        result = self.client.table("curation_audit").insert(payload).execute()
+        return result.data[0] if result.data else None
+
+    def curated_event_ids(self, event_ids: list[str]) -> set[str]:
+        return self.existing("curation_selected_items", "event_id", event_ids)
+
+    def insert_curated_items(self, rows: list[CuratedItemRow]) -> list[CuratedItemRow]:
+        return self.insert_many("curation_selected_items", rows)
+
+    def iter_curated(self, date: str, next_date: str, topic: str) -> Iterator[CuratedItemRow]:
+        return self.iter_rows(
+            "curation_selected_items",
+            ["event_id", "output", "sources", "news_date", "topic"],
+            where=lambda q: q.gte("created_at", date).lt("created_at", next_date).eq("topic", topic),
+        )
+
+    # ── research_assistant ──
+
+    def researched_event_ids(self, event_ids: list[str]) -> set[str]:
+        return self.existing("research_assistant", "event_id", event_ids)
+
+    def insert_research(self, row: ResearchRow) -> None:
+        self.client.table("research_assistant").insert(row).execute()
+
+    def iter_research(self, date: str, next_date: str) -> Iterator[ResearchRow]:
+        return self.iter_rows(
+            "research_assistant",
+            ["id", "event_id", "news_date", "output", "topic"],
+            where=lambda q: q.gte("created_at", date).lt("created_at", next_date),
+        )
+
+    # ── hundred_word_articles ──
+
+    def summarized_event_ids(self, event_ids: list[str]) -> set[str]:
+        return self.existing("hundred_word_articles", "event_id", event_ids)
+
+    def insert_article(self, row: ArticleRow) -> ArticleRow | None:
+        result = self.client.table("hundred_word_articles").insert(row).execute()
+        return result.data[0] if result.data else None
+
+    def iter_articles_without_images(self) -> Iterator[ArticleRow]:
+        return self.iter_rows(
+            "hundred_word_articles",
+            ["id", "headline", "output", "image_url"],
+            where=lambda q: q.is_("image_url", "null"),
+        )
+
+    def update_article(self, article_id: int, values: ArticleRow) -> None:
+        self.client.table("hundred_word_articles").update(values).eq("id", article_id).execute()
+
+    # ── image_assets ──
+
+    def find_image_asset(self, column: str, value: str) -> ImageAssetRow | None:
+        """The image_assets row whose `column` ("prompt_hash" or "content_hash") is `value`."""
+        result = (
+            self.client.table("image_assets")
+            .select("prompt_hash", "content_hash", "url", "variants")
+            .eq(column, value)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def upsert_image_asset(self, row: ImageAssetRow) -> None:
+        self.client.table("image_assets").upsert(row, on_conflict="prompt_hash").execute()
+
+    # ── storage ──
+
+    def upload(self, bucket: str, file_name: str, data: bytes, content_type: str) -> str:
+        """Upload (overwriting) an object and return its public URL."""
+        store = self.client.storage.from_(bucket)
+        store.upload(file_name, data, file_options={"content-type": content_type, "upsert": "true"})
+        return store.get_public_url(file_name)
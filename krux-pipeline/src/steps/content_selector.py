@@ -1,38 +1,44 @@
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from ..clients import supabase, claude
-from ..prompts.content_selector import SYSTEM_PROMPT
+from ..clients import repo, claude, llm_cache
+from ..prompts.content_selector import SYSTEM_PROMPT, SHORTLIST_INSTRUCTIONS
+from ..utils.dedup import dedupe_by_text
 from ..utils.json_repair import safe_load_llm_json
+from ..utils.near_dup import collapse_near_duplicates
+from ..utils.prompt_packer import count_tokens, pack_records
+from ..utils.rate_limit import rate_limited
 from ..utils.retry import retry
 
 logger = logging.getLogger(__name__)
 
+# Above this many input tokens, curation switches to map-reduce over shards
+_SINGLE_CALL_TOKEN_BUDGET = 60_000
+_SHARD_TOKEN_BUDGET = 25_000
+_SHORTLIST_PER_SHARD = 8
+_MAP_WORKERS = 4
+
 
 def fetch_webhooks(date: str, next_date: str) -> list[dict]:
-    """Fetch webhooks for the date range and deduplicate by exact news_output."""
-    result = (
-        supabase.table("webhooks")
-        .select("id", "news_output", "source_urls", "news_date", "monitor_type", "created_at")
-        .gte("created_at", date)
-        .lt("created_at", next_date)
-        .order("created_at", desc=False)
-        .execute()
+    """Fetch webhooks for the date range and deduplicate by normalized news_output."""
+    rows = repo.iter_webhooks(
+        date, next_date, ["id", "news_output", "source_urls", "news_date", "monitor_type", "created_at"],
     )
+    return dedupe_by_text(rows, "news_output")
 
-    unique_results = []
-    for item in result.data:
-        current_news = item["news_output"]
-        if not any(existing["news_output"] == current_news for existing in unique_results):
-            unique_results.append(item)
 
-    return unique_results
+def _response_json(response) -> dict:
+    return safe_load_llm_json(response.content[0].text)
 
 
-@retry(max_attempts=3, exceptions=(Exception,))
+@retry(max_attempts=3, exceptions=(Exception,), circuit="anthropic")
 def curate_stories(webhooks_json: str) -> dict:
     """Call Claude to curate stories from raw webhooks."""
-    response = claude.messages.create(
+    response = llm_cache.create(
+        rate_limited("anthropic", claude.messages.create),
+        "anthropic.messages",
+        validate=_response_json,
         model="claude-sonnet-4-5",
         max_tokens=10000,
         system=SYSTEM_PROMPT,
@@ -41,7 +47,75 @@ def curate_stories(webhooks_json: str) -> dict:
             "content": f"Here is the JSON file with all the raw news articles collected:\n\n{webhooks_json}",
         }],
     )
-    return safe_load_llm_json(response.content[0].text)
+    return _response_json(response)
+
+
+def _shard_webhooks(webhooks: list[dict], token_budget: int) -> list[list[dict]]:
+    """Split rows into consecutive shards whose JSON stays under token_budget."""
+    shards, current, used = [], [], 0
+    for row in webhooks:
+        cost = count_tokens(json.dumps(row, default=str))
+        if current and used + cost > token_budget:
+            shards.append(current)
+            current, used = [], 0
+        current.append(row)
+        used += cost
+    if current:
+        shards.append(current)
+    return shards
+
+
+@retry(max_attempts=3, exceptions=(Exception,), circuit="anthropic")
+def shortlist_stories(shard_json: str, shard: int, total: int, limit: int) -> dict:
+    """Map step: ask Claude for at most `limit` candidates from one shard."""
+    instructions = SHORTLIST_INSTRUCTIONS.format(shard=shard, total=total, limit=limit)
+    response = llm_cache.create(
+        rate_limited("anthropic", claude.messages.create),
+        "anthropic.messages",
+        validate=_response_json,
+        model="claude-sonnet-4-5",
+        max_tokens=4000,
+        system=SYSTEM_PROMPT,
+        messages=[{
+            "role": "user",
+            "content": f"{instructions}\n\nHere is the JSON file with the raw news articles in this shard:\n\n{shard_json}",
+        }],
+    )
+    return _response_json(response)
+
+
+def curate_map_reduce(webhooks: list[dict]) -> dict:
+    """Curate a day too large for one call: shortlist shards concurrently, then reduce.
+
+    Shortlisted ids are mapped back to the original rows, so the reduce call
+    sees untouched news_output text. Rounds repeat until the survivors fit
+    in a single curation call.
+    """
+    rows = webhooks
+    while count_tokens(json.dumps(rows, default=str)) > _SINGLE_CALL_TOKEN_BUDGET:
+        shards = _shard_webhooks(rows, _SHARD_TOKEN_BUDGET)
+        logger.info("Map-reduce curation: %d rows in %d shards", len(rows), len(shards))
+        by_id = {str(row["id"]): row for row in rows}
+
+        def shortlist(index_shard):
+            index, shard = index_shard
+            content = shortlist_stories(
+                json.dumps(shard, default=str), index + 1, len(shards), _SHORTLIST_PER_SHARD,
+            )
+            return [str(item.get("id")) for item in content.get("items", [])]
+
+        with ThreadPoolExecutor(max_workers=_MAP_WORKERS) as pool:
+            shortlisted_ids = [i for ids in pool.map(shortlist, enumerate(shards)) for i in ids]
+
+        survivors = list({i: by_id[i] for i in shortlisted_ids if i in by_id}.values())
+        if not survivors or len(survivors) >= len(rows):
+            raise ValueError(
+                f"Map-reduce curation made no progress ({len(rows)} -> {len(survivors)} rows)"
+            )
+        rows = survivors
+
+    logger.info("Reducing %d shortlisted rows to the final selection", len(rows))
+    return curate_stories(json.dumps(rows, default=str))
 
 
 def save_curation_audit(content: dict) -> dict | None:
@@ -56,50 +130,44 @@ def save_curation_audit(content: dict) -> dict | None:
         "others": mix.get("others", 0),
         "selection_notes": content.get("selection_notes"),
     }
-    res = supabase.table("curation_audit").insert(payload).execute()
-    return res.data[0] if res.data else None
+    return repo.insert_curation_audit(payload)
 
 
 def save_curated_items(content: dict, dry_run: bool = False) -> list[dict]:
-    """Insert each curated item into curation_selected_items."""
-    articles = content.get("items", [])
-    saved = []
-
-    for item in articles:
+    """Insert the curated items into curation_selected_items, skipping event_ids
+    already stored — one lookup per 100 ids and one multi-row insert.
+    """
+    records = {}
+    for item in content.get("items", []):
         event_id = f"{item.get('id')}_{item.get('news_date')}"
-        record = {
+        records.setdefault(event_id, {
             "event_id": event_id,
             "output": item["output"],
             "news_date": item["news_date"],
             "sources": item["sources"],
             "topic": item["topic"],
-        }
+        })
 
-        if dry_run:
+    if dry_run:
+        for event_id in records:
             logger.info("[DRY RUN] Would save curated item: %s", event_id)
-            saved.append(record)
-            continue
-
-        # Idempotency check
-        existing = (
-            supabase.table("curation_selected_items")
-            .select("event_id")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        if existing.data:
-            logger.info("Skipping duplicate event_id: %s", event_id)
-            continue
-
-        supabase.table("curation_selected_items").insert(record).execute()
-        logger.info("Saved curated item: %s", event_id)
-        saved.append(record)
-
+        return list(records.values())
+
+    # Idempotency check
+    existing = repo.curated_event_ids(list(records))
+    for event_id in existing:
+        logger.info("Skipping duplicate event_id: %s", event_id)
+    saved = repo.insert_curated_items([r for event_id, r in records.items() if event_id not in existing])
+    logger.info("Saved %d curated items", len(saved))
     return saved
 
 
-def run(date: str, next_date: str, dry_run: bool = False) -> int:
-    """Run the full content selection step. Returns count of curated items."""
+def run(date: str, next_date: str, dry_run: bool = False, map_reduce: bool | None = None) -> int:
+    """Run the full content selection step. Returns count of curated items.
+
+    map_reduce=None picks map-reduce automatically when the day's webhooks do
+    not fit comfortably in a single curation call.
+    """
     webhooks = fetch_webhooks(date, next_date)
     logger.info("Fetched %d unique webhooks for %s", len(webhooks), date)
 
@@ -107,8 +175,26 @@ def run(date: str, next_date: str, dry_run: bool = False) -> int:
         logger.warning("No webhooks found for %s. Skipping curation.", date)
         return 0
 
-    webhooks_json = json.dumps(webhooks, default=str)
-    content = curate_stories(webhooks_json)
+    # Merge near-duplicate stories locally so Claude only sees one per cluster
+    representatives = collapse_near_duplicates(webhooks)
+    logger.info(
+        "Collapsed %d webhooks into %d near-duplicate clusters",
+        len(webhooks), len(representatives),
+    )
+
+    # Only the fields the curation prompt copies from; news_output is never truncated
+    packed = pack_records(
+        representatives,
+        required=["id", "news_output", "news_date", "source_urls"],
+        label="curation",
+    )
+    webhooks_json = packed.to_json()
+    if map_reduce is None:
+        map_reduce = packed.tokens > _SINGLE_CALL_TOKEN_BUDGET
+    if map_reduce:
+        content = curate_map_reduce(packed.items)
+    else:
+        content = curate_stories(webhooks_json)
     logger.info("Claude curated %d stories", content.get("selected_total", 0))
 
     if not dry_run:
@@ -5,7 +5,7 @@ from pathlib import Path
 
 import requests
 
-from ..clients import supabase
+from ..clients import repo
 from ..config import _require_env
 
 logger = logging.getLogger(__name__)
@@ -67,13 +67,7 @@ def _check_recent_webhooks() -> list[str]:
     cutoff = (datetime.now(timezone.utc) - timedelta(hours=_WEBHOOK_GAP_HOURS)).isoformat()
 
     try:
-        result = (
-            supabase.table("webhooks")
-            .select("id", count="exact")
-            .gte("created_at", cutoff)
-            .execute()
-        )
-        count = result.count if result.count is not None else len(result.data)
+        count = repo.count_webhooks_since(cutoff)
         if count == 0:
             alerts.append(f"No new webhooks in the last {_WEBHOOK_GAP_HOURS}h")
         else:
@@ -1,101 +1,277 @@
 import base64
+import itertools
 import logging
+from typing import Iterator
 
-from ..clients import supabase, claude, openai_client
+from postgrest.exceptions import APIError
+
+from ..clients import repo, claude, openai_client, llm_cache, image_store
+from ..config import (
+    IMAGE_MAX_WORKERS, IMAGE_PROMPT_WORKERS, IMAGE_UPLOAD_WORKERS,
+    IMAGE_VARIANTS_ENABLED, IMAGE_VARIANT_FORMATS, IMAGE_VARIANT_WIDTHS,
+)
 from ..prompts.image import SYSTEM_PROMPT
+from ..utils.image_store import content_hash, prompt_hash
+from ..utils.image_variants import ImageVariant, encode_variants, supported_formats
+from ..utils.prompt_cache import cached_system, log_cache_usage
+from ..utils.rate_limit import rate_limited
 from ..utils.retry import retry
+from ..utils.stage_graph import Stage, StageGraph
 
 logger = logging.getLogger(__name__)
 
+# Items allowed to wait per worker before the stage upstream of it blocks —
+# bounds how many generated images sit in memory ahead of the uploaders
+_QUEUE_PER_WORKER = 2
+_ENCODE_WORKERS = 2  # Pillow releases the GIL while resizing and encoding
+
+IMAGE_ROOT_STAGE, IMAGE_FINAL_STAGE = "image-prompt", "image-upload"
+
+_BUCKET = "article-image"
+_IMAGE_MODEL = "gpt-image-1-mini"
+_IMAGE_SIZE = "1536x1024"
+_VARIANT_FORMATS = supported_formats(IMAGE_VARIANT_FORMATS) if IMAGE_VARIANTS_ENABLED else []
+# PostgREST codes for a column the table doesn't have (schema cache miss / Postgres undefined_column)
+_UNKNOWN_COLUMN_CODES = {"PGRST204", "42703"}
+_variants_column = True  # cleared once hundred_word_articles turns out to lack image_variants
+
+
+def iter_articles_without_images() -> Iterator[dict]:
+    """Stream articles from hundred_word_articles where image_url is NULL, oldest first."""
+    return repo.iter_articles_without_images()
+
 
 def fetch_articles_without_images() -> list[dict]:
     """Fetch articles from hundred_word_articles where image_url is NULL."""
-    result = (
-        supabase.table("hundred_word_articles")
-        .select("id", "headline", "output", "image_url")
-        .is_("image_url", "null")
-        .order("created_at", desc=False)
-        .execute()
-    )
-    return result.data
+    return list(iter_articles_without_images())
 
 
-@retry(max_attempts=3, exceptions=(Exception,))
+@retry(max_attempts=3, exceptions=(Exception,), circuit="anthropic")
 def generate_image_prompt(article: dict) -> str:
     """Use Claude to generate a concise image prompt from the article."""
-    response = claude.messages.create(
+    response = llm_cache.create(
+        rate_limited("anthropic", claude.messages.create),
+        "anthropic.messages",
         model="claude-sonnet-4-5",
         max_tokens=85,
-        system=SYSTEM_PROMPT,
+        system=cached_system(SYSTEM_PROMPT),
         messages=[{
             "role": "user",
             "content": f"Story headline: {article['headline']}\nStory summary: {article['output']}",
         }],
     )
+    log_cache_usage(f"Image prompt {article['id']}", response)
     return response.content[0].text
 
 
-@retry(max_attempts=3, exceptions=(Exception,))
+@retry(max_attempts=3, exceptions=(Exception,), circuit="openai")
 def generate_image(prompt_text: str) -> bytes:
     """Generate an image using OpenAI and return raw PNG bytes."""
-    result = openai_client.images.generate(
-        model="gpt-image-1-mini",
+    result = rate_limited("openai", openai_client.images.generate)(
+        model=_IMAGE_MODEL,
         prompt=prompt_text,
-        size="1536x1024",
+        size=_IMAGE_SIZE,
     )
     return base64.b64decode(result.data[0].b64_json)
 
 
-@retry(max_attempts=3, exceptions=(Exception,))
-def upload_to_storage(article_id: int, image_bytes: bytes) -> str:
-    """Upload image to Supabase storage and return the public URL."""
-    file_name = f"{article_id}.png"
+def encode_image_variants(image_bytes: bytes) -> list[ImageVariant]:
+    """WebP (and optionally AVIF) copies at each configured width; [] when disabled."""
+    return encode_variants(image_bytes, IMAGE_VARIANT_WIDTHS, _VARIANT_FORMATS)
 
-    supabase.storage.from_("article-image").upload(
-        file_name,
-        image_bytes,
-        file_options={"content-type": "image/png", "upsert": "true"},
-    )
 
-    return supabase.storage.from_("article-image").get_public_url(file_name)
+@retry(max_attempts=3, exceptions=(Exception,), circuit="supabase-storage")
+def _upload(file_name: str, data: bytes, content_type: str) -> str:
+    return repo.upload(_BUCKET, file_name, data, content_type)
 
 
-def update_image_url(article_id: int, public_url: str) -> None:
-    """Update the article's image_url in hundred_word_articles."""
-    supabase.table("hundred_word_articles").update(
-        {"image_url": public_url}
-    ).eq("id", article_id).execute()
+def upload_to_storage(object_key: str, image_bytes: bytes) -> str:
+    """Upload the original PNG to Supabase storage and return the public URL."""
+    return _upload(f"{object_key}.png", image_bytes, "image/png")
 
 
-def run(dry_run: bool = False) -> int:
-    """Generate and upload images for all articles missing images. Returns success count."""
-    articles = fetch_articles_without_images()
-    if not articles:
-        logger.info("No articles need images")
-        return 0
+def upload_variants(object_key: str, variants: list[ImageVariant]) -> list[dict]:
+    """Upload each variant as <object_key>/<width>.<format>. Returns the manifest entries."""
+    return [
+        {
+            "format": variant.format,
+            "width": variant.width,
+            "height": variant.height,
+            "bytes": len(variant.data),
+            "url": _upload(f"{object_key}/{variant.file_name}", variant.data, variant.content_type),
+        }
+        for variant in variants
+    ]
+
 
-    logger.info("Generating images for %d articles", len(articles))
-    success, failed = 0, 0
+def update_image_url(article_id: int, public_url: str, variants: list[dict] | None = None) -> None:
+    """Update the article's image_url (and image_variants manifest) in hundred_word_articles.
 
-    for article in articles:
+    Without the image_variants column (supabase/migrations) only image_url is
+    written, with a warning, so images already paid for still get linked.
+    """
+    global _variants_column
+    if variants and _variants_column:
         try:
-            prompt_text = generate_image_prompt(article)
-            logger.info("Image prompt for %d: %s", article["id"], prompt_text[:80])
+            repo.update_article(article_id, {"image_url": public_url, "image_variants": variants})
+            return
+        except APIError as e:
+            if e.code not in _UNKNOWN_COLUMN_CODES:
+                raise
+            _variants_column = False
+            logger.warning("hundred_word_articles has no image_variants column, saving image_url only: %s", e)
+    repo.update_article(article_id, {"image_url": public_url})
+
+
+# An image job moves through the stages below as a dict: id, prompt and
+# prompt_hash, then either `asset` (an image_store row to reuse) or image,
+# content_hash and variants for a new image.
+
+
+def _article_key(article: dict) -> str:
+    # dry runs never insert, so an unsaved summary has no id yet
+    return str(article["id"]) if article.get("id") is not None else article["event_id"]
+
+
+def _job_key(job: dict) -> str:
+    return str(job["id"])
+
+
+def _prompt_stage(article: dict, dry_run: bool) -> dict | None:
+    prompt_text = generate_image_prompt(article)
+    logger.info("Image prompt for %s: %s", article["id"], prompt_text[:80])
+    if dry_run:
+        logger.info("[DRY RUN] Would generate and upload image for article %s", article["id"])
+        return None
+    key = prompt_hash(prompt_text, model=_IMAGE_MODEL, size=_IMAGE_SIZE)
+    return {"id": article["id"], "prompt": prompt_text, "prompt_hash": key}
 
-            if dry_run:
-                logger.info("[DRY RUN] Would generate and upload image for article %d", article["id"])
-                success += 1
-                continue
 
-            image_bytes = generate_image(prompt_text)
-            public_url = upload_to_storage(article["id"], image_bytes)
-            update_image_url(article["id"], public_url)
+def _generate_stage(job: dict) -> dict:
+    # Looked up here rather than when prompting so a resumed run reuses images
+    # its interrupted predecessor already paid for
+    asset = image_store.by_prompt(job["prompt_hash"])
+    if asset is not None:
+        return {**job, "asset": asset}
+    image_bytes = generate_image(job["prompt"])
+    return {**job, "asset": None, "image": image_bytes, "content_hash": content_hash(image_bytes)}
 
-            success += 1
-            logger.info("Image saved for article %d: %s", article["id"], public_url)
-        except Exception as e:
-            logger.error("Image failed for article %d: %s", article["id"], e, exc_info=True)
-            failed += 1
 
-    logger.info("Images: %d succeeded, %d failed", success, failed)
+def _encode_stage(job: dict) -> dict:
+    if job["asset"] is not None:
+        return job
+    existing = image_store.by_content(job["content_hash"])
+    if existing is not None:
+        return {**job, "asset": existing}
+    return {**job, "variants": encode_image_variants(job["image"])}
+
+
+def _upload_stage(job: dict) -> str:
+    """Upload a new image under its content hash (or reuse an existing one) and link it."""
+    asset = job["asset"]
+    if asset is None:
+        key = job["content_hash"]
+        url = upload_to_storage(key, job["image"])
+        asset = {"content_hash": key, "url": url, "variants": upload_variants(key, job["variants"])}
+    else:
+        logger.info("Reusing stored image for article %s", job["id"])
+    if asset.get("prompt_hash") != job["prompt_hash"]:
+        image_store.record(job["prompt_hash"], asset["content_hash"], asset["url"], asset["variants"])
+    update_image_url(job["id"], asset["url"], asset["variants"])
+    logger.info("Image saved for article %s: %s (+%d variants)", job["id"], asset["url"], len(asset["variants"] or []))
+    return asset["url"]
+
+
+def process_article(article: dict, dry_run: bool = False) -> str | None:
+    """Prompt, generate, upload and link one article's image. Returns the public URL."""
+    job = _prompt_stage(article, dry_run)
+    if job is None:
+        return None
+    return _upload_stage(_encode_stage(_generate_stage(job)))
+
+
+def build_stages(
+    dry_run: bool = False,
+    after: str | None = None,
+    prompt_workers: int = IMAGE_PROMPT_WORKERS,
+    generate_workers: int = IMAGE_MAX_WORKERS,
+    upload_workers: int = IMAGE_UPLOAD_WORKERS,
+    encode_workers: int = _ENCODE_WORKERS,
+) -> list[Stage]:
+    """prompt → generate → encode variants → upload, each on its own pool.
+
+    Every queue after prompting is bounded, so a slow image model stalls
+    prompting instead of letting prompts race ahead, and slow uploads stall
+    generation instead of buffering every image in memory. Meanwhile each
+    upload overlaps with the next generations. `after` hangs the prompt stage
+    off an upstream stage producing articles (stream's summary). Only
+    prompting is checkpointed in a RunManifest; later jobs carry image bytes.
+    """
+    return [
+        Stage(
+            IMAGE_ROOT_STAGE,
+            lambda article: _prompt_stage(article, dry_run),
+            workers=prompt_workers,
+            after=after,
+            key=_article_key,
+            queue_size=prompt_workers * _QUEUE_PER_WORKER,  # articles are read a page at a time
+        ),
+        Stage(
+            "image-generate",
+            _generate_stage,
+            workers=generate_workers,
+            after=IMAGE_ROOT_STAGE,
+            key=_job_key,
+            queue_size=generate_workers * _QUEUE_PER_WORKER,
+            checkpoint=False,
+        ),
+        Stage(
+            "image-encode",
+            _encode_stage,
+            workers=encode_workers,
+            after="image-generate",
+            key=_job_key,
+            queue_size=encode_workers * _QUEUE_PER_WORKER,
+            checkpoint=False,
+        ),
+        Stage(
+            IMAGE_FINAL_STAGE,
+            _upload_stage,
+            workers=upload_workers,
+            after="image-encode",
+            key=_job_key,
+            queue_size=upload_workers * _QUEUE_PER_WORKER,
+            checkpoint=False,
+        ),
+    ]
+
+
+def build_graph(dry_run: bool = False, **workers: int) -> StageGraph:
+    return StageGraph(build_stages(dry_run=dry_run, **workers))
+
+
+def images_done(stats: dict, dry_run: bool = False) -> int:
+    """Articles that got an image (or, in a dry run, a prompt) in a graph run."""
+    return stats[IMAGE_ROOT_STAGE if dry_run else IMAGE_FINAL_STAGE].succeeded
+
+
+def run(dry_run: bool = False) -> int:
+    """Generate and upload images for all articles missing images. Returns success count."""
+    articles = iter_articles_without_images()
+    first = next(articles, None)
+    if first is None:
+        logger.info("No articles need images")
+        return 0
+
+    logger.info("Generating images for articles missing one")
+    hits_before = image_store.hits
+    stats = build_graph(dry_run=dry_run).run({IMAGE_ROOT_STAGE: itertools.chain([first], articles)})
+
+    success = images_done(stats, dry_run)
+    failed = sum(s.failed for s in stats.values())
+    logger.info(
+        "Images: %d of %d succeeded (%d reused from the image store), %d failed",
+        success, stats[IMAGE_ROOT_STAGE].succeeded + stats[IMAGE_ROOT_STAGE].failed,
+        image_store.hits - hits_before, failed,
+    )
     return success
@@ -1,6 +1,8 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from ..clients import supabase, openai_client
+from ..clients import repo, openai_client, llm_cache
+from ..config import CACHE_DIR, RESEARCH_MAX_WORKERS
 from ..prompts import (
     research_funding,
     research_model,
@@ -8,12 +10,17 @@ from ..prompts import (
     research_workflow,
     research_others,
 )
+from ..utils.metrics import metrics
+from ..utils.openai_batch import ResponsesBatch
+from ..utils.rate_limit import rate_limited
 from ..utils.retry import retry
 
 logger = logging.getLogger(__name__)
 
-# Sequential order — each topic's events are processed sequentially to maximize
-# prompt caching (same system prompt reused across all events in a topic).
+_BATCH_STATE_PATH = CACHE_DIR / "research_batch.json"
+
+# Dispatch order — events are queued topic by topic, so requests sharing a system
+# prompt go out back to back and keep prompt-cache locality under concurrency.
 TOPIC_PIPELINE = [
     ("Funding", research_funding.SYSTEM_PROMPT),
     ("Model announcements/enhancements", research_model.SYSTEM_PROMPT),
@@ -28,21 +35,11 @@ _TOPICS_WITH_SOURCES = {"Funding", "Model announcements/enhancements", "Others",
 
 def fetch_curated_by_topic(date: str, next_date: str, topic: str) -> list[dict]:
     """Fetch curated items for a specific topic, created today."""
-    result = (
-        supabase.table("curation_selected_items")
-        .select("event_id, output, sources, news_date, topic")
-        .gte("created_at", date)
-        .lt("created_at", next_date)
-        .eq("topic", topic)
-        .order("created_at", desc=False)
-        .execute()
-    )
-    return result.data
+    return list(repo.iter_curated(date, next_date, topic))
 
 
-@retry(max_attempts=3, exceptions=(Exception,))
-def research_single_event(event: dict, system_prompt: str, topic: str) -> str:
-    """Call OpenAI GPT-5-nano with web_search for a single event."""
+def _research_params(event: dict, system_prompt: str, topic: str) -> dict:
+    """responses.create parameters for one event — shared by the live and batch paths."""
     # Build event input — some topics include sources, workflow does not
     if topic in _TOPICS_WITH_SOURCES:
         event_input = f"Event to research:\nEvent: {event['output']}\nSources: {event['sources']}"
@@ -50,43 +47,233 @@ def research_single_event(event: dict, system_prompt: str, topic: str) -> str:
         # Workflow enhancement notebook just passes the output directly
         event_input = f"Report/event to research:\n{event['output']}"
 
-    response = openai_client.responses.create(
-        model="gpt-5-nano",
-        tools=[{"type": "web_search"}],
-        include=["web_search_call.action.sources"],
-        instructions=system_prompt,
-        input=event_input,
+    return {
+        "model": "gpt-5-nano",
+        "tools": [{"type": "web_search"}],
+        "include": ["web_search_call.action.sources"],
+        "instructions": system_prompt,
+        "input": event_input,
+    }
+
+
+@retry(max_attempts=3, exceptions=(Exception,), circuit="openai")
+def research_single_event(event: dict, system_prompt: str, topic: str, use_cache: bool = True) -> str:
+    """Call OpenAI GPT-5-nano with web_search for a single event."""
+    # Limiter sits inside the cache so hits never spend quota
+    response = llm_cache.create(
+        rate_limited("openai", openai_client.responses.create), "openai.responses", use_cache=use_cache,
+        **_research_params(event, system_prompt, topic),
     )
     return response.output_text
 
 
+def fetch_researched_event_ids(event_ids: list[str]) -> set[str]:
+    """Event ids that already have a research_assistant row — one query per 100 ids."""
+    return repo.researched_event_ids(event_ids)
+
+
 def save_research(record: dict, dry_run: bool = False) -> None:
-    """Save a research result to the research_assistant table."""
+    """Save a research result to the research_assistant table.
+
+    Callers skip already-researched events via fetch_researched_event_ids.
+    """
     if dry_run:
         logger.info("[DRY RUN] Would save research for: %s", record["event_id"])
         return
 
-    existing = (
-        supabase.table("research_assistant")
-        .select("event_id")
-        .eq("event_id", record["event_id"])
-        .execute()
-    )
-    if existing.data:
-        logger.info("Skipping duplicate research event_id: %s", record["event_id"])
-        return
-
-    supabase.table("research_assistant").insert({
+    repo.insert_research({
         "event_id": record["event_id"],
         "model_provider": "openai",
         "news_date": record["news_date"],
         "output": record["output"],
         "topic": record["topic"],
-    }).execute()
+    })
+
+
+def research_event(event: dict, topic: str, system_prompt: str, dry_run: bool = False) -> dict:
+    """Research and save one event. Returns the saved record (the input for Step 3)."""
+    output = research_single_event(event, system_prompt, topic)
+    record = {
+        "event_id": event["event_id"],
+        "news_date": event["news_date"],
+        "output": output,
+        "topic": event["topic"],
+    }
+    save_research(record, dry_run=dry_run)
+    logger.info("%s: researched %s", topic, event["event_id"])
+    return record
+
+
+def _research_event(event: dict, topic: str, system_prompt: str, dry_run: bool = False) -> bool:
+    """Research and save one event. Returns True on success."""
+    try:
+        with metrics.item("research", event["event_id"]):
+            research_event(event, topic, system_prompt, dry_run)
+        return True
+    except Exception as e:
+        logger.error("%s: event %s failed: %s", topic, event["event_id"], e)
+        return False
+
+
+def _prefetch_researched(event_ids: list[str]) -> set[str]:
+    """fetch_researched_event_ids, or an empty set if the lookup fails — the
+    events are then researched rather than every topic being abandoned."""
+    try:
+        return fetch_researched_event_ids(event_ids)
+    except Exception as e:
+        logger.error("Looking up already-researched events failed, researching all: %s", e, exc_info=True)
+        return set()
+
+
+def _split_jobs(
+    jobs: list[tuple[str, str, dict]], tallies: dict[str, list[int]],
+) -> tuple[dict[str, tuple[str, str, dict]], dict[str, list[str]]]:
+    """Count already-researched jobs as succeeded; return the rest as
+    ({event_id: first job}, {event_id: topics of its repeats})."""
+    done = _prefetch_researched([event["event_id"] for _, _, event in jobs])
+    pending: dict[str, tuple[str, str, dict]] = {}
+    repeats: dict[str, list[str]] = {}
+    for topic, system_prompt, event in jobs:
+        event_id = event["event_id"]
+        if event_id in done:
+            logger.info("%s: skipping already-researched %s", topic, event_id)
+            tallies[topic][0] += 1
+        elif event_id in pending:
+            repeats.setdefault(event_id, []).append(topic)  # curated items can repeat an event_id
+        else:
+            pending[event_id] = (topic, system_prompt, event)
+    return pending, repeats
+
+
+def _tally(
+    outcomes: dict[str, bool], pending: dict[str, tuple[str, str, dict]],
+    repeats: dict[str, list[str]], tallies: dict[str, list[int]],
+) -> dict[str, tuple[int, int]]:
+    """Count each event's outcome for its topic and for every repeat of it."""
+    for event_id, ok in outcomes.items():
+        for topic in [pending[event_id][0], *repeats.get(event_id, [])]:
+            tallies[topic][0 if ok else 1] += 1
+    return {topic: (ok, failed) for topic, (ok, failed) in tallies.items()}
+
+
+def _research_live(
+    jobs: list[tuple[str, str, dict]], dry_run: bool = False, max_workers: int = RESEARCH_MAX_WORKERS
+) -> dict[str, bool]:
+    """Research distinct events concurrently. Returns {event_id: succeeded}."""
+    if not jobs:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = {
+            pool.submit(_research_event, event, topic, system_prompt, dry_run): event["event_id"]
+            for topic, system_prompt, event in jobs
+        }
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
+
+def _research_events(
+    jobs: list[tuple[str, str, dict]], dry_run: bool = False, max_workers: int = RESEARCH_MAX_WORKERS
+) -> dict[str, tuple[int, int]]:
+    """Run (topic, system_prompt, event) jobs concurrently, in submission order.
+
+    Already-researched events are found with one prefetch and count as
+    succeeded without an API call; a repeated event_id is researched once and
+    counted with its first occurrence's outcome. Returns {topic: (succeeded, failed)}.
+    """
+    tallies = {topic: [0, 0] for topic, _, _ in jobs}
+    pending, repeats = _split_jobs(jobs, tallies)
+    outcomes = _research_live(list(pending.values()), dry_run, max_workers)
+    return _tally(outcomes, pending, repeats, tallies)
+
+
+def _save_batch_results(results: dict[str, tuple[dict, str | None]], dry_run: bool = False) -> set[str]:
+    """Save successful batch outputs. Returns the event_ids that were saved."""
+    saved = set()
+    for event_id, (context, output) in results.items():
+        if not output:
+            continue
+        try:
+            save_research({
+                "event_id": event_id,
+                "news_date": context["news_date"],
+                "output": output,
+                "topic": context["topic"],
+            }, dry_run=dry_run)
+            saved.add(event_id)
+            logger.info("%s: researched %s (batch)", context["topic"], event_id)
+        except Exception as e:
+            logger.error("%s: saving batch result %s failed: %s", context["topic"], event_id, e)
+    return saved
+
+
+def resume_research_batch(dry_run: bool = False) -> int:
+    """Finish a batch left behind by a run that died. Returns how many results were saved.
+
+    Events researched since (live, by a later run) are skipped, so a result is
+    never saved twice. A dry run leaves the batch alone: results it can't save
+    would be lost for good.
+    """
+    interrupted = ResponsesBatch(openai_client, _BATCH_STATE_PATH)
+    if not interrupted.load():
+        return 0
+    if dry_run:
+        logger.info("[DRY RUN] Would resume research batch %s", interrupted.batch_id)
+        return 0
+    results = interrupted.wait()
+    done = fetch_researched_event_ids(list(results))
+    for event_id in done:
+        logger.info("%s: skipping already-researched %s (batch)", results[event_id][0]["topic"], event_id)
+    saved = _save_batch_results({k: v for k, v in results.items() if k not in done})
+    interrupted.done()
+    return len(saved)
+
+
+def _research_events_batch(
+    jobs: list[tuple[str, str, dict]], dry_run: bool = False, max_workers: int = RESEARCH_MAX_WORKERS
+) -> dict[str, tuple[int, int]]:
+    """Same contract as _research_events, but through the OpenAI Batch API.
+
+    Events the batch does not return are retried on the live executor. If the
+    batch itself fails, it is cancelled and every event is researched live. A
+    dry run only logs what it would batch.
+    """
+    tallies = {topic: [0, 0] for topic, _, _ in jobs}
+    pending, repeats = _split_jobs(jobs, tallies)
+    if dry_run:
+        for event_id in pending:
+            logger.info("[DRY RUN] Would batch research for: %s", event_id)
+        return _tally(dict.fromkeys(pending, True), pending, repeats, tallies)
+
+    pending_batch = ResponsesBatch(openai_client, _BATCH_STATE_PATH)
+    for event_id, (topic, system_prompt, event) in pending.items():
+        pending_batch.add(
+            event_id,
+            context={"topic": event["topic"], "news_date": event["news_date"]},
+            **_research_params(event, system_prompt, topic),
+        )
+
+    saved: set[str] = set()
+    if pending:
+        try:
+            results = pending_batch.run()
+        except TimeoutError:
+            raise  # still running — the next --batch run resumes it
+        except Exception as e:
+            logger.error("Research batch failed, falling back to live calls: %s", e, exc_info=True)
+            pending_batch.cancel()  # so no later run saves its results on top of the live ones
+        else:
+            saved = _save_batch_results(results)
+            pending_batch.done()
+
+    leftovers = [job for event_id, job in pending.items() if event_id not in saved]
+    if leftovers:
+        logger.info("Researching %d batch stragglers live", len(leftovers))
+    outcomes = {**dict.fromkeys(saved, True), **_research_live(leftovers, max_workers=max_workers)}
+    return _tally(outcomes, pending, repeats, tallies)
 
 
 def research_topic(
-    date: str, next_date: str, topic: str, system_prompt: str, dry_run: bool = False
+    date: str, next_date: str, topic: str, system_prompt: str, dry_run: bool = False,
+    max_workers: int = RESEARCH_MAX_WORKERS,
 ) -> int:
     """Research all events for a single topic. Returns success count."""
     events = fetch_curated_by_topic(date, next_date, topic)
@@ -95,48 +282,45 @@ def research_topic(
         return 0
 
     logger.info("%s: researching %d events", topic, len(events))
-    success, failed = 0, 0
-
-    for event in events:
-        try:
-            # Skip already-researched events before calling the API
-            existing = (
-                supabase.table("research_assistant")
-                .select("event_id")
-                .eq("event_id", event["event_id"])
-                .execute()
-            )
-            if existing.data:
-                logger.info("%s: skipping already-researched %s", topic, event["event_id"])
-                success += 1
-                continue
-
-            output = research_single_event(event, system_prompt, topic)
-            record = {
-                "event_id": event["event_id"],
-                "news_date": event["news_date"],
-                "output": output,
-                "topic": event["topic"],
-            }
-            save_research(record, dry_run=dry_run)
-            success += 1
-            logger.info("%s: researched %s", topic, event["event_id"])
-        except Exception as e:
-            logger.error("%s: event %s failed: %s", topic, event["event_id"], e)
-            failed += 1
-
+    jobs = [(topic, system_prompt, event) for event in events]
+    success, failed = _research_events(jobs, dry_run=dry_run, max_workers=max_workers)[topic]
     logger.info("%s: %d succeeded, %d failed", topic, success, failed)
     return success
 
 
-def run(date: str, next_date: str, dry_run: bool = False) -> dict[str, int | str]:
-    """Run research for all topics sequentially. Returns per-topic results."""
-    results = {}
+def run(
+    date: str, next_date: str, dry_run: bool = False, max_workers: int = RESEARCH_MAX_WORKERS,
+    batch: bool = False,
+) -> dict[str, int | str]:
+    """Research every topic's events on one shared worker pool. Returns per-topic results.
+
+    With batch=True the events go through the OpenAI Batch API instead, after
+    finishing any batch an earlier run left behind.
+    """
+    if batch:
+        resumed = resume_research_batch(dry_run=dry_run)
+        if resumed:
+            logger.info("Saved %d results from a resumed research batch", resumed)
+
+    results: dict[str, int | str] = {}
+    jobs: list[tuple[str, str, dict]] = []
     for topic, system_prompt in TOPIC_PIPELINE:
         try:
-            count = research_topic(date, next_date, topic, system_prompt, dry_run=dry_run)
-            results[topic] = count
+            events = fetch_curated_by_topic(date, next_date, topic)
         except Exception as e:
             logger.error("Research pipeline failed for %s: %s", topic, e, exc_info=True)
             results[topic] = f"FAILED: {e}"
-    return results
+            continue
+        if not events:
+            logger.info("%s: no curated items found", topic)
+            results[topic] = 0
+            continue
+        logger.info("%s: researching %d events", topic, len(events))
+        jobs.extend((topic, system_prompt, event) for event in events)
+
+    execute = _research_events_batch if batch else _research_events
+    for topic, (success, failed) in execute(jobs, dry_run=dry_run, max_workers=max_workers).items():
+        logger.info("%s: %d succeeded, %d failed", topic, success, failed)
+        results[topic] = success
+    # Keep the report in TOPIC_PIPELINE order
+    return {topic: results[topic] for topic, _ in TOPIC_PIPELINE if topic in results}
@@ -1,16 +1,34 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from html.parser import HTMLParser
+from urllib.parse import urlsplit
 
 import feedparser
+import requests
 
-from ..clients import supabase
+from ..clients import repo
+from ..config import CACHE_DIR
 from ..feeds import FEEDS, FeedSource
+from ..utils.feed_cache import FeedValidatorCache, content_hash
 from ..utils.retry import retry
 
 logger = logging.getLogger(__name__)
 
 _MAX_AGE_DAYS = 7
+_MAX_WORKERS = 16  # feeds downloaded in parallel
+_PER_HOST_LIMIT = 2  # concurrent requests allowed against a single host
+
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+_validators = FeedValidatorCache(CACHE_DIR / "rss_validators.json")
+
+# (feed_id, guid) pairs known to be in the webhooks table; warmed as feeds are processed
+_SEEN_CHUNK_SIZE = 100  # keeps the PostgREST in.(...) filter well under URL limits
+_seen: set[tuple[str, str]] = set()
+_seen_lock = threading.Lock()
 
 
 def _entry_guid(entry) -> str:
@@ -64,22 +82,64 @@ def _extract_source_urls(entry, feed: FeedSource) -> list[dict]:
     return [{"name": feed.name, "url": link}] if link else []
 
 
-def _is_already_seen(feed: FeedSource, guid: str) -> bool:
-    result = (
-        supabase.table("webhooks")
-        .select("id")
-        .eq("monitor_type", "rss")
-        .eq("event_group_id", feed.feed_id)
-        .eq("monitor_id", guid)
-        .limit(1)
-        .execute()
-    )
-    return bool(result.data)
+def _fetch_seen_guids(feed: FeedSource, guids: list[str]) -> set[str]:
+    """Return the subset of guids already stored for this feed.
+
+    Answers from the in-process seen set first and asks Supabase only about
+    the rest, in chunks, so a feed costs a constant number of queries.
+    """
+    with _seen_lock:
+        unknown = [g for g in dict.fromkeys(guids) if (feed.feed_id, g) not in _seen]
+
+    found: set[str] = set()
+    for i in range(0, len(unknown), _SEEN_CHUNK_SIZE):
+        chunk = unknown[i:i + _SEEN_CHUNK_SIZE]
+        found.update(repo.stored_rss_guids(feed.feed_id, chunk))
+
+    with _seen_lock:
+        _seen.update((feed.feed_id, g) for g in found)
+        return {g for g in guids if (feed.feed_id, g) in _seen}
+
+
+def _mark_seen(feed: FeedSource, guid: str) -> None:
+    with _seen_lock:
+        _seen.add((feed.feed_id, guid))
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    """Return the semaphore bounding concurrent requests to the URL's host."""
+    host = urlsplit(url).netloc.lower()
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(_PER_HOST_LIMIT)
+        return slot
 
 
 @retry(max_attempts=2, exceptions=(Exception,))
 def _fetch_feed(feed: FeedSource) -> list:
-    parsed = feedparser.parse(feed.url)
+    """Download and parse a feed. Returns [] when it is unchanged since the last run."""
+    headers = {"User-Agent": feedparser.USER_AGENT, **_validators.request_headers(feed.feed_id)}
+    # Download with an explicit timeout — feedparser.parse(url) can block forever
+    with _host_slot(feed.url):
+        resp = requests.get(feed.url, headers=headers, timeout=feed.timeout)
+    if resp.status_code == 304:
+        logger.info("Feed %s not modified (304)", feed.feed_id)
+        return []
+    resp.raise_for_status()
+
+    body_hash = content_hash(resp.content)
+    if body_hash == _validators.get(feed.feed_id).get("content_hash"):
+        logger.info("Feed %s unchanged (identical body)", feed.feed_id)
+        return []
+    _validators.stage(
+        feed.feed_id,
+        resp.headers.get("ETag"),
+        resp.headers.get("Last-Modified"),
+        body_hash,
+    )
+
+    parsed = feedparser.parse(resp.content)
     if parsed.bozo and not parsed.entries:
         raise ValueError(f"Feed parse error for {feed.feed_id}: {parsed.bozo_exception}")
     return parsed.entries
@@ -92,15 +152,19 @@ def _process_feed(feed: FeedSource, dry_run: bool = False) -> int:
         logger.error("Failed to fetch feed %s: %s", feed.feed_id, e)
         return 0
 
+    candidates = [
+        (guid, entry)
+        for entry in entries
+        if (guid := _entry_guid(entry)) and not _is_too_old(entry)
+    ]
+    seen = _fetch_seen_guids(feed, [guid for guid, _ in candidates])
+
+    writer = repo.writer("webhooks")
     new_count = 0
-    for entry in entries:
-        guid = _entry_guid(entry)
-        if not guid:
-            continue
-        if _is_too_old(entry):
-            continue
-        if _is_already_seen(feed, guid):
+    for guid, entry in candidates:
+        if guid in seen:
             continue
+        seen.add(guid)  # feeds occasionally repeat an entry
 
         record = {
             "event_type": "rss_entry",
@@ -124,18 +188,35 @@ def _process_feed(feed: FeedSource, dry_run: bool = False) -> int:
             new_count += 1
             continue
 
-        supabase.table("webhooks").insert(record).execute()
-        logger.info("Inserted RSS entry: %s — %s", feed.feed_id, entry.get("title", ""))
-        new_count += 1
-
+        writer.add(record)
+        logger.info("Queued RSS entry: %s — %s", feed.feed_id, entry.get("title", ""))
+
+    if not dry_run:
+        writer.flush()
+        for row in writer.written + writer.conflicts:
+            _mark_seen(feed, row["monitor_id"])
+        if writer.conflicts:
+            logger.info("Feed %s: %d entries already stored", feed.feed_id, len(writer.conflicts))
+        new_count = len(writer.written)
+        # Every entry is stored — safe to skip this exact response next time
+        _validators.commit(feed.feed_id)
     return new_count
 
 
-def run(dry_run: bool = False) -> int:
+def run(dry_run: bool = False, max_workers: int = _MAX_WORKERS) -> int:
+    """Fetch all feeds concurrently; each feed is stored as soon as it arrives."""
     total = 0
-    for feed in FEEDS:
-        count = _process_feed(feed, dry_run=dry_run)
-        logger.info("Feed %s: %d new entries", feed.feed_id, count)
-        total += count
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(FEEDS)))) as pool:
+        futures = {pool.submit(_process_feed, feed, dry_run): feed for feed in FEEDS}
+        for future in as_completed(futures):
+            feed = futures[future]
+            try:
+                count = future.result()
+            except Exception as e:
+                logger.error("Feed %s failed: %s", feed.feed_id, e, exc_info=True)
+                continue
+            logger.info("Feed %s: %d new entries", feed.feed_id, count)
+            total += count
+    _validators.save()
     logger.info("RSS monitor complete: %d total new entries across %d feeds", total, len(FEEDS))
     return total
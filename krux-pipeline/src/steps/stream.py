@@ -0,0 +1,105 @@
+import logging
+
+from ..config import RESEARCH_MAX_WORKERS, SUMMARY_MAX_WORKERS
+from ..utils.run_manifest import RunManifest
+from ..utils.stage_graph import Stage, StageGraph
+from . import images, research, summary
+
+logger = logging.getLogger(__name__)
+
+
+def _research(event: dict, dry_run: bool) -> dict:
+    system_prompt = dict(research.TOPIC_PIPELINE)[event["topic"]]
+    return research.research_event(event, event["topic"], system_prompt, dry_run=dry_run)
+
+
+def build_graph(dry_run: bool = False, manifest: RunManifest | None = None) -> StageGraph:
+    """research → summary → image prompt → generate → encode → upload, each
+    with its own worker limit (the image stages are images.build_stages)."""
+    return StageGraph([
+        Stage(
+            "research",
+            lambda event: _research(event, dry_run),
+            workers=RESEARCH_MAX_WORKERS,
+            key=lambda event: event["event_id"],
+        ),
+        Stage(
+            "summary",
+            lambda article: summary.summarize_article(article, dry_run=dry_run),
+            workers=SUMMARY_MAX_WORKERS,
+            after="research",
+            key=lambda article: article["event_id"],
+        ),
+        *images.build_stages(dry_run=dry_run, after="summary"),
+    ], manifest=manifest)
+
+
+def collect_inputs(date: str, next_date: str) -> dict[str, list]:
+    """Today's work, each item entering at the first stage it still needs.
+
+    Unresearched curated events start at research; events researched by an
+    earlier run start at summary; summarized articles without an image start
+    at the image prompt.
+    """
+    events: list[dict] = []
+    for topic, _ in research.TOPIC_PIPELINE:
+        try:
+            events.extend(research.fetch_curated_by_topic(date, next_date, topic))
+        except Exception as e:
+            logger.error("Fetching curated items failed for %s: %s", topic, e, exc_info=True)
+
+    try:
+        researched = research.fetch_researched_event_ids([event["event_id"] for event in events])
+    except Exception as e:
+        logger.error("Looking up already-researched events failed, researching all: %s", e, exc_info=True)
+        researched = set()
+    to_research, queued = [], set(researched)
+    for event in events:
+        if event["event_id"] not in queued:
+            queued.add(event["event_id"])  # curated items can repeat an event_id
+            to_research.append(event)
+
+    articles: list[dict] = []
+    if researched:
+        rows = [row for row in summary.fetch_researched_articles(date, next_date) if row["event_id"] in researched]
+        summarized = summary.fetch_summarized_event_ids([row["event_id"] for row in rows])
+        articles = [row for row in rows if row["event_id"] not in summarized]
+
+    return {
+        "research": to_research,
+        "summary": articles,
+        images.IMAGE_ROOT_STAGE: images.fetch_articles_without_images(),
+    }
+
+
+def run(
+    date: str, next_date: str, dry_run: bool = False, manifest: RunManifest | None = None,
+) -> dict[str, int]:
+    """Run Steps 2-4 as one pipelined pass. Returns {stage: succeeded}.
+
+    An article can get its image while other events are still being
+    researched, so the first stories land minutes after curation. With a
+    manifest that already tracks items (a resumed run), only the work it
+    records as unfinished is queued — nothing is re-queried.
+    """
+    graph = build_graph(dry_run=dry_run, manifest=manifest)
+    if manifest is not None and manifest.items:
+        inputs = graph.resume_inputs(manifest)
+        logger.info("Resuming run %s: %s", manifest.run_id, manifest.counts())
+    else:
+        inputs = collect_inputs(date, next_date)
+    logger.info(
+        "Streaming %d events to research, %d articles to summary, %d to image",
+        len(inputs.get("research", [])), len(inputs.get("summary", [])),
+        len(inputs.get(images.IMAGE_ROOT_STAGE, [])),
+    )
+    stats = graph.run(inputs)
+    for name, s in stats.items():
+        first = f"{s.first_done_seconds:.0f}s" if s.first_done_seconds is not None else "—"
+        logger.info(
+            "%s: %d succeeded, %d failed (first done after %s, %.0fs busy)",
+            name, s.succeeded, s.failed, first, s.busy_seconds,
+        )
+    counts = {name: s.succeeded for name, s in stats.items()}
+    counts["images"] = images.images_done(stats, dry_run)
+    return counts
@@ -1,64 +1,115 @@
 import json
 import logging
+import time
 
-from ..clients import supabase, claude
+from ..clients import repo, claude, llm_cache
 from ..prompts.summary import SYSTEM_PROMPT, ARTICLE_TOOL
-from ..utils.retry import retry
+from ..utils.metrics import metrics
+from ..utils.prompt_cache import cached_system, cached_tools, log_cache_usage
+from ..utils.rate_limit import rate_limited
+from ..utils.retry import CircuitOpenError, retry
 
 logger = logging.getLogger(__name__)
 
+_BATCH_MIN_ARTICLES = 5  # below this a batch saves too little to wait for
+_BATCH_POLL_SECONDS = 30
+_BATCH_TIMEOUT_SECONDS = 3 * 60 * 60
+
 
 def fetch_researched_articles(date: str, next_date: str) -> list[dict]:
     """Fetch research briefs from research_assistant, created today."""
-    result = (
-        supabase.table("research_assistant")
-        .select("id, event_id, news_date, output, topic")
-        .gte("created_at", date)
-        .lt("created_at", next_date)
-        .order("created_at", desc=False)
-        .execute()
-    )
-    return result.data
-
-
-@retry(max_attempts=3, exceptions=(Exception,))
-def generate_summary(article: dict) -> dict:
-    """Call Claude with tool_use to generate a structured 100-word summary."""
-    response = claude.messages.create(
-        model="claude-sonnet-4-5",
-        max_tokens=800,
-        system=SYSTEM_PROMPT,
-        tools=[ARTICLE_TOOL],
-        tool_choice={"type": "tool", "name": "write_article"},
-        messages=[{
+    return list(repo.iter_research(date, next_date))
+
+
+def _summary_params(article: dict) -> dict:
+    """messages.create parameters for one article — shared by the sync and batch paths."""
+    return {
+        "model": "claude-sonnet-4-5",
+        "max_tokens": 800,
+        "system": cached_system(SYSTEM_PROMPT),
+        "tools": cached_tools([ARTICLE_TOOL]),
+        "tool_choice": {"type": "tool", "name": "write_article"},
+        "messages": [{
             "role": "user",
             "content": f"Research notes:\n{article['output']}\n\nTopic:\n{article['topic']}",
         }],
+    }
+
+
+@retry(max_attempts=3, exceptions=(Exception,), circuit="anthropic")
+def generate_summary(article: dict, use_cache: bool = True) -> dict:
+    """Call Claude with tool_use to generate a structured 100-word summary."""
+    response = llm_cache.create(
+        rate_limited("anthropic", claude.messages.create), "anthropic.messages",
+        use_cache=use_cache, **_summary_params(article),
     )
+    log_cache_usage(f"Summary {article['event_id']}", response)
     # tool_use response — the SDK returns the tool input already deserialized
     return response.content[0].input
 
 
-def save_article(article_json: dict, dry_run: bool = False) -> None:
-    """Save a 100-word article to the hundred_word_articles table."""
+def generate_summaries_batch(
+    articles: list[dict],
+    poll_seconds: float = _BATCH_POLL_SECONDS,
+    timeout_seconds: float = _BATCH_TIMEOUT_SECONDS,
+) -> dict[str, dict]:
+    """Submit all articles as one Message Batch and wait for it to end.
+
+    Returns {event_id: summary} for the requests that succeeded; errored,
+    expired or canceled requests are simply absent so the caller can fall
+    back to generate_summary for them. A batch still running at the timeout
+    is canceled and whatever finished is kept.
+    """
+    # custom_id allows only [A-Za-z0-9_-]{1,64}, so map positions back to event_ids
+    by_custom_id = {f"summary-{i}": article["event_id"] for i, article in enumerate(articles)}
+    batch = claude.messages.batches.create(requests=[
+        {"custom_id": custom_id, "params": _summary_params(article)}
+        for custom_id, article in zip(by_custom_id, articles)
+    ])
+    logger.info("Submitted summary batch %s with %d requests", batch.id, len(articles))
+
+    deadline = time.monotonic() + timeout_seconds
+    canceled = False
+    while batch.processing_status != "ended":
+        if not canceled and time.monotonic() > deadline:
+            logger.warning("Summary batch %s timed out, canceling", batch.id)
+            claude.messages.batches.cancel(batch.id)
+            canceled = True
+        time.sleep(poll_seconds)
+        batch = claude.messages.batches.retrieve(batch.id)
+
+    summaries = {}
+    for entry in claude.messages.batches.results(batch.id):
+        event_id = by_custom_id.get(entry.custom_id)
+        if event_id is None:
+            continue
+        if entry.result.type != "succeeded":
+            logger.warning("Batch request for %s %s", event_id, entry.result.type)
+            continue
+        log_cache_usage(f"Summary {event_id} (batch)", entry.result.message)
+        summaries[event_id] = entry.result.message.content[0].input
+    logger.info("Summary batch %s: %d/%d succeeded", batch.id, len(summaries), len(articles))
+    return summaries
+
+
+def fetch_summarized_event_ids(event_ids: list[str]) -> set[str]:
+    """Event ids that already have a hundred_word_articles row — one query per 100 ids."""
+    return repo.summarized_event_ids(event_ids)
+
+
+def save_article(article_json: dict, dry_run: bool = False) -> dict | None:
+    """Save a 100-word article to the hundred_word_articles table. Returns the inserted row.
+
+    Callers skip already-summarized events via fetch_summarized_event_ids.
+    """
     if dry_run:
         logger.info(
             "[DRY RUN] Would save article: %s — %s",
             article_json["event_id"], article_json["headline"],
         )
-        return
-
-    existing = (
-        supabase.table("hundred_word_articles")
-        .select("event_id")
-        .eq("event_id", article_json["event_id"])
-        .execute()
-    )
-    if existing.data:
-        logger.info("Skipping duplicate article event_id: %s", article_json["event_id"])
-        return
+        return None
 
-    supabase.table("hundred_word_articles").insert({
+    return repo.insert_article({
         "event_id": article_json["event_id"],
         "model_provider": "claude",
         "news_date": article_json["news_date"],
@@ -66,11 +117,32 @@ def save_article(article_json: dict, dry_run: bool = False) -> None:
         "output": article_json["output"],
         "headline": article_json["headline"],
         "topic": article_json["topic"],
-    }).execute()
+    })
 
 
-def run(date: str, next_date: str, dry_run: bool = False) -> int:
-    """Generate 100-word summaries for all researched articles. Returns success count."""
+def summarize_article(article: dict, dry_run: bool = False, summary: dict | None = None) -> dict:
+    """Summarize and save one researched article (or save a batch `summary` for it).
+
+    Returns the saved hundred_word_articles row — the input for Step 4. In a
+    dry run nothing is saved and the unsaved summary is returned with id None.
+    """
+    summary = summary or generate_summary(article)
+    summary["event_id"] = article["event_id"]
+    summary["news_date"] = article["news_date"]
+    summary["topic"] = article["topic"]
+
+    saved = save_article(summary, dry_run=dry_run)
+    logger.info("Summary generated: %s", summary["headline"])
+    return saved or {**summary, "id": None}
+
+
+def run(date: str, next_date: str, dry_run: bool = False, batch: bool = False) -> int:
+    """Generate 100-word summaries for all researched articles. Returns success count.
+
+    With batch=True the articles go through the Message Batches API (cheaper,
+    higher throughput, slower); anything the batch did not return is retried
+    synchronously. A batched dry run only logs what it would batch.
+    """
     articles = fetch_researched_articles(date, next_date)
     if not articles:
         logger.warning("No researched articles found for %s", date)
@@ -78,29 +150,36 @@ def run(date: str, next_date: str, dry_run: bool = False) -> int:
 
     logger.info("Generating summaries for %d articles", len(articles))
     success, failed = 0, 0
+    # One query up front instead of an existence check per article
+    done = fetch_summarized_event_ids([a["event_id"] for a in articles])
+
+    batched: dict[str, dict] = {}
+    pending = [a for a in articles if a["event_id"] not in done]
+    if batch and len(pending) >= _BATCH_MIN_ARTICLES:
+        if dry_run:
+            for article in pending:
+                logger.info("[DRY RUN] Would batch summary for: %s", article["event_id"])
+            logger.info("Summaries: %d succeeded, 0 failed", len(articles))
+            return len(articles)
+        try:
+            batched = generate_summaries_batch(pending)
+        except Exception as e:
+            logger.error("Summary batch failed, falling back to sync: %s", e, exc_info=True)
 
     for article in articles:
         try:
-            # Skip already-summarized events before calling the API
-            existing = (
-                supabase.table("hundred_word_articles")
-                .select("event_id")
-                .eq("event_id", article["event_id"])
-                .execute()
-            )
-            if existing.data:
+            if article["event_id"] in done:
                 logger.info("Skipping already-summarized: %s", article["event_id"])
                 success += 1
                 continue
 
-            summary = generate_summary(article)
-            summary["event_id"] = article["event_id"]
-            summary["news_date"] = article["news_date"]
-            summary["topic"] = article["topic"]
-
-            save_article(summary, dry_run=dry_run)
+            with metrics.item("summary", article["event_id"]):
+                summarize_article(article, dry_run=dry_run, summary=batched.get(article["event_id"]))
+            done.add(article["event_id"])
             success += 1
-            logger.info("Summary generated: %s", summary["headline"])
+        except CircuitOpenError as e:
+            logger.warning("Summary skipped for %s: %s", article["event_id"], e)
+            failed += 1
         except Exception as e:
             logger.error(
                 "Summary failed for %s: %s", article["event_id"], e, exc_info=True
@@ -0,0 +1,59 @@
+from typing import Any, Callable, Iterator
+
+_IN_CHUNK_SIZE = 100  # keeps PostgREST in.(...) filters well under URL limits
+_PAGE_SIZE = 500  # well under PostgREST's default max-rows of 1000
+_CURSOR = ("created_at", "id")
+
+
+def fetch_existing_values(client, table: str, column: str, values: list) -> set:
+    """Return which of `values` already exist in `table.column`, in ceil(n/100) queries."""
+    unique = list(dict.fromkeys(v for v in values if v is not None))
+    found = set()
+    for i in range(0, len(unique), _IN_CHUNK_SIZE):
+        chunk = unique[i:i + _IN_CHUNK_SIZE]
+        result = client.table(table).select(column).in_(column, chunk).execute()
+        found.update(row[column] for row in result.data)
+    return found
+
+
+def iter_rows(
+    client,
+    table: str,
+    columns: list[str],
+    where: Callable[[Any], Any] | None = None,
+    page_size: int = _PAGE_SIZE,
+) -> Iterator[dict]:
+    """Yield every matching row of `table`, oldest first, one keyset page at a time.
+
+    Pages are ordered by (created_at, id) and each starts strictly after the
+    last row of the previous one, so results are never truncated at the
+    PostgREST row cap, rows updated out of the filter mid-scan don't shift
+    later pages, and only one page is held in memory. Paging stops at the
+    first empty page, not a short one: a server max-rows below `page_size`
+    shortens every page. `columns` is required
+    (no "*"); the cursor columns are fetched as well but only yielded when
+    asked for. `where` applies the filters, e.g. ``lambda q: q.eq("topic", t)``.
+    """
+    if not columns or "*" in columns:
+        raise ValueError(f"iter_rows({table!r}) needs an explicit column list")
+    select = list(dict.fromkeys([*columns, *_CURSOR]))
+    extra = [c for c in _CURSOR if c not in columns]
+    after: tuple | None = None
+    while True:
+        query = client.table(table).select(*select)
+        if where is not None:
+            query = where(query)
+        if after is not None:
+            created_at, row_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{row_id})'
+            )
+        rows = query.order("created_at").order("id").limit(page_size).execute().data
+        for row in rows:
+            cursor = (row["created_at"], row["id"])
+            for column in extra:
+                del row[column]
+            yield row
+        if not rows:
+            return
+        after = cursor
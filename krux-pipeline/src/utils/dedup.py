@@ -0,0 +1,33 @@
+import hashlib
+import unicodedata
+from typing import Iterable
+
+
+def normalize_text(text: str | None) -> str:
+    """Casefold, NFKC-normalize and collapse whitespace so trivial variants compare equal."""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def text_digest(text: str | None) -> str:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def dedupe_by_text(rows: Iterable[dict], field: str = "news_output") -> list[dict]:
+    """Keep the first row for each normalized ``field`` value, in one linear pass.
+
+    Rows whose field is empty are dropped — there is nothing to curate in them.
+    """
+    seen: set[str] = set()
+    unique = []
+    for row in rows:
+        text = row.get(field)
+        if not normalize_text(text):
+            continue
+        digest = text_digest(text)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        unique.append(row)
+    return unique
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class FeedValidatorCache:
+    """Persistent per-feed HTTP validators (ETag, Last-Modified, body hash).
+
+    New validators are staged while a feed is fetched and only committed once
+    its entries have been stored, so a failed run never marks unseen entries
+    as already processed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: dict[str, dict] | None = None
+        self._staged: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning("Ignoring unreadable feed cache %s: %s", self.path, e)
+                self._entries = {}
+        return self._entries
+
+    def get(self, feed_id: str) -> dict:
+        with self._lock:
+            return dict(self._load().get(feed_id, {}))
+
+    def request_headers(self, feed_id: str) -> dict[str, str]:
+        """Conditional-GET headers for the feed's last committed response."""
+        cached = self.get(feed_id)
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def stage(self, feed_id: str, etag: str | None, last_modified: str | None, body_hash: str) -> None:
+        with self._lock:
+            self._staged[feed_id] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": body_hash,
+            }
+
+    def commit(self, feed_id: str) -> None:
+        with self._lock:
+            staged = self._staged.pop(feed_id, None)
+            if staged is not None:
+                self._load()[feed_id] = staged
+
+    def save(self) -> None:
+        with self._lock:
+            if self._entries is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            tmp.replace(self.path)
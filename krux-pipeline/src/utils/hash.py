@@ -0,0 +1,8 @@
+import hashlib
+import json
+
+
+def stable_hash(payload: object) -> str:
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
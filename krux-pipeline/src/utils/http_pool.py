@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+import httpx
+from supabase import Client, create_client
+from supabase.lib.client_options import SyncClientOptions
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2 needs the h2 package (httpx[http2]); without it the pool speaks HTTP/1.1
+    import h2  # noqa: F401
+    _HAS_H2 = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _HAS_H2 = False
+
+
+def pooled_http_client(max_connections: int = 20, timeout: float = 60.0, http2: bool = True) -> httpx.Client:
+    """One keep-alive connection pool for every Supabase request in the process."""
+    if http2 and not _HAS_H2:
+        logger.warning("h2 is not installed; Supabase requests fall back to HTTP/1.1")
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=timeout,
+    )
+
+
+def connect_supabase(url: str, key: str, http_client: httpx.Client) -> Client:
+    """A Supabase client whose REST, storage, auth and functions calls share `http_client`.
+
+    Needs supabase>=2.22: older releases either lack `httpx_client` or rebase
+    the shared client onto whichever service created its session last.
+    """
+    return create_client(url, key, options=SyncClientOptions(httpx_client=http_client))
+
+
+def request_kind(request: httpx.Request) -> str:
+    """"storage" for Supabase storage requests, "db" for everything else."""
+    return "storage" if "/storage/v1/" in request.url.path else "db"
+
+
+def request_resource(request: httpx.Request) -> str:
+    """What a Supabase request touched: the table for REST calls, storage:<bucket> for storage."""
+    path = request.url.path
+    if "/rest/v1/" in path:
+        return path.split("/rest/v1/", 1)[1].split("/", 1)[0] or "rest"
+    if "/storage/v1/object/" in path:
+        parts = [p for p in path.split("/storage/v1/object/", 1)[1].split("/") if p]
+        if parts and parts[0] in ("public", "sign", "authenticated"):
+            parts = parts[1:]
+        return f"storage:{parts[0]}" if parts else "storage"
+    return path.split("/v1/", 1)[0].rsplit("/", 1)[-1] or "other"
+
+
+class RequestCounter:
+    """Requests and seconds per table (or storage bucket) seen by an httpx client."""
+
+    def __init__(self):
+        self.calls: Counter[str] = Counter()
+        self.seconds: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def instrument(self, client: httpx.Client) -> None:
+        def on_request(request):
+            request.extensions["counter_started"] = time.monotonic()
+
+        def on_response(response):
+            started = response.request.extensions.get("counter_started")
+            resource = request_resource(response.request)
+            with self._lock:
+                self.calls[resource] += 1
+                if started is not None:
+                    self.seconds[resource] += time.monotonic() - started
+
+        client.event_hooks["request"].append(on_request)
+        client.event_hooks["response"].append(on_response)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.seconds.clear()
+
+    def summary(self) -> str:
+        """e.g. "42 requests, 3.1s (webhooks 30/1.2s, storage:article-image 12/1.9s)"."""
+        with self._lock:
+            calls, seconds = dict(self.calls), dict(self.seconds)
+        if not calls:
+            return "0 requests"
+        parts = ", ".join(
+            f"{name} {n}/{seconds.get(name, 0):.1f}s"
+            for name, n in sorted(calls.items(), key=lambda kv: -kv[1])
+        )
+        return f"{sum(calls.values())} requests, {sum(seconds.values()):.1f}s ({parts})"
@@ -0,0 +1,68 @@
+import hashlib
+import logging
+import threading
+
+from .hash import stable_hash
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_hash(prompt: str, **params) -> str:
+    """Identity of an image request: the prompt plus the model parameters."""
+    return stable_hash({"prompt": prompt, **params})
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImageStore:
+    """Index of generated images in the `image_assets` table, one row per prompt:
+    (prompt_hash, content_hash, url, variants).
+
+    A prompt seen before reuses its image instead of paying for a new one, and
+    bytes already uploaded under another prompt reuse that object instead of
+    uploading again, so re-run or duplicated articles point at existing
+    objects. The index is best-effort: if the table is unreachable lookups
+    miss and writes are skipped, with a warning, and images are generated as
+    before. The table comes from supabase/migrations.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.hits = 0
+        self._warned = False
+        self._lock = threading.Lock()
+
+    def _warn(self, action: str, error: Exception) -> None:
+        with self._lock:
+            if self._warned:
+                return
+            self._warned = True
+        logger.warning("Image store %s failed, continuing without it: %s", action, error)
+
+    def _find(self, column: str, value: str) -> dict | None:
+        try:
+            row = self.repo.find_image_asset(column, value)
+        except Exception as e:
+            self._warn("lookup", e)
+            return None
+        if row is None:
+            return None
+        with self._lock:
+            self.hits += 1
+        return row
+
+    def by_prompt(self, key: str) -> dict | None:
+        return self._find("prompt_hash", key)
+
+    def by_content(self, key: str) -> dict | None:
+        return self._find("content_hash", key)
+
+    def record(self, prompt_key: str, content_key: str, url: str, variants: list[dict]) -> None:
+        try:
+            self.repo.upsert_image_asset(
+                {"prompt_hash": prompt_key, "content_hash": content_key, "url": url, "variants": variants}
+            )
+        except Exception as e:
+            self._warn("write", e)
@@ -0,0 +1,71 @@
+import io
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+try:  # variants need Pillow; without it only the original PNG is uploaded
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = features = None
+
+# format: (content type, Pillow save options)
+_ENCODERS: dict[str, tuple[str, dict]] = {
+    "webp": ("image/webp", {"quality": 80, "method": 4}),
+    "avif": ("image/avif", {"quality": 55, "speed": 6}),
+}
+
+
+@dataclass
+class ImageVariant:
+    format: str
+    width: int
+    height: int
+    data: bytes
+
+    @property
+    def content_type(self) -> str:
+        return _ENCODERS[self.format][0]
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.width}.{self.format}"
+
+
+def supported_formats(formats: list[str]) -> list[str]:
+    """The requested formats this Pillow build can encode, in order."""
+    if Image is None:
+        if formats:
+            logger.warning("Pillow is not installed; image variants are disabled")
+        return []
+    supported = []
+    for fmt in formats:
+        if fmt not in _ENCODERS:
+            logger.warning("Unknown image variant format %r ignored", fmt)
+        elif not features.check(fmt):
+            logger.warning("Pillow was built without %s support; skipping %s variants", fmt, fmt)
+        else:
+            supported.append(fmt)
+    return supported
+
+
+def encode_variants(image_bytes: bytes, widths: list[int], formats: list[str]) -> list[ImageVariant]:
+    """Resize the image to each width (never upscaling) and encode it in each
+    format — pass formats already filtered by supported_formats().
+
+    Returns [] when Pillow is missing or no format is given.
+    """
+    if Image is None or not formats:
+        return []
+
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        source = source.convert("RGB")
+    variants = []
+    for width in sorted({min(w, source.width) for w in widths}):
+        height = round(source.height * width / source.width)
+        resized = source if width == source.width else source.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), **_ENCODERS[fmt][1])
+            variants.append(ImageVariant(fmt, width, height, buffer.getvalue()))
+    return variants
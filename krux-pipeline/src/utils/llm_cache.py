@@ -0,0 +1,166 @@
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from .hash import stable_hash
+
+logger = logging.getLogger(__name__)
+
+_EVICT_EVERY = 50  # writes between eviction sweeps
+
+
+class ResponseCache:
+    """On-disk cache for deterministic LLM calls, keyed on the full request.
+
+    The key is a stable hash of the namespace (provider + endpoint) and every
+    request parameter, so a change to the model, prompt, tools or sampling
+    settings is always a miss. Entries expire after ``ttl_seconds``; once more
+    than ``max_entries`` are stored the least recently read ones are evicted,
+    checked on the first write and then every ``evict_every`` writes (a sweep
+    lists the whole directory), so the cache can briefly overshoot.
+    Only SDK response models are stored; they are rebuilt with the same class
+    on a hit, so callers cannot tell a cached response from a live one.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        enabled: bool = True,
+        evict_every: int = _EVICT_EVERY,
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every = max(1, evict_every)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, params: dict) -> str:
+        return stable_hash({"namespace": namespace, "params": params})
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Dropping unreadable LLM cache entry %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            module_name, _, class_name = entry["type"].rpartition(".")
+            model = getattr(importlib.import_module(module_name), class_name)
+            response = model.model_validate(entry["data"])
+        except Exception as e:
+            logger.warning("Dropping stale LLM cache entry %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)  # mtime doubles as last-read time for LRU eviction
+        except OSError:
+            pass
+        return response
+
+    def set(self, key: str, response: Any) -> None:
+        if not isinstance(response, BaseModel):
+            return
+        model = type(response)
+        entry = {
+            "created_at": time.time(),
+            "type": f"{model.__module__}.{model.__qualname__}",
+            "data": response.model_dump(mode="json"),
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        with self._lock:
+            self._writes += 1
+            due = (self._writes - 1) % self.evict_every == 0
+        if due:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries over max_entries.
+
+        Entries can vanish mid-sweep (an expired get(), or another process on
+        the same directory), and the response being stored is already paid
+        for, so a failed sweep is logged, never raised.
+        """
+        with self._lock:
+            try:
+                entries = []
+                for path in self.directory.glob("*/*.json"):
+                    try:
+                        entries.append((path.stat().st_mtime, path))
+                    except FileNotFoundError:
+                        continue
+                excess = len(entries) - self.max_entries
+                if excess <= 0:
+                    return
+                entries.sort(key=lambda entry: entry[0])
+                for _, path in entries[:excess]:
+                    path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("LLM cache: eviction failed: %s", e)
+                return
+            logger.info("LLM cache: evicted %d least recently used entries", excess)
+
+    def create(
+        self,
+        create: Callable[..., Any],
+        namespace: str,
+        use_cache: bool = True,
+        validate: Callable[[Any], Any] | None = None,
+        **params: Any,
+    ) -> Any:
+        """Return ``create(**params)``, served from the cache when possible.
+
+        ``use_cache=False`` bypasses the cache for a single call. ``validate``
+        runs on a fresh response before it is stored; if it raises, nothing is
+        cached, so a retry asks the model again instead of replaying bad output.
+        """
+        if not (self.enabled and use_cache):
+            return create(**params)
+
+        key = self.key(namespace, params)
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            logger.info("LLM cache hit (%s, %s)", namespace, params.get("model"))
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        response = create(**params)
+        if validate is not None:
+            validate(response)
+        self.set(key, response)
+        return response
@@ -0,0 +1,235 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Estimated USD per 1M tokens: (input, output, cache read, cache write)
+_PRICES: dict[str, tuple[float, float, float, float]] = {
+    "claude-sonnet-4-5": (3.00, 15.00, 0.30, 3.75),
+    "gpt-5-nano": (0.05, 0.40, 0.005, 0.05),
+    "gpt-image-1-mini": (2.00, 8.00, 0.20, 2.00),
+}
+
+_TOKEN_FIELDS = ("input_tokens", "output_tokens", "cached_tokens", "cache_write_tokens")
+
+
+def _count(obj: Any, name: str) -> int | None:
+    value = getattr(obj, name, None)
+    return value if isinstance(value, int) else None
+
+
+def token_usage(response: Any) -> dict[str, int]:
+    """Normalise Anthropic / OpenAI usage to uncached input, output, cache read and cache write."""
+    usage = getattr(response, "usage", None)
+    input_tokens = _count(usage, "input_tokens") or 0
+    cached = _count(usage, "cache_read_input_tokens")
+    if cached is None:  # OpenAI counts cached tokens inside input_tokens
+        cached = _count(getattr(usage, "input_tokens_details", None), "cached_tokens") or 0
+        input_tokens -= cached
+    return {
+        "input_tokens": max(0, input_tokens),
+        "output_tokens": _count(usage, "output_tokens") or 0,
+        "cached_tokens": cached,
+        "cache_write_tokens": _count(usage, "cache_creation_input_tokens") or 0,
+    }
+
+
+def estimate_cost(model: str, tokens: dict[str, int]) -> float:
+    prices = _PRICES.get(model)
+    if prices is None:
+        return 0.0
+    return sum(tokens[field] * price for field, price in zip(_TOKEN_FIELDS, prices)) / 1_000_000
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class _Item:
+    def __init__(self, stage: str, key: str | None):
+        self.stage = stage
+        self.key = key
+        self.counts: Counter = Counter()
+
+
+class Metrics:
+    """Per-step and per-item wall time, DB round trips, LLM calls, tokens,
+    retries and estimated cost.
+
+    Calls are attributed to the current item (set per worker thread with
+    item()) or, outside any item, to the current step. Every finished item,
+    LLM call and step is appended as JSONL once start_run() has been called;
+    log_summary() prints a per-stage p50/p95 table at the end of the run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._item: ContextVar[_Item | None] = ContextVar("metrics_item", default=None)
+        self._step: str | None = None
+        self._step_started = 0.0
+        self._path: Path | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts: dict[str, Counter] = defaultdict(Counter)
+            self.samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+            self.wall: dict[str, float] = {}
+
+    def start_run(self, path: Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self.reset()
+
+    def _emit(self, record: dict) -> None:
+        if self._path is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 3), **record}, default=str)
+        with self._lock, open(self._path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def _scope(self) -> tuple[str, _Item | None]:
+        item = self._item.get()
+        return (item.stage if item else self._step or "other"), item
+
+    def _add(self, sample: str | None = None, seconds: float = 0.0, **counts: float) -> None:
+        stage, item = self._scope()
+        with self._lock:
+            self.counts[stage].update(counts)
+            if sample:
+                self.samples[stage][sample].append(seconds)
+            if item is not None:
+                item.counts.update(counts)
+
+    # ── steps ──
+
+    def begin_step(self, name: str) -> None:
+        """Start timing a step, closing the previous one."""
+        self.end_step()
+        self._step, self._step_started = name, time.monotonic()
+
+    def end_step(self) -> None:
+        if self._step is None:
+            return
+        name, seconds = self._step, time.monotonic() - self._step_started
+        self._step = None
+        with self._lock:
+            self.wall[name] = self.wall.get(name, 0.0) + seconds
+            counts = dict(self.counts.get(name, {}))
+        self._emit({"type": "step", "step": name, "seconds": round(seconds, 3), **counts})
+
+    @contextmanager
+    def item(self, stage: str, key: Any = None):
+        """Attribute everything the calling thread does to one item of `stage`."""
+        item = _Item(stage, None if key is None else str(key))
+        token = self._item.set(item)
+        start, ok = time.monotonic(), False
+        try:
+            yield item
+            ok = True
+        finally:
+            self._item.reset(token)
+            seconds = time.monotonic() - start
+            with self._lock:
+                self.counts[stage]["items"] += 1
+                if not ok:
+                    self.counts[stage]["items_failed"] += 1
+                self.samples[stage]["item"].append(seconds)
+            self._emit({
+                "type": "item", "stage": stage, "key": item.key, "ok": ok,
+                "seconds": round(seconds, 3), **item.counts,
+            })
+
+    # ── calls ──
+
+    def record_llm(self, provider: str, model: str, seconds: float, response: Any = None, error: bool = False) -> None:
+        tokens = token_usage(response) if response is not None else dict.fromkeys(_TOKEN_FIELDS, 0)
+        cost = estimate_cost(model, tokens)
+        self._add("llm", seconds, llm_calls=1, llm_errors=int(error), cost_usd=cost, **tokens)
+        stage, item = self._scope()
+        self._emit({
+            "type": "llm", "stage": stage, "key": item.key if item else None,
+            "provider": provider, "model": model, "seconds": round(seconds, 3),
+            "error": error, "cost_usd": round(cost, 6), **tokens,
+        })
+
+    def record_db(self, seconds: float, kind: str = "db") -> None:
+        self._add(kind, seconds, **{f"{kind}_calls": 1})
+
+    def record_retry(self) -> None:
+        self._add(retries=1)
+
+    def instrument_httpx(self, client, kind: str | Callable[[Any], str] = "db") -> None:
+        """Count and time every request an httpx client sends (e.g. Supabase REST / storage).
+
+        `kind` may be a function of the request, for a client shared by both.
+        """
+
+        def on_request(request):
+            request.extensions["metrics_started"] = time.monotonic()
+
+        def on_response(response):
+            started = response.request.extensions.get("metrics_started")
+            if started is not None:
+                self.record_db(
+                    time.monotonic() - started, kind(response.request) if callable(kind) else kind,
+                )
+
+        client.event_hooks["request"].append(on_request)
+        client.event_hooks["response"].append(on_response)
+
+    # ── reporting ──
+
+    def summary_rows(self) -> list[dict]:
+        with self._lock:
+            stages = list(dict.fromkeys([*self.wall, *self.counts]))
+            rows = []
+            for stage in stages:
+                counts, samples = self.counts.get(stage, Counter()), self.samples.get(stage, {})
+                row = {"stage": stage, "wall_seconds": self.wall.get(stage)}
+                for field in ("items", "items_failed", "llm_calls", "db_calls", "storage_calls", "retries",
+                              *_TOKEN_FIELDS, "cost_usd"):
+                    row[field] = counts.get(field, 0)
+                for kind in ("item", "llm", "db", "storage"):
+                    row[f"{kind}_p50"] = _percentile(samples.get(kind, []), 50)
+                    row[f"{kind}_p95"] = _percentile(samples.get(kind, []), 95)
+                rows.append(row)
+            return rows
+
+    def log_summary(self) -> list[dict]:
+        """Log the per-stage table, append it to the JSONL file and return the rows."""
+        rows = self.summary_rows()
+        if not rows:
+            return rows
+        logger.info(
+            "  %-16s %7s %6s %13s %5s %13s %5s %13s %19s %5s %8s",
+            "stage", "wall", "items", "item p50/p95", "llm", "llm p50/p95", "db", "db p50/p95",
+            "tokens in/out/cache", "retry", "cost",
+        )
+        for row in rows:
+            wall = f"{row['wall_seconds']:.1f}s" if row["wall_seconds"] is not None else "—"
+            logger.info(
+                "  %-16s %7s %6s %13s %5d %13s %5d %13s %19s %5d %8s",
+                row["stage"], wall,
+                f"{row['items']}" + (f"/{row['items_failed']}✗" if row["items_failed"] else ""),
+                f"{row['item_p50']:.1f}/{row['item_p95']:.1f}s",
+                row["llm_calls"], f"{row['llm_p50']:.1f}/{row['llm_p95']:.1f}s",
+                row["db_calls"] + row["storage_calls"], f"{row['db_p50']:.2f}/{row['db_p95']:.2f}s",
+                f"{row['input_tokens']}/{row['output_tokens']}/{row['cached_tokens']}",
+                row["retries"], f"${row['cost_usd']:.3f}",
+            )
+            self._emit({"type": "summary", **row})
+        return rows
+
+
+metrics = Metrics()
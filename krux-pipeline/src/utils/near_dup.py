@@ -0,0 +1,122 @@
+import hashlib
+import random
+import re
+
+from .dedup import normalize_text
+
+_SHINGLE_SIZE = 3  # words per shingle
+_NUM_PERM = 64
+_BANDS = 16  # 16 bands x 4 rows → candidates from roughly 0.5 Jaccard upward
+_ROWS_PER_BAND = _NUM_PERM // _BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"\w+")
+
+# Fixed seed so clustering is deterministic across runs
+_rng = random.Random(1309)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(_NUM_PERM)
+]
+
+
+def _shingles(text: str | None) -> set[int]:
+    words = _WORD_RE.findall(normalize_text(text))
+    if not words:
+        return set()
+    if len(words) < _SHINGLE_SIZE:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[i:i + _SHINGLE_SIZE]) for i in range(len(words) - _SHINGLE_SIZE + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+        for g in grams
+    }
+
+
+def _minhash(shingles: set[int]) -> tuple[int, ...]:
+    return tuple(
+        min((a * s + b) % _MERSENNE_PRIME for s in shingles)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def _jaccard(a: set[int], b: set[int]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def cluster_near_duplicates(
+    rows: list[dict], field: str = "news_output", threshold: float = 0.5
+) -> list[list[dict]]:
+    """Group rows whose ``field`` texts are near-duplicates.
+
+    MinHash signatures are bucketed with LSH banding to find candidate pairs,
+    each candidate is confirmed with exact shingle Jaccard >= ``threshold``,
+    and confirmed pairs are merged transitively. Clusters keep input order.
+    """
+    shingle_sets = [_shingles(row.get(field)) for row in rows]
+    parent = list(range(len(rows)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: dict[tuple, list[int]] = {}
+    for i, shingles in enumerate(shingle_sets):
+        if not shingles:
+            continue
+        signature = _minhash(shingles)
+        for band in range(_BANDS):
+            key = (band, signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND])
+            buckets.setdefault(key, []).append(i)
+
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                ri, rj = find(i), find(j)
+                if ri != rj and _jaccard(shingle_sets[i], shingle_sets[j]) >= threshold:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    clusters: dict[int, list[dict]] = {}
+    for i, row in enumerate(rows):
+        clusters.setdefault(find(i), []).append(row)
+    return list(clusters.values())
+
+
+def _merge_source_urls(cluster: list[dict]) -> list:
+    merged, seen = [], set()
+    for row in cluster:
+        sources = row.get("source_urls")
+        if not isinstance(sources, list):
+            continue
+        for source in sources:
+            key = source.get("url") if isinstance(source, dict) else str(source)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(source)
+    return merged
+
+
+def collapse_near_duplicates(
+    rows: list[dict], field: str = "news_output", threshold: float = 0.5
+) -> list[dict]:
+    """Return one representative per near-duplicate cluster.
+
+    The representative is the cluster's longest text, copied unchanged, with
+    ``source_urls`` merged from every member.
+    """
+    collapsed = []
+    for cluster in cluster_near_duplicates(rows, field=field, threshold=threshold):
+        if len(cluster) == 1:
+            collapsed.append(cluster[0])
+            continue
+        representative = dict(max(cluster, key=lambda r: len(r.get(field) or "")))
+        representative["source_urls"] = _merge_source_urls(cluster)
+        collapsed.append(representative)
+    return collapsed
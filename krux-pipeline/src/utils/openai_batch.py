@@ -0,0 +1,140 @@
+import io
+import json
+import logging
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _output_text(body: dict) -> str:
+    """Rebuild the SDK's Response.output_text from a raw /v1/responses body."""
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for part in item.get("content", [])
+        if part.get("type") == "output_text"
+    )
+
+
+class ResponsesBatch:
+    """Run many ``responses.create`` calls as one OpenAI Batch job.
+
+    ``add`` takes the same keyword arguments as ``client.responses.create``, so
+    a step builds its params once and either calls the live API or queues them
+    here. Once submitted, the batch id and each request's ``context`` are
+    written to ``state_path``; if the process dies, ``load`` + ``wait`` on the
+    next run picks the job up instead of paying for it again. The state stays
+    until the caller has handled the results and calls ``done`` (or ``cancel``
+    when it gives up on the job).
+    """
+
+    def __init__(self, client, state_path: Path, poll_seconds: float = 60, timeout_seconds: float = 24 * 3600):
+        self.client = client
+        self.state_path = Path(state_path)
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+        self.batch_id: str | None = None
+        self._requests: list[dict] = []
+        self._contexts: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def add(self, custom_id: str, context: dict | None = None, **params) -> None:
+        if custom_id in self._contexts:
+            raise ValueError(f"Duplicate batch custom_id: {custom_id}")
+        self._requests.append({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": params,
+        })
+        self._contexts[custom_id] = context or {}
+
+    def load(self) -> bool:
+        """Restore an interrupted batch from state_path. Returns True if one was found."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        self.batch_id = state["batch_id"]
+        self._contexts = state["contexts"]
+        logger.info("Resuming OpenAI batch %s (%d requests)", self.batch_id, len(self._contexts))
+        return True
+
+    def submit(self) -> str:
+        jsonl = "\n".join(json.dumps(r, default=str, ensure_ascii=False) for r in self._requests)
+        input_file = self.client.files.create(
+            file=("batch_input.jsonl", io.BytesIO(jsonl.encode("utf-8"))),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+        self.batch_id = batch.id
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"batch_id": batch.id, "contexts": self._contexts}, f, default=str)
+        logger.info("Submitted OpenAI batch %s with %d requests", batch.id, len(self._requests))
+        return batch.id
+
+    def wait(self) -> dict[str, tuple[dict, str | None]]:
+        """Poll until the batch ends. Returns {custom_id: (context, output_text or None)}.
+
+        Raises TimeoutError if the batch is still running after timeout_seconds.
+        The state file is kept either way: call done() once the results are saved.
+        """
+        deadline = time.monotonic() + self.timeout_seconds
+        batch = self.client.batches.retrieve(self.batch_id)
+        while batch.status not in _TERMINAL_STATUSES:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"OpenAI batch {self.batch_id} still {batch.status}")
+            time.sleep(self.poll_seconds)
+            batch = self.client.batches.retrieve(self.batch_id)
+
+        results: dict[str, tuple[dict, str | None]] = {
+            custom_id: (context, None) for custom_id, context in self._contexts.items()
+        }
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                custom_id = row.get("custom_id")
+                response = row.get("response") or {}
+                if custom_id in results and response.get("status_code") == 200:
+                    results[custom_id] = (results[custom_id][0], _output_text(response.get("body") or {}))
+        failed = sum(1 for _, text in results.values() if text is None)
+        logger.info(
+            "OpenAI batch %s %s: %d succeeded, %d failed",
+            self.batch_id, batch.status, len(results) - failed, failed,
+        )
+        return results
+
+    def done(self) -> None:
+        """Forget the job: its results have been handled."""
+        self.state_path.unlink(missing_ok=True)
+
+    def cancel(self) -> None:
+        """Stop a submitted job (best effort) and forget it, so no later run saves its results."""
+        if self.batch_id:
+            try:
+                self.client.batches.cancel(self.batch_id)
+                logger.info("Cancelled OpenAI batch %s", self.batch_id)
+            except Exception as e:
+                logger.warning("Cancelling OpenAI batch %s failed: %s", self.batch_id, e)
+        self.done()
+
+    def run(self) -> dict[str, tuple[dict, str | None]]:
+        """Submit the queued requests and wait for them."""
+        if not self._requests:
+            return {}
+        self.submit()
+        return self.wait()
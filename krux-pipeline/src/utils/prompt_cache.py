@@ -0,0 +1,43 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def cached_system(text: str) -> list[dict]:
+    """System prompt as a content block with a cache breakpoint.
+
+    The breakpoint covers tools + system, so every call sharing them reads the
+    prefix from cache. Prefixes under the model minimum (1024 tokens for
+    Sonnet) are simply not cached — the marker is harmless there.
+    """
+    return [{"type": "text", "text": text, "cache_control": _EPHEMERAL}]
+
+
+def cached_tools(tools: list[dict]) -> list[dict]:
+    """Copy of tools with a cache breakpoint on the last schema."""
+    if not tools:
+        return tools
+    return [*tools[:-1], {**tools[-1], "cache_control": _EPHEMERAL}]
+
+
+def cache_usage(response) -> dict[str, int]:
+    usage = getattr(response, "usage", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    }
+
+
+def log_cache_usage(label: str, response) -> dict[str, int]:
+    """Log cache read vs write tokens for one Claude call and return the counts."""
+    usage = cache_usage(response)
+    logger.info(
+        "%s tokens: input=%d cache_read=%d cache_write=%d output=%d",
+        label, usage["input_tokens"], usage["cache_read_input_tokens"],
+        usage["cache_creation_input_tokens"], usage["output_tokens"],
+    )
+    return usage
@@ -0,0 +1,154 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from .metrics import metrics
+from .prompt_packer import count_tokens
+from .retry import retry_after_seconds, status_code
+
+logger = logging.getLogger(__name__)
+
+# Conservative defaults (requests/min, input tokens/min) per provider; override
+# per provider or per "provider:model" with configure_limits / LLM_RATE_LIMITS.
+DEFAULT_LIMITS: dict[str, tuple[float, float | None]] = {
+    "anthropic": (50, 30_000),
+    "openai": (500, 200_000),
+}
+
+_RATE_LIMIT_PAUSE_SECONDS = 5.0  # 429 without a Retry-After header
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `per_minute` acquisitions per rolling minute.
+
+    Bursts up to `burst` (default: the whole minute's allowance) are allowed,
+    then callers are spaced out evenly.
+    """
+
+    def __init__(self, per_minute: float, burst: int | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(per_minute)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns seconds spent waiting."""
+        tokens = min(tokens, self.capacity)  # an oversized request waits for a full bucket
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class ModelLimiter:
+    """Requests/min and tokens/min buckets for one provider + model.
+
+    A 429 pauses every caller sharing the limiter, not just the one that hit it.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float | None = None):
+        self.requests = RateLimiter(requests_per_minute)
+        self.tokens = RateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request slot (and `tokens` of budget) is free. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                pause = self._paused_until - time.monotonic()
+            if pause <= 0:
+                break
+            time.sleep(pause)
+            waited += pause
+        waited += self.requests.acquire()
+        if self.tokens is not None and tokens:
+            waited += self.tokens.acquire(tokens)
+        return waited
+
+
+_limits: dict[str, tuple[float, float | None]] = dict(DEFAULT_LIMITS)
+_limiters: dict[tuple[str, str], ModelLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def parse_limits(spec: str) -> dict[str, tuple[float, float | None]]:
+    """Parse "openai=500/200000,anthropic:claude-sonnet-4-5=50/30000" (tokens optional).
+
+    Raises ValueError for a rate that isn't positive: a zero-rate bucket never refills.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, _, value = item.partition("=")
+        rpm, _, tpm = value.partition("/")
+        rates = (float(rpm), float(tpm) if tpm else None)
+        if any(rate is not None and rate <= 0 for rate in rates):
+            raise ValueError(f"LLM rate limit {item!r} must be positive")
+        limits[key.strip()] = rates
+    return limits
+
+
+def configure_limits(limits: dict[str, tuple[float, float | None]]) -> None:
+    """Override limits; keys are a provider or "provider:model". Resets existing limiters."""
+    with _registry_lock:
+        _limits.update(limits)
+        _limiters.clear()
+
+
+def limiter_for(provider: str, model: str = "") -> ModelLimiter:
+    """The process-wide limiter for a provider + model, created on first use."""
+    with _registry_lock:
+        key = (provider, model)
+        if key not in _limiters:
+            rpm, tpm = _limits.get(f"{provider}:{model}") or _limits.get(provider) or (60, None)
+            _limiters[key] = ModelLimiter(rpm, tpm)
+        return _limiters[key]
+
+
+def estimate_input_tokens(params: dict) -> int:
+    """Rough input size of a request — the user turn, not the (cached) system prompt."""
+    payload = params.get("messages", params.get("input", params.get("prompt", "")))
+    text = payload if isinstance(payload, str) else json.dumps(payload, default=str, ensure_ascii=False)
+    return count_tokens(text)
+
+
+def rate_limited(provider: str, create: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an SDK create call so it waits on the shared limiter for `provider` + model.
+
+    Each call is also timed and its token usage recorded in the run metrics.
+    """
+
+    def call(**params: Any) -> Any:
+        model = params.get("model", "")
+        limiter = limiter_for(provider, model)
+        waited = limiter.acquire(estimate_input_tokens(params))
+        if waited >= 1:
+            logger.info("Rate limit: waited %.1fs for %s %s", waited, provider, model)
+        start = time.monotonic()
+        try:
+            response = create(**params)
+        except Exception as e:
+            metrics.record_llm(provider, model, time.monotonic() - start, error=True)
+            if status_code(e) == 429:
+                limiter.pause(retry_after_seconds(e) or _RATE_LIMIT_PAUSE_SECONDS)
+            raise
+        metrics.record_llm(provider, model, time.monotonic() - start, response)
+        return response
+
+    return call
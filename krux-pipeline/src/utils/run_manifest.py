@@ -0,0 +1,91 @@
+import json
+import logging
+import secrets
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class RunManifest:
+    """Append-only record of one pipeline run, so a crashed run can be resumed.
+
+    Each line of ``<run_id>.jsonl`` is an event: the run's arguments, a step
+    changing state, or an item changing state at a stage (with its input when
+    queued and its output when done). Loading replays the events, so the
+    latest state wins and a half-written last line is simply ignored.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.run_id = self.path.stem
+        self.args: dict = {}
+        self.steps: dict[str, str] = {}
+        self.items: dict[str, dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, directory: Path, args: dict) -> "RunManifest":
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+        manifest = cls(Path(directory) / f"{run_id}.jsonl")
+        manifest.path.parent.mkdir(parents=True, exist_ok=True)
+        manifest.args = dict(args)
+        manifest._append({"event": "run", "args": manifest.args})
+        return manifest
+
+    @classmethod
+    def load(cls, directory: Path, run_id: str) -> "RunManifest":
+        manifest = cls(Path(directory) / f"{run_id}.jsonl")
+        with open(manifest.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    manifest._apply(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning("Ignoring truncated line in run manifest %s", manifest.path)
+        return manifest
+
+    def _apply(self, event: dict) -> None:
+        kind = event.get("event")
+        if kind == "run":
+            self.args = event["args"]
+        elif kind == "step":
+            self.steps[event["step"]] = event["state"]
+        elif kind == "item":
+            record = self.items.setdefault(event["stage"], {}).setdefault(event["key"], {})
+            record["state"] = event["state"]
+            for field in ("input", "output", "error"):
+                if field in event:
+                    record[field] = event[field]
+
+    def _append(self, event: dict) -> None:
+        line = json.dumps(event, default=str, ensure_ascii=False)
+        with self._lock:
+            self._apply(json.loads(line))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def step_done(self, step: str) -> bool:
+        return self.steps.get(step) == "done"
+
+    def mark_step(self, step: str, state: str) -> None:
+        self._append({"event": "step", "step": step, "state": state})
+
+    def mark_item(self, stage: str, key: str, state: str, **fields: Any) -> None:
+        """Record an item's state at a stage; pass input=, output= or error= as relevant."""
+        self._append({"event": "item", "stage": stage, "key": key, "state": state, **fields})
+
+    def stage_items(self, stage: str) -> dict[str, dict]:
+        with self._lock:
+            return {key: dict(record) for key, record in self.items.get(stage, {}).items()}
+
+    def counts(self) -> dict[str, dict[str, int]]:
+        """{stage: {state: count}} — for logging progress."""
+        with self._lock:
+            out: dict[str, dict[str, int]] = {}
+            for stage, records in self.items.items():
+                for record in records.values():
+                    out.setdefault(stage, {}).setdefault(record["state"], 0)
+                    out[stage][record["state"]] += 1
+            return out
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from .metrics import metrics
+from .retry import CircuitOpenError
+from .run_manifest import RunManifest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """One node of a StageGraph.
+
+    `fn` takes an item and returns the item handed to every downstream stage;
+    returning None ends that item's path. `after` names the upstream stage
+    (None for a root). `workers` caps how many items the stage runs at once.
+    `queue_size` bounds how many more may wait for a worker: once it is full,
+    whoever hands the stage an item blocks (backpressure), so a slow stage
+    stalls its upstream workers instead of piling up their outputs. None
+    means unbounded. `key` identifies an item in a RunManifest; with
+    `checkpoint` False the stage is left out of the manifest (e.g. its items
+    carry image bytes) and a resumed run re-enters it from its upstream
+    stage's recorded outputs.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    after: str | None = None
+    key: Callable[[Any], str] | None = None
+    queue_size: int | None = None
+    checkpoint: bool = True
+
+
+@dataclass
+class StageStats:
+    succeeded: int = 0
+    failed: int = 0
+    first_done_seconds: float | None = None  # since run() started
+    busy_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+
+class StageGraph:
+    """Streaming DAG executor: each item moves to the next stage as soon as it
+    clears the current one, instead of every stage waiting for the whole batch.
+
+    Every stage has its own bounded pool, so a slow stage only backs up its
+    own queue. A failing item is logged, counted and dropped; the others keep
+    flowing. With a `manifest`, every item's state at every stage is recorded
+    so an interrupted run can pick up from resume_inputs().
+    """
+
+    def __init__(self, stages: list[Stage], manifest: RunManifest | None = None):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.children: dict[str, list[str]] = {name: [] for name in self.stages}
+        for stage in stages:
+            if stage.after is not None:
+                if stage.after not in self.stages:
+                    raise ValueError(f"Stage {stage.name!r} depends on unknown stage {stage.after!r}")
+                self.children[stage.after].append(stage.name)
+
+        self.manifest = manifest
+        self.stats: dict[str, StageStats] = {}
+        self._pools: dict[str, ThreadPoolExecutor] = {}
+        self._slots: dict[str, threading.Semaphore] = {}
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._started = 0.0
+
+    def run(self, inputs: dict[str, Iterable]) -> dict[str, StageStats]:
+        """Feed `inputs` ({stage name: items}) into their stages and wait until
+        every item has left the graph. Items may enter at any stage, e.g. to
+        resume ones whose upstream work was done by an earlier run. Inputs may
+        be generators; with a bounded root stage they are consumed lazily.
+        """
+        unknown = set(inputs) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+
+        self.stats = {name: StageStats() for name in self.stages}
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=max(1, stage.workers), thread_name_prefix=name)
+            for name, stage in self.stages.items()
+        }
+        self._slots = {
+            name: threading.Semaphore(max(1, stage.workers) + stage.queue_size)
+            for name, stage in self.stages.items()
+            if stage.queue_size is not None
+        }
+        self._started = time.monotonic()
+        try:
+            for name, items in inputs.items():
+                for item in items:
+                    self._submit(name, item)
+            with self._idle:
+                self._idle.wait_for(lambda: self._pending == 0)
+        finally:
+            for pool in self._pools.values():
+                pool.shutdown(wait=True)
+        return self.stats
+
+    def resume_inputs(self, manifest: RunManifest) -> dict[str, list]:
+        """Inputs that finish an interrupted run: items not done at a stage are
+        re-queued there, and finished outputs a downstream stage never saw are
+        handed to it. Work already done is never repeated.
+        """
+        inputs: dict[str, list] = {name: [] for name in self.stages}
+        for name in self.stages:
+            for record in manifest.stage_items(name).values():
+                if record["state"] != "done":
+                    if "input" in record:
+                        inputs[name].append(record["input"])
+                    continue
+                if record.get("output") is None:
+                    continue
+                for child in self.children[name]:
+                    child_key = self.stages[child].key if self.stages[child].checkpoint else None
+                    seen = manifest.stage_items(child)
+                    if child_key is None or child_key(record["output"]) not in seen:
+                        inputs[child].append(record["output"])
+        return {name: items for name, items in inputs.items() if items}
+
+    def _track(self, name: str, item: Any, state: str, **fields: Any) -> None:
+        stage = self.stages[name]
+        if self.manifest is not None and stage.key is not None and stage.checkpoint:
+            self.manifest.mark_item(name, stage.key(item), state, **fields)
+
+    def _submit(self, name: str, item: Any) -> None:
+        slot = self._slots.get(name)
+        if slot is not None:
+            slot.acquire()  # released in _on_done, after the item's outputs are handed on
+        self._track(name, item, "queued", input=item)
+        with self._idle:
+            self._pending += 1
+        future = self._pools[name].submit(self._call, name, item)
+        future.add_done_callback(lambda f: self._on_done(name, item, f))
+
+    def _call(self, name: str, item: Any) -> Any:
+        stage = self.stages[name]
+        start = time.monotonic()
+        try:
+            with metrics.item(name, stage.key(item) if stage.key else None):
+                return stage.fn(item)
+        finally:
+            elapsed = time.monotonic() - start
+            with self._idle:
+                self.stats[name].busy_seconds += elapsed
+
+    def _on_done(self, name: str, item: Any, future: Future) -> None:
+        stats = self.stats[name]
+        try:
+            try:
+                output = future.result()
+            except CircuitOpenError as e:
+                logger.warning("%s: item skipped: %s", name, e)
+                self._track(name, item, "failed", error=str(e))
+                with self._idle:
+                    stats.failed += 1
+                    stats.errors.append(str(e))
+                return
+            except Exception as e:
+                logger.error("%s: item failed: %s", name, e, exc_info=True)
+                self._track(name, item, "failed", error=str(e))
+                with self._idle:
+                    stats.failed += 1
+                    stats.errors.append(str(e))
+                return
+
+            self._track(name, item, "done", output=output)
+            with self._idle:
+                stats.succeeded += 1
+                if stats.first_done_seconds is None:
+                    stats.first_done_seconds = time.monotonic() - self._started
+            if output is not None:
+                for child in self.children[name]:
+                    self._submit(child, output)
+        finally:
+            slot = self._slots.get(name)
+            if slot is not None:
+                slot.release()
+            with self._idle:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
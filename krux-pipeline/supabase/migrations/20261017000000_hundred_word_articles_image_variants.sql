@@ -0,0 +1,4 @@
+-- Resized WebP/AVIF copies of each story image, written by Step 4:
+-- [{"format": "webp", "width": 768, "height": 512, "bytes": 41230, "url": "..."}, ...]
+alter table public.hundred_word_articles
+    add column if not exists image_variants jsonb;
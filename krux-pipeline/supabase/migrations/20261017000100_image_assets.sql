@@ -0,0 +1,13 @@
+-- Index of generated story images, written by Step 4 (src/utils/image_store.py):
+-- one row per prompt, so a repeated prompt reuses its image and identical
+-- bytes reuse the uploaded object.
+create table if not exists public.image_assets (
+    prompt_hash text primary key,
+    content_hash text not null,
+    url text not null,
+    variants jsonb,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists image_assets_content_hash_idx
+    on public.image_assets (content_hash);
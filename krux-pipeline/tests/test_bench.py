@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from bench.fakes import FakeServiceError, Profile, Service
+from bench.harness import STEPS, run_step
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_every_step_runs_against_the_fakes(step):
+    result = run_step(step, 30, time_scale=0)
+
+    expected = 20 if step == "curation" else 30  # the fake curator keeps 20 stories
+    assert result.succeeded == expected
+    assert result.throughput > 0
+    assert result.calls["supabase"] > 0
+
+
+def test_item_steps_record_per_item_metrics():
+    result = run_step("summary", 10, time_scale=0)
+
+    assert result.metrics["items"] == 10
+    assert result.metrics["llm_calls"] == 10
+    assert result.calls["claude"] == 10
+
+
+def test_curation_switches_to_map_reduce_at_scale():
+    result = run_step("curation", 2000, time_scale=0)
+
+    assert result.succeeded == 20
+    assert result.calls["claude"] > 1  # shard shortlists plus the reduce call
+
+
+def test_injected_errors_are_retried_then_counted_as_failures():
+    profiles = {"openai-images": Profile(error_rate=1.0)}
+    result = run_step("images", 5, profiles, time_scale=0)
+
+    assert result.succeeded == 0
+    assert result.errors["openai-images"] > 0
+    assert result.metrics["retries"] > 0
+
+
+def test_service_raises_with_status_code():
+    service = Service("claude", Profile(error_rate=1.0, error_status=529), time_scale=0)
+
+    with pytest.raises(FakeServiceError) as exc:
+        service.call()
+    assert exc.value.status_code == 529
+    assert service.calls == service.errors == 1
+
+
+def test_latency_profile_is_lognormal_around_median():
+    rng = random.Random(0)
+    samples = sorted(Profile(100, 400).sample_seconds(rng) for _ in range(2000))
+
+    assert samples[1000] == pytest.approx(0.1, rel=0.15)
+    assert samples[1900] == pytest.approx(0.4, rel=0.25)
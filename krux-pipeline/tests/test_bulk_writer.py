@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.utils.bulk_writer import BulkWriter
+
+
+def _client(insert=None, upsert=None):
+    client = MagicMock()
+    table = client.table.return_value
+    if insert:
+        table.insert.side_effect = lambda rows: MagicMock(execute=lambda: insert(rows))
+    if upsert:
+        table.upsert.side_effect = lambda rows, **kw: MagicMock(execute=lambda: upsert(rows))
+    return client
+
+
+def _ok(rows):
+    return MagicMock(data=rows)
+
+
+class TestBulkWriter:
+    def test_flushes_in_chunks(self):
+        client = _client(insert=_ok)
+        writer = BulkWriter(client, "webhooks", chunk_size=2)
+        writer.extend({"id": i} for i in range(5))
+        assert client.table.return_value.insert.call_count == 2  # two full chunks
+        writer.flush()
+        assert client.table.return_value.insert.call_count == 3
+        assert [r["id"] for r in writer.written] == [0, 1, 2, 3, 4]
+        assert writer.requests == 3
+
+    def test_context_manager_flushes(self):
+        client = _client(insert=_ok)
+        with BulkWriter(client, "webhooks") as writer:
+            writer.add({"id": 1})
+        assert writer.written == [{"id": 1}]
+
+    def test_unique_violation_reports_conflicting_rows(self):
+        def insert(rows):
+            if any(r["id"] == 2 for r in rows):
+                raise APIError({"code": "23505", "message": "duplicate key"})
+            return _ok(rows)
+
+        writer = BulkWriter(_client(insert=insert), "webhooks")
+        writer.extend([{"id": 1}, {"id": 2}, {"id": 3}])
+        writer.flush()
+        assert writer.written == [{"id": 1}, {"id": 3}]
+        assert writer.conflicts == [{"id": 2}]
+
+    def test_other_errors_propagate(self):
+        def insert(rows):
+            raise APIError({"code": "42P01", "message": "missing table"})
+
+        writer = BulkWriter(_client(insert=insert), "webhooks")
+        writer.add({"id": 1})
+        with pytest.raises(APIError):
+            writer.flush()
+
+    def test_upsert_ignore_duplicates_reports_skipped(self):
+        client = _client(upsert=lambda rows: _ok([r for r in rows if r["k"] != "b"]))
+        writer = BulkWriter(client, "t", on_conflict="k", ignore_duplicates=True)
+        writer.extend([{"k": "a"}, {"k": "b"}])
+        writer.flush()
+        assert writer.conflicts == [{"k": "b"}]
+        _, kwargs = client.table.return_value.upsert.call_args
+        assert kwargs == {"on_conflict": "k", "ignore_duplicates": True}
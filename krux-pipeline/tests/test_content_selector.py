@@ -0,0 +1,54 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.steps import content_selector
+from src.steps.content_selector import _shard_webhooks, curate_map_reduce
+from src.utils.prompt_packer import count_tokens
+
+
+def _rows(n, size=400):
+    return [{"id": i, "news_output": f"story {i} " + "x" * size, "source_urls": []} for i in range(n)]
+
+
+class TestShardWebhooks:
+    def test_respects_budget_and_order(self):
+        rows = _rows(10)
+        row_tokens = count_tokens(json.dumps(rows[0]))
+        shards = _shard_webhooks(rows, token_budget=2 * row_tokens + 1)
+        assert [r["id"] for shard in shards for r in shard] == list(range(10))
+        assert all(len(shard) == 2 for shard in shards)
+
+    def test_oversized_row_gets_own_shard(self):
+        shards = _shard_webhooks(_rows(2, size=10_000), token_budget=100)
+        assert [len(s) for s in shards] == [1, 1]
+
+
+class TestCurateMapReduce:
+    @patch.object(content_selector, "_SINGLE_CALL_TOKEN_BUDGET", 1_000)
+    @patch.object(content_selector, "_SHARD_TOKEN_BUDGET", 500)
+    @patch("src.steps.content_selector.curate_stories")
+    @patch("src.steps.content_selector.shortlist_stories")
+    def test_reduces_shortlisted_original_rows(self, mock_shortlist, mock_curate):
+        rows = _rows(20)
+
+        def shortlist(shard_json, shard, total, limit):
+            # keep the first id of every shard, plus one hallucinated id
+            first = int(shard_json.split('"id": ')[1].split(",")[0])
+            return {"items": [{"id": first}, {"id": 999}]}
+
+        mock_shortlist.side_effect = shortlist
+        mock_curate.return_value = {"selected_total": 1, "items": []}
+
+        assert curate_map_reduce(rows) == {"selected_total": 1, "items": []}
+        assert mock_shortlist.call_count == len(_shard_webhooks(rows, 500))
+        reduce_json = mock_curate.call_args[0][0]
+        assert "999" not in reduce_json
+        assert rows[0]["news_output"] in reduce_json
+
+    @patch.object(content_selector, "_SINGLE_CALL_TOKEN_BUDGET", 1_000)
+    @patch("src.steps.content_selector.shortlist_stories", return_value={"items": []})
+    def test_no_progress_raises(self, mock_shortlist):
+        with pytest.raises(ValueError, match="no progress"):
+            curate_map_reduce(_rows(20))
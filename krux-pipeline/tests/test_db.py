@@ -0,0 +1,56 @@
+import pytest
+
+from bench.fakes import FakeSupabase, Profile, Service
+from src.utils.db import fetch_existing_values, iter_rows
+
+
+def _db(rows: list[dict]) -> FakeSupabase:
+    db = FakeSupabase(Service("supabase", Profile()), Service("storage", Profile()), "2026-03-05T00:00:00")
+    db.seed("articles", rows)
+    return db
+
+
+def test_pages_through_every_row_in_cursor_order():
+    # shared timestamps force the id tie-break between pages
+    db = _db([{"id": i, "created_at": f"2026-03-05T0{i % 3}:00:00", "n": i} for i in range(1, 26)])
+
+    rows = list(iter_rows(db, "articles", ["n"], page_size=4))
+
+    assert sorted(r["n"] for r in rows) == list(range(1, 26))
+    assert [r["n"] for r in rows][:3] == [3, 6, 9]  # created_at 00:00 first, then by id
+    assert db.service.calls == 8  # ceil(25 / 4) pages, then an empty one
+
+
+def test_server_row_cap_below_page_size_does_not_truncate():
+    db = _db([{"id": i, "n": i} for i in range(1, 11)])
+    db.max_rows = 3
+
+    assert [r["n"] for r in iter_rows(db, "articles", ["n"], page_size=5)] == list(range(1, 11))
+
+
+def test_projection_excludes_unrequested_cursor_columns():
+    db = _db([{"id": 1, "n": 1, "secret": "x"}])
+
+    assert list(iter_rows(db, "articles", ["n"])) == [{"n": 1}]
+    assert list(iter_rows(db, "articles", ["id", "n"])) == [{"id": 1, "n": 1}]
+
+
+def test_requires_explicit_columns():
+    with pytest.raises(ValueError):
+        next(iter_rows(_db([]), "articles", ["*"]))
+
+
+def test_rows_updated_out_of_the_filter_do_not_skip_later_rows():
+    db = _db([{"id": i, "done": None} for i in range(1, 11)])
+    seen = []
+    for row in iter_rows(db, "articles", ["id"], where=lambda q: q.is_("done", "null"), page_size=3):
+        seen.append(row["id"])
+        db.table("articles").update({"done": True}).eq("id", row["id"]).execute()
+
+    assert seen == list(range(1, 11))
+
+
+def test_fetch_existing_values_chunks_in_queries():
+    db = _db([{"id": i, "event_id": f"e{i}"} for i in range(1, 6)])
+
+    assert fetch_existing_values(db, "articles", "event_id", ["e1", "e5", "e9", None]) == {"e1", "e5"}
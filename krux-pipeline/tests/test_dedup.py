@@ -0,0 +1,31 @@
+from src.utils.dedup import dedupe_by_text, normalize_text, text_digest
+
+
+class TestNormalizeText:
+    def test_collapses_whitespace_and_case(self):
+        assert normalize_text("  OpenAI   raises\n$40B ") == "openai raises $40b"
+
+    def test_none_is_empty(self):
+        assert normalize_text(None) == ""
+
+    def test_digest_ignores_trivial_variants(self):
+        assert text_digest("Big  News") == text_digest("big news")
+        assert text_digest("Big News") != text_digest("Other News")
+
+
+class TestDedupeByText:
+    def test_keeps_first_occurrence_in_order(self):
+        rows = [
+            {"id": 1, "news_output": "A launches B"},
+            {"id": 2, "news_output": "C raises D"},
+            {"id": 3, "news_output": "a launches  b"},
+        ]
+        assert [r["id"] for r in dedupe_by_text(rows)] == [1, 2]
+
+    def test_drops_empty_text(self):
+        rows = [{"id": 1, "news_output": None}, {"id": 2, "news_output": "  "}, {"id": 3, "news_output": "x"}]
+        assert [r["id"] for r in dedupe_by_text(rows)] == [3]
+
+    def test_custom_field(self):
+        rows = [{"output": "x"}, {"output": "X"}]
+        assert dedupe_by_text(rows, "output") == [{"output": "x"}]
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+from bench.fakes import FakeSupabase, Profile, Service, png_bytes
+from src.repository import Repository
+from src.steps import images
+from src.utils.image_store import ImageStore, content_hash, prompt_hash
+
+
+def _db() -> FakeSupabase:
+    return FakeSupabase(Service("supabase", Profile()), Service("storage", Profile()), "2026-03-05T00:00:00")
+
+
+def test_lookup_by_prompt_and_by_content():
+    store = ImageStore(Repository(_db()))
+    store.record("p1", "c1", "https://x/c1.png", [])
+
+    assert store.by_prompt("p1")["url"] == "https://x/c1.png"
+    assert store.by_content("c1")["prompt_hash"] == "p1"
+    assert store.by_prompt("p2") is None
+    assert store.hits == 2
+
+
+def test_unreachable_store_misses_instead_of_failing():
+    client = MagicMock()
+    client.table.side_effect = RuntimeError("relation image_assets does not exist")
+    store = ImageStore(Repository(client))
+
+    assert store.by_prompt("p1") is None
+    store.record("p1", "c1", "https://x/c1.png", [])  # no raise
+
+
+def test_prompt_hash_covers_model_parameters():
+    assert prompt_hash("a cat", size="1024x1024") != prompt_hash("a cat", size="1536x1024")
+    assert content_hash(b"x") == content_hash(b"x")
+
+
+def test_repeated_prompts_and_identical_bytes_reuse_stored_images():
+    db = _db()
+    db.seed("hundred_word_articles", [
+        {"id": i, "event_id": f"e{i}", "headline": "h", "output": "o", "image_url": None} for i in (1, 2, 3)
+    ])
+    prompts = {1: "same prompt", 2: "same prompt", 3: "other prompt"}
+    image = png_bytes(64, 32)
+
+    with patch.object(images.repo, "client", db), \
+         patch.object(images, "image_store", ImageStore(images.repo)), \
+         patch.object(images, "generate_image_prompt", side_effect=lambda a: prompts[a["id"]]), \
+         patch.object(images, "generate_image", return_value=image) as generate, \
+         patch.object(images, "encode_image_variants", return_value=[]):
+        for article in db.tables["hundred_word_articles"][:]:
+            images.process_article(article)
+        urls = {row["id"]: row["image_url"] for row in db.tables["hundred_word_articles"]}
+
+    # article 2 reused article 1's prompt; article 3's bytes matched the stored object
+    assert generate.call_count == 2
+    assert len(db.objects) == 1
+    assert urls[1] == urls[2] == urls[3] == f"https://bench.invalid/storage/v1/object/public/article-image/{content_hash(image)}.png"
+    assert {row["prompt_hash"] for row in db.tables["image_assets"]} == {
+        prompt_hash(p, model="gpt-image-1-mini", size="1536x1024") for p in ("same prompt", "other prompt")
+    }
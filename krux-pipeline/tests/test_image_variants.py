@@ -0,0 +1,53 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from postgrest.exceptions import APIError
+
+from bench.fakes import png_bytes
+from src.steps import images
+from src.utils.image_variants import encode_variants, supported_formats
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def test_variants_are_resized_and_encoded_per_format():
+    variants = encode_variants(png_bytes(1536, 1024), [480, 1080], ["webp"])
+
+    assert [(v.format, v.width, v.height) for v in variants] == [("webp", 480, 320), ("webp", 1080, 720)]
+    for variant in variants:
+        with Image.open(io.BytesIO(variant.data)) as img:
+            assert img.format == "WEBP"
+            assert img.size == (variant.width, variant.height)
+    assert variants[0].file_name == "480.webp"
+    assert variants[0].content_type == "image/webp"
+
+
+def test_widths_never_upscale_and_collapse_duplicates():
+    variants = encode_variants(png_bytes(800, 400), [480, 1080, 1536], ["webp"])
+
+    assert [v.width for v in variants] == [480, 800]
+
+
+def test_unknown_formats_are_dropped():
+    assert supported_formats(["webp", "gif"]) == ["webp"]
+
+
+def test_no_formats_means_no_variants():
+    assert encode_variants(png_bytes(64, 64), [32], []) == []
+
+
+def test_missing_variants_column_falls_back_to_image_url_only():
+    missing = APIError({"code": "PGRST204", "message": "Could not find the 'image_variants' column"})
+    variants = [{"format": "webp", "width": 480, "url": "https://x/480.webp"}]
+
+    with patch.object(images, "_variants_column", True), \
+         patch.object(images.repo, "update_article", side_effect=[missing, None, None]) as update:
+        images.update_image_url(1, "https://x/1.png", variants)
+        images.update_image_url(2, "https://x/2.png", variants)  # column not retried
+
+    assert [c.args for c in update.call_args_list] == [
+        (1, {"image_url": "https://x/1.png", "image_variants": variants}),
+        (1, {"image_url": "https://x/1.png"}),
+        (2, {"image_url": "https://x/2.png"}),
+    ]
@@ -0,0 +1,147 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from anthropic.types import Message
+
+from src.utils.llm_cache import ResponseCache
+
+
+def _message(text: str) -> Message:
+    return Message.model_validate({
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-sonnet-4-5",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    })
+
+
+PARAMS = {"model": "claude-sonnet-4-5", "max_tokens": 50, "messages": [{"role": "user", "content": "hi"}]}
+
+
+def test_second_identical_call_is_served_from_disk(tmp_path):
+    cache = ResponseCache(tmp_path)
+    create = MagicMock(return_value=_message("hello"))
+
+    first = cache.create(create, "anthropic.messages", **PARAMS)
+    second = cache.create(create, "anthropic.messages", **PARAMS)
+
+    assert create.call_count == 1
+    assert isinstance(second, Message)
+    assert second.content[0].text == first.content[0].text == "hello"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_any_param_change_is_a_miss(tmp_path):
+    cache = ResponseCache(tmp_path)
+    create = MagicMock(return_value=_message("hello"))
+
+    cache.create(create, "anthropic.messages", **PARAMS)
+    cache.create(create, "anthropic.messages", **{**PARAMS, "system": "be brief"})
+    cache.create(create, "openai.responses", **PARAMS)
+
+    assert create.call_count == 3
+
+
+def test_use_cache_false_always_calls(tmp_path):
+    cache = ResponseCache(tmp_path)
+    create = MagicMock(return_value=_message("hello"))
+
+    cache.create(create, "anthropic.messages", **PARAMS)
+    cache.create(create, "anthropic.messages", use_cache=False, **PARAMS)
+
+    assert create.call_count == 2
+
+
+def test_expired_entries_are_refetched(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttl_seconds=60)
+    create = MagicMock(return_value=_message("hello"))
+    cache.create(create, "anthropic.messages", **PARAMS)
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    cache.create(create, "anthropic.messages", **PARAMS)
+
+    assert create.call_count == 2
+
+
+def test_failed_validation_is_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path)
+    create = MagicMock(return_value=_message("not json"))
+
+    def validate(response):
+        raise ValueError("bad output")
+
+    with pytest.raises(ValueError):
+        cache.create(create, "anthropic.messages", validate=validate, **PARAMS)
+
+    assert not list(tmp_path.glob("*/*.json"))
+
+
+def test_non_model_responses_are_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path)
+    create = MagicMock(return_value=MagicMock())
+
+    cache.create(create, "anthropic.messages", **PARAMS)
+    cache.create(create, "anthropic.messages", **PARAMS)
+
+    assert create.call_count == 2
+
+
+def test_least_recently_read_entry_is_evicted(tmp_path):
+    cache = ResponseCache(tmp_path, max_entries=2, evict_every=1)
+    create = MagicMock(side_effect=lambda **params: _message(params["messages"][0]["content"]))
+
+    def call(text):
+        return cache.create(create, "anthropic.messages", **{**PARAMS, "messages": [{"role": "user", "content": text}]})
+
+    call("a")
+    call("b")
+    for path in tmp_path.glob("*/*.json"):
+        os.utime(path, (1, 1))  # make a and b equally old
+    call("a")  # read refreshes a
+    call("c")  # evicts b
+
+    assert create.call_count == 3
+    call("a")
+    assert create.call_count == 3
+    call("b")
+    assert create.call_count == 4
+
+
+def test_eviction_sweeps_on_the_first_write_then_every_n(tmp_path):
+    cache = ResponseCache(tmp_path, max_entries=1, evict_every=3)
+    create = MagicMock(side_effect=lambda **params: _message(params["messages"][0]["content"]))
+
+    def stored_after(text):
+        cache.create(create, "anthropic.messages", **{**PARAMS, "messages": [{"role": "user", "content": text}]})
+        return len(list(tmp_path.glob("*/*.json")))
+
+    assert [stored_after(t) for t in "abcd"] == [1, 2, 3, 1]
+
+
+def test_entry_vanishing_mid_sweep_does_not_fail_the_call(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, max_entries=1, evict_every=1)
+    create = MagicMock(side_effect=lambda **params: _message(params["messages"][0]["content"]))
+
+    def call(text):
+        return cache.create(create, "anthropic.messages", **{**PARAMS, "messages": [{"role": "user", "content": text}]})
+
+    call("a")
+
+    real_stat = Path.stat
+
+    def stat(path, *args, **kwargs):
+        if path.suffix == ".json":
+            raise FileNotFoundError(path)  # unlinked by another process after the glob
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", stat)
+    assert call("b").content[0].text == "b"
+    assert create.call_count == 2
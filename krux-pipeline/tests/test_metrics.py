@@ -0,0 +1,72 @@
+import json
+from types import SimpleNamespace
+
+from src.utils.metrics import Metrics, estimate_cost, token_usage
+
+
+def test_token_usage_anthropic_and_openai_shapes():
+    anthropic = SimpleNamespace(usage=SimpleNamespace(
+        input_tokens=100, output_tokens=50, cache_read_input_tokens=900, cache_creation_input_tokens=0,
+    ))
+    openai = SimpleNamespace(usage=SimpleNamespace(
+        input_tokens=1000, output_tokens=200, input_tokens_details=SimpleNamespace(cached_tokens=600),
+    ))
+
+    assert token_usage(anthropic) == {
+        "input_tokens": 100, "output_tokens": 50, "cached_tokens": 900, "cache_write_tokens": 0,
+    }
+    assert token_usage(openai) == {
+        "input_tokens": 400, "output_tokens": 200, "cached_tokens": 600, "cache_write_tokens": 0,
+    }
+    assert token_usage(object())["input_tokens"] == 0
+
+
+def test_cost_estimate_uses_per_model_prices():
+    tokens = {"input_tokens": 1_000_000, "output_tokens": 0, "cached_tokens": 1_000_000, "cache_write_tokens": 0}
+    assert estimate_cost("claude-sonnet-4-5", tokens) == 3.30
+    assert estimate_cost("unknown-model", tokens) == 0.0
+
+
+def test_calls_are_attributed_to_items_and_steps(tmp_path):
+    m = Metrics()
+    m.start_run(tmp_path / "run.jsonl")
+    response = SimpleNamespace(usage=SimpleNamespace(input_tokens=10, output_tokens=5, cache_read_input_tokens=0))
+
+    m.begin_step("summary")
+    m.record_db(0.02)
+    for key in ("a", "b"):
+        with m.item("summary", key):
+            m.record_llm("anthropic", "claude-sonnet-4-5", 1.5, response)
+            m.record_retry()
+    m.end_step()
+
+    (row,) = m.summary_rows()
+    assert row["stage"] == "summary"
+    assert (row["items"], row["llm_calls"], row["db_calls"], row["retries"]) == (2, 2, 1, 2)
+    assert row["input_tokens"] == 20 and row["llm_p95"] == 1.5
+
+    records = [json.loads(line) for line in (tmp_path / "run.jsonl").read_text().splitlines()]
+    items = [r for r in records if r["type"] == "item"]
+    assert [(r["key"], r["llm_calls"], r["retries"]) for r in items] == [("a", 1, 1), ("b", 1, 1)]
+    assert {r["type"] for r in records} == {"llm", "item", "step"}
+
+
+def test_failed_items_are_counted(tmp_path):
+    m = Metrics()
+    try:
+        with m.item("images", 7):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    (row,) = m.summary_rows()
+    assert (row["items"], row["items_failed"]) == (1, 1)
+
+
+def test_percentiles():
+    m = Metrics()
+    for seconds in range(1, 101):
+        m.begin_step("research")
+        m.record_db(seconds / 100)
+    m.end_step()
+    (row,) = m.summary_rows()
+    assert row["db_p50"] == 0.51 and row["db_p95"] == 0.95
@@ -0,0 +1,44 @@
+from src.utils.near_dup import cluster_near_duplicates, collapse_near_duplicates
+
+BASE = (
+    "Anthropic released Claude Opus with a one million token context window, "
+    "improved agentic coding and lower prices for enterprise customers"
+)
+
+
+class TestClusterNearDuplicates:
+    def test_groups_near_duplicates(self):
+        rows = [
+            {"id": 1, "news_output": BASE},
+            {"id": 2, "news_output": "Nvidia reports record data center revenue for the quarter"},
+            {"id": 3, "news_output": BASE + " today"},
+        ]
+        clusters = cluster_near_duplicates(rows)
+        assert [[r["id"] for r in c] for c in clusters] == [[1, 3], [2]]
+
+    def test_distinct_stories_stay_separate(self):
+        rows = [
+            {"id": 1, "news_output": "OpenAI raises $40B led by SoftBank"},
+            {"id": 2, "news_output": "Google ships Gemini 3 to all Workspace users"},
+        ]
+        assert len(cluster_near_duplicates(rows)) == 2
+
+    def test_empty_text_is_its_own_cluster(self):
+        rows = [{"id": 1, "news_output": ""}, {"id": 2, "news_output": ""}]
+        assert len(cluster_near_duplicates(rows)) == 2
+
+
+class TestCollapseNearDuplicates:
+    def test_representative_keeps_text_and_merges_sources(self):
+        rows = [
+            {"id": 1, "news_output": BASE, "source_urls": [{"name": "A", "url": "https://a"}]},
+            {"id": 2, "news_output": BASE + " today", "source_urls": [
+                {"name": "B", "url": "https://b"}, {"name": "A", "url": "https://a"},
+            ]},
+        ]
+        [rep] = collapse_near_duplicates(rows)
+        assert rep["id"] == 2  # longest text wins
+        assert rep["news_output"] == BASE + " today"
+        assert [s["url"] for s in rep["source_urls"]] == ["https://a", "https://b"]
+        # inputs are not mutated
+        assert rows[1]["source_urls"][0]["url"] == "https://b"
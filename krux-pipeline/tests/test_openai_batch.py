@@ -0,0 +1,81 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.utils.openai_batch import ResponsesBatch
+
+
+def _body(text):
+    return {"output": [
+        {"type": "web_search_call"},
+        {"type": "message", "content": [{"type": "output_text", "text": text}]},
+    ]}
+
+
+def _client(status="completed", lines=()):
+    client = MagicMock()
+    client.files.create.return_value = MagicMock(id="file-in")
+    client.batches.create.return_value = MagicMock(id="batch-1")
+    client.batches.retrieve.return_value = MagicMock(status=status, output_file_id="file-out")
+    client.files.content.return_value = MagicMock(text="\n".join(json.dumps(line) for line in lines))
+    return client
+
+
+class TestResponsesBatch:
+    def test_run_routes_outputs_by_custom_id(self, tmp_path):
+        client = _client(lines=[
+            {"custom_id": "e1", "response": {"status_code": 200, "body": _body("brief one")}},
+            {"custom_id": "e2", "response": {"status_code": 500, "body": {}}},
+        ])
+        batch = ResponsesBatch(client, tmp_path / "state.json", poll_seconds=0)
+        batch.add("e1", context={"topic": "Funding"}, model="gpt-5-nano", input="a")
+        batch.add("e2", context={"topic": "Report"}, model="gpt-5-nano", input="b")
+
+        results = batch.run()
+
+        assert results == {"e1": ({"topic": "Funding"}, "brief one"), "e2": ({"topic": "Report"}, None)}
+        uploaded = client.files.create.call_args.kwargs["file"][1].getvalue().decode()
+        first = json.loads(uploaded.splitlines()[0])
+        assert first["url"] == "/v1/responses"
+        assert first["body"] == {"model": "gpt-5-nano", "input": "a"}
+        assert (tmp_path / "state.json").exists()  # kept until the results are handled
+        batch.done()
+        assert not (tmp_path / "state.json").exists()
+
+    def test_cancel_stops_the_job_and_drops_state(self, tmp_path):
+        client = _client(status="in_progress")
+        state = tmp_path / "state.json"
+        batch = ResponsesBatch(client, state, poll_seconds=0)
+        batch.add("e1", input="a")
+        batch.submit()
+
+        client.batches.cancel.side_effect = ConnectionError("down")
+        batch.cancel()
+
+        client.batches.cancel.assert_called_once_with("batch-1")
+        assert not state.exists()
+
+    def test_timeout_keeps_state_for_resume(self, tmp_path):
+        client = _client(status="in_progress")
+        state = tmp_path / "state.json"
+        batch = ResponsesBatch(client, state, poll_seconds=0, timeout_seconds=0)
+        batch.add("e1", context={"topic": "Funding"}, input="a")
+        with pytest.raises(TimeoutError):
+            batch.run()
+        assert json.loads(state.read_text())["batch_id"] == "batch-1"
+
+        client.batches.retrieve.return_value = MagicMock(status="completed", output_file_id="file-out")
+        client.files.content.return_value = MagicMock(text=json.dumps(
+            {"custom_id": "e1", "response": {"status_code": 200, "body": _body("done")}}
+        ))
+        resumed = ResponsesBatch(client, state, poll_seconds=0)
+        assert resumed.load()
+        assert resumed.wait() == {"e1": ({"topic": "Funding"}, "done")}
+        client.batches.create.assert_called_once()
+
+    def test_duplicate_custom_id_rejected(self, tmp_path):
+        batch = ResponsesBatch(MagicMock(), tmp_path / "s.json")
+        batch.add("e1", input="a")
+        with pytest.raises(ValueError):
+            batch.add("e1", input="b")
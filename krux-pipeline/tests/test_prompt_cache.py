@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from src.steps.summary import _summary_params
+from src.utils.prompt_cache import cached_system, cached_tools, log_cache_usage
+
+
+def test_cached_system_marks_breakpoint():
+    assert cached_system("prompt") == [
+        {"type": "text", "text": "prompt", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_cached_tools_marks_only_last_and_copies():
+    tools = [{"name": "a"}, {"name": "b"}]
+    out = cached_tools(tools)
+    assert "cache_control" not in out[0]
+    assert out[1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in tools[1]
+
+
+def test_log_cache_usage_handles_missing_fields():
+    response = SimpleNamespace(usage=SimpleNamespace(input_tokens=10, output_tokens=5, cache_read_input_tokens=900))
+    assert log_cache_usage("test", response) == {
+        "input_tokens": 10,
+        "output_tokens": 5,
+        "cache_read_input_tokens": 900,
+        "cache_creation_input_tokens": 0,
+    }
+
+
+def test_summary_params_cache_system_and_tool():
+    params = _summary_params({"output": "notes", "topic": "Others"})
+    assert params["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert params["tools"][-1]["cache_control"] == {"type": "ephemeral"}
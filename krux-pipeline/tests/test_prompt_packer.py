@@ -0,0 +1,54 @@
+from src.utils.prompt_packer import count_tokens, pack_record, pack_records, truncate_tokens
+
+
+ROWS = [
+    {"id": 1, "news_output": "OpenAI ships a new model", "news_date": "2026-03-04",
+     "created_at": "2026-03-04T10:00:00", "monitor_type": "rss", "research": "r" * 2000},
+    {"id": 2, "news_output": "Nvidia beats estimates", "news_date": "2026-03-04",
+     "created_at": "2026-03-04T11:00:00", "monitor_type": "rss", "research": ""},
+]
+
+
+class TestTruncateTokens:
+    def test_short_text_unchanged(self):
+        assert truncate_tokens("hello", 10) == "hello"
+
+    def test_long_text_is_cut(self):
+        text = "word " * 1000
+        out = truncate_tokens(text, 50)
+        assert out.endswith("…")
+        assert count_tokens(out) <= 52
+
+
+class TestPackRecords:
+    def test_drops_unlisted_and_empty_fields(self):
+        packed = pack_records(ROWS, required=["id", "news_output"], optional=["news_date", "research"])
+        assert packed.items[1] == {"id": 2, "news_output": "Nvidia beats estimates", "news_date": "2026-03-04"}
+        assert "created_at" not in packed.items[0]
+        assert packed.saved_tokens > 0
+        assert packed.original_tokens == packed.tokens + packed.saved_tokens
+
+    def test_caps_apply_per_field(self):
+        packed = pack_records(ROWS, required=["id"], optional=["research"], caps={"research": 20})
+        assert count_tokens(packed.items[0]["research"]) <= 22
+
+    def test_budget_fills_optional_fields_by_priority(self):
+        packed = pack_records(
+            ROWS, required=["id", "news_output"], optional=["news_date", "research"], budget=120,
+        )
+        assert all("news_date" in item for item in packed.items)
+        assert packed.items[0]["research"].endswith("…")
+        assert packed.tokens <= 120
+
+    def test_budget_drops_records_from_the_end(self):
+        packed = pack_records(ROWS, required=["id", "news_output"], budget=20)
+        assert [item["id"] for item in packed.items] == [1]
+        assert packed.dropped_records == 1
+
+    def test_deterministic(self):
+        args = dict(required=["id"], optional=["news_output", "research"], budget=200)
+        assert pack_records(ROWS, **args).to_json() == pack_records(ROWS, **args).to_json()
+
+    def test_pack_record_single(self):
+        packed = pack_record({"brief": "b", "id": "x"}, ["brief"])
+        assert packed.items == [{"brief": "b"}]
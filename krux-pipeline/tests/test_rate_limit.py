@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from src.utils import rate_limit
+from src.utils.rate_limit import ModelLimiter, configure_limits, limiter_for, parse_limits, rate_limited
+
+
+@pytest.fixture(autouse=True)
+def _isolated_limits(monkeypatch):
+    # configure_limits mutates the process-wide registry; give each test its own copy
+    monkeypatch.setattr(rate_limit, "_limits", dict(rate_limit._limits))
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"status_code": 429, "headers": {"retry-after": retry_after}})()
+
+
+def test_parse_limits():
+    assert parse_limits("openai=500/200000, anthropic:claude-sonnet-4-5=50") == {
+        "openai": (500.0, 200000.0),
+        "anthropic:claude-sonnet-4-5": (50.0, None),
+    }
+    assert parse_limits("") == {}
+
+
+@pytest.mark.parametrize("spec", ["openai=0", "openai=-5", "openai=500/0"])
+def test_parse_limits_rejects_non_positive_rates(spec):
+    with pytest.raises(ValueError):
+        parse_limits(spec)
+
+
+def test_limiter_is_shared_per_provider_and_model():
+    assert limiter_for("openai", "gpt-5-nano") is limiter_for("openai", "gpt-5-nano")
+    assert limiter_for("openai", "gpt-5-nano") is not limiter_for("openai", "gpt-5.4")
+
+
+def test_model_specific_limit_overrides_provider():
+    configure_limits({"anthropic:test-model": (120, None)})
+    assert limiter_for("anthropic", "test-model").requests.rate == 2.0
+    assert limiter_for("anthropic", "other-model").requests.rate == 50 / 60
+
+
+def test_token_bucket_spaces_large_requests():
+    limiter = ModelLimiter(requests_per_minute=6000, tokens_per_minute=6000)  # 100 tokens/s
+    limiter.tokens._tokens = 0
+    start = time.monotonic()
+    limiter.acquire(tokens=20)
+    assert time.monotonic() - start >= 0.18
+
+
+def test_429_pauses_every_caller_on_the_limiter():
+    configure_limits({"openai:pause-model": (6000, None)})
+
+    def create(**params):
+        raise _RateLimitError("0.2")
+
+    with pytest.raises(_RateLimitError):
+        rate_limited("openai", create)(model="pause-model", input="hi")
+
+    start = time.monotonic()
+    limiter_for("openai", "pause-model").acquire()
+    assert time.monotonic() - start >= 0.15
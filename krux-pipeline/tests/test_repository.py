@@ -0,0 +1,50 @@
+import httpx
+
+from bench.fakes import FakeSupabase, Profile, Service
+from src.repository import Repository
+from src.steps import content_selector
+from src.utils.http_pool import RequestCounter, request_kind, request_resource
+
+
+def _repo() -> Repository:
+    return Repository(FakeSupabase(Service("supabase", Profile()), Service("storage", Profile()), "2026-03-05T00:00:00"))
+
+
+def test_requests_are_attributed_to_tables_and_buckets():
+    base = "https://abc.supabase.co"
+    table = httpx.Request("GET", f"{base}/rest/v1/webhooks?select=id")
+    upload = httpx.Request("POST", f"{base}/storage/v1/object/article-image/a.png")
+    public = httpx.Request("GET", f"{base}/storage/v1/object/public/article-image/a.png")
+
+    assert request_resource(table) == "webhooks"
+    assert request_resource(upload) == request_resource(public) == "storage:article-image"
+    assert (request_kind(table), request_kind(upload)) == ("db", "storage")
+
+
+def test_counter_counts_every_request_on_the_shared_client():
+    counter = RequestCounter()
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[])))
+    counter.instrument(client)
+
+    for _ in range(3):
+        client.get("https://abc.supabase.co/rest/v1/webhooks")
+    client.post("https://abc.supabase.co/rest/v1/curation_audit", json={})
+
+    assert counter.calls == {"webhooks": 3, "curation_audit": 1}
+    assert counter.total == 4
+    assert counter.summary().startswith("4 requests")
+
+
+def test_curated_items_are_saved_in_one_batch_skipping_stored_ids(monkeypatch):
+    repo = _repo()
+    repo.client.seed("curation_selected_items", [{"id": 1, "event_id": "1_2026-03-05"}])
+    monkeypatch.setattr(content_selector, "repo", repo)
+    items = [
+        {"id": i, "news_date": "2026-03-05", "output": f"story {i}", "sources": [], "topic": "Others"}
+        for i in (1, 2, 3, 3)
+    ]
+
+    saved = content_selector.save_curated_items({"items": items})
+
+    assert [row["event_id"] for row in saved] == ["2_2026-03-05", "3_2026-03-05"]
+    assert repo.client.service.calls == 2  # one existence check, one insert
@@ -0,0 +1,201 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.steps import research
+from src.steps.research import TOPIC_PIPELINE, run
+
+
+def _events(topic, n):
+    return [
+        {"event_id": f"{topic}-{i}", "output": "o", "sources": [], "news_date": "2026-03-04", "topic": topic}
+        for i in range(n)
+    ]
+
+
+@patch("src.clients.repo.client")
+@patch("src.steps.research.research_single_event")
+@patch("src.steps.research.fetch_curated_by_topic")
+class TestResearchRun:
+    def test_runs_events_concurrently(self, mock_fetch, mock_research, mock_sb):
+        mock_fetch.side_effect = lambda d, n, topic: _events(topic, 2)
+        mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def slow(event, system_prompt, topic):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return "brief"
+
+        mock_research.side_effect = slow
+        results = run("2026-03-04", "2026-03-05", dry_run=True, max_workers=4)
+
+        assert results == {topic: 2 for topic, _ in TOPIC_PIPELINE}
+        assert 1 < peak <= 4
+
+    def test_events_dispatched_topic_by_topic(self, mock_fetch, mock_research, mock_sb):
+        mock_fetch.side_effect = lambda d, n, topic: _events(topic, 3)
+        mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+        mock_research.return_value = "brief"
+
+        run("2026-03-04", "2026-03-05", dry_run=True, max_workers=1)
+        topics = [call.args[2] for call in mock_research.call_args_list]
+        assert topics == [topic for topic, _ in TOPIC_PIPELINE for _ in range(3)]
+
+    def test_failures_and_fetch_errors_reported_per_topic(self, mock_fetch, mock_research, mock_sb):
+        first_topic = TOPIC_PIPELINE[0][0]
+
+        def fetch(d, n, topic):
+            if topic == first_topic:
+                raise RuntimeError("db down")
+            return _events(topic, 2)
+
+        mock_fetch.side_effect = fetch
+        mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+
+        def research_one(event, system_prompt, topic):
+            if event["event_id"].endswith("-1"):
+                raise ValueError("boom")
+            return "brief"
+
+        mock_research.side_effect = research_one
+
+        results = run("2026-03-04", "2026-03-05", dry_run=True)
+        assert results[first_topic] == "FAILED: db down"
+        assert all(results[topic] == 1 for topic, _ in TOPIC_PIPELINE[1:])
+        assert list(results) == [topic for topic, _ in TOPIC_PIPELINE]
+
+
+@patch("src.clients.repo.client")
+@patch("src.steps.research.research_single_event", return_value="brief")
+@patch("src.steps.research.fetch_curated_by_topic")
+def test_already_researched_prefetched_once(mock_fetch, mock_research, mock_sb):
+    mock_fetch.side_effect = lambda d, n, topic: _events(topic, 2)
+    in_query = mock_sb.table.return_value.select.return_value.in_
+    in_query.return_value.execute.return_value = MagicMock(
+        data=[{"event_id": f"{topic}-0"} for topic, _ in TOPIC_PIPELINE]
+    )
+
+    results = run("2026-03-04", "2026-03-05", dry_run=True)
+
+    assert results == {topic: 2 for topic, _ in TOPIC_PIPELINE}
+    assert in_query.call_count == 1
+    assert mock_research.call_count == len(TOPIC_PIPELINE)
+
+
+def test_rate_limiter_spaces_calls():
+    from src.utils.rate_limit import RateLimiter
+
+    limiter = RateLimiter(per_minute=600, burst=1)  # one call per 0.1s after the first
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.18
+
+
+@patch("src.steps.research.save_research")
+@patch("src.steps.research.research_single_event", return_value="live brief")
+@patch("src.steps.research.ResponsesBatch")
+@patch("src.clients.repo.client")
+@patch("src.steps.research.fetch_curated_by_topic")
+def test_batch_mode_saves_results_and_runs_stragglers_live(
+    mock_fetch, mock_sb, mock_batch_cls, mock_research, mock_save
+):
+    mock_fetch.side_effect = lambda d, n, topic: _events(topic, 2)
+    mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+    pending = mock_batch_cls.return_value
+    pending.load.return_value = False
+
+    def batch_results():
+        return {
+            call.args[0]: (call.kwargs["context"], None if call.args[0].endswith("-1") else "batched")
+            for call in pending.add.call_args_list
+        }
+
+    pending.run.side_effect = batch_results
+
+    results = run("2026-03-04", "2026-03-05", batch=True)
+
+    assert results == {topic: 2 for topic, _ in TOPIC_PIPELINE}
+    assert pending.add.call_count == 2 * len(TOPIC_PIPELINE)
+    assert pending.add.call_args.kwargs["model"] == "gpt-5-nano"
+    # every "-1" event failed in the batch and was researched live
+    assert mock_research.call_count == len(TOPIC_PIPELINE)
+    outputs = [call.args[0]["output"] for call in mock_save.call_args_list]
+    assert outputs.count("batched") == len(TOPIC_PIPELINE)
+
+
+@patch("src.steps.research.research_single_event")
+@patch("src.steps.research.ResponsesBatch")
+@patch("src.clients.repo.client")
+@patch("src.steps.research.fetch_curated_by_topic")
+def test_batch_dry_run_submits_nothing_and_keeps_a_pending_batch(mock_fetch, mock_sb, mock_batch_cls, mock_research):
+    mock_fetch.side_effect = lambda d, n, topic: _events(topic, 2)
+    mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+    pending = mock_batch_cls.return_value
+    pending.load.return_value = True  # an interrupted batch is waiting
+
+    results = run("2026-03-04", "2026-03-05", dry_run=True, batch=True)
+
+    assert results == {topic: 2 for topic, _ in TOPIC_PIPELINE}
+    pending.wait.assert_not_called()
+    pending.add.assert_not_called()
+    pending.run.assert_not_called()
+    mock_research.assert_not_called()
+
+
+@patch("src.steps.research.research_single_event", return_value="brief")
+@patch("src.steps.research.fetch_researched_event_ids", side_effect=RuntimeError("db down"))
+def test_failed_prefetch_researches_every_event(mock_prefetch, mock_research):
+    jobs = [("Funding", "sys", event) for event in _events("Funding", 2)]
+
+    assert research._research_events(jobs, dry_run=True) == {"Funding": (2, 0)}
+    assert mock_research.call_count == 2
+
+
+@patch("src.steps.research.research_single_event", side_effect=ValueError("boom"))
+@patch("src.steps.research.fetch_researched_event_ids", return_value=set())
+def test_repeated_event_shares_its_first_occurrence_outcome(mock_prefetch, mock_research):
+    event = _events("Funding", 1)[0]
+    jobs = [("Funding", "sys", event), ("Report", "sys", event)]
+
+    assert research._research_events(jobs, dry_run=True) == {"Funding": (0, 1), "Report": (0, 1)}
+    assert mock_research.call_count == 1
+
+
+@patch("src.steps.research.research_single_event", return_value="live brief")
+@patch("src.steps.research.fetch_researched_event_ids", return_value=set())
+@patch("src.steps.research.save_research")
+@patch("src.steps.research.ResponsesBatch")
+def test_failed_batch_is_cancelled_before_the_live_fallback(mock_batch_cls, mock_save, mock_prefetch, mock_research):
+    pending = mock_batch_cls.return_value
+    pending.run.side_effect = ConnectionError("batches.retrieve failed")
+    jobs = [("Funding", "sys", event) for event in _events("Funding", 2)]
+
+    assert research._research_events_batch(jobs) == {"Funding": (2, 0)}
+    pending.cancel.assert_called_once()
+    pending.done.assert_not_called()
+    assert mock_research.call_count == 2
+
+
+@patch("src.steps.research.save_research")
+@patch("src.steps.research.fetch_researched_event_ids")
+@patch("src.steps.research.ResponsesBatch")
+def test_resumed_batch_skips_events_researched_since(mock_batch_cls, mock_prefetch, mock_save):
+    interrupted = mock_batch_cls.return_value
+    interrupted.load.return_value = True
+    interrupted.wait.return_value = {
+        event_id: ({"topic": "Funding", "news_date": "2026-03-04"}, "batched") for event_id in ("e1", "e2")
+    }
+    mock_prefetch.return_value = {"e1"}
+
+    assert research.resume_research_batch() == 1
+    assert [call.args[0]["event_id"] for call in mock_save.call_args_list] == ["e2"]
+    interrupted.done.assert_called_once()
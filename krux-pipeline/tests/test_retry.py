@@ -58,3 +58,114 @@ class TestRetry:
 
         # Should not retry — TypeError is not in exceptions tuple
         assert call_count == 1
+
+
+class _HTTPError(Exception):
+    def __init__(self, status, headers):
+        super().__init__(f"HTTP {status}")
+        self.response = type("Response", (), {"status_code": status, "headers": headers})()
+
+
+class TestBackoff:
+    def test_retry_after_header_is_honoured(self):
+        from src.utils.retry import backoff_delay
+
+        wait = backoff_delay(1, 2, _HTTPError(429, {"retry-after": "7"}))
+        assert 7 <= wait <= 7 * 1.2
+
+    def test_retry_after_ms_takes_precedence(self):
+        from src.utils.retry import retry_after_seconds
+
+        assert retry_after_seconds(_HTTPError(429, {"retry-after-ms": "1500", "retry-after": "9"})) == 1.5
+
+    def test_http_date_retry_after(self):
+        from email.utils import format_datetime
+        from datetime import datetime, timedelta, timezone
+        from src.utils.retry import retry_after_seconds
+
+        when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        assert 25 <= retry_after_seconds(_HTTPError(503, {"retry-after": when})) <= 30
+
+    def test_without_header_uses_full_jitter(self):
+        from src.utils.retry import backoff_delay
+
+        waits = {backoff_delay(3, 2, ValueError("boom")) for _ in range(20)}
+        assert all(0 <= w <= 8 for w in waits)
+        assert len(waits) > 1
+
+    def test_status_code_from_response(self):
+        from src.utils.retry import status_code
+
+        assert status_code(_HTTPError(429, {})) == 429
+        assert status_code(ValueError("no response")) is None
+
+
+class TestCircuitBreaker:
+    def test_trips_after_consecutive_provider_failures_and_fails_fast(self):
+        import pytest
+        from src.utils.retry import CircuitOpenError, circuit_for
+
+        calls = 0
+
+        @retry(max_attempts=3, backoff_base=0, circuit="test-trip")
+        def outage():
+            nonlocal calls
+            calls += 1
+            raise _HTTPError(503, {})
+
+        circuit_for("test-trip").failure_threshold = 4
+        with pytest.raises(_HTTPError):
+            outage()
+        with pytest.raises(CircuitOpenError):
+            outage()
+
+        assert calls == 4  # 3 + 1, then the open circuit stops the 5th attempt
+        assert circuit_for("test-trip").state == "open"
+        with pytest.raises(CircuitOpenError):
+            outage()
+        assert calls == 4
+
+    def test_client_errors_do_not_trip(self):
+        import pytest
+        from src.utils.retry import circuit_for
+
+        @retry(max_attempts=3, backoff_base=0, circuit="test-4xx")
+        def bad_request():
+            raise _HTTPError(400, {})
+
+        circuit_for("test-4xx").failure_threshold = 2
+        with pytest.raises(_HTTPError):
+            bad_request()
+        assert circuit_for("test-4xx").state == "closed"
+
+    def test_half_open_probe_closes_on_success(self):
+        from src.utils.retry import CircuitBreaker
+
+        breaker = CircuitBreaker("probe", failure_threshold=1, reset_seconds=0)
+        breaker.record_failure(_HTTPError(500, {}))
+        assert breaker.state == "half-open"
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        import pytest
+        from src.utils.retry import CircuitBreaker, CircuitOpenError
+
+        breaker = CircuitBreaker("probe-fail", failure_threshold=1, reset_seconds=0)
+        breaker.record_failure(TimeoutError("slow"))
+        breaker.reset_seconds = 60
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.reset_seconds = 0
+        breaker.before_call()  # probe allowed
+        breaker.reset_seconds = 60
+        breaker.record_failure(TimeoutError("still slow"))
+        assert breaker.state == "open"
+        assert breaker.trips == 2
+
+    def test_circuit_states_reports_breakers(self):
+        from src.utils.retry import circuit_for, circuit_states
+
+        circuit_for("test-report")
+        assert circuit_states()["test-report"] == "closed"
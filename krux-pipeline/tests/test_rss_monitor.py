@@ -5,13 +5,15 @@ from time import struct_time
 import pytest
 
 from src.feeds import FeedSource, FEEDS
+from src.utils.feed_cache import FeedValidatorCache
 from src.steps.rss_monitor import (
     _entry_guid,
     _entry_published_date,
     _format_news_output,
     _is_too_old,
     _strip_html,
-    _is_already_seen,
+    _fetch_seen_guids,
+    _fetch_feed,
     _process_feed,
     run,
 )
@@ -23,6 +25,13 @@ def _make_time_struct(dt: datetime):
     return dt.timetuple()
 
 
+@pytest.fixture(autouse=True)
+def validator_cache(tmp_path):
+    cache = FeedValidatorCache(tmp_path / "rss_validators.json")
+    with patch("src.steps.rss_monitor._validators", cache):
+        yield cache
+
+
 # ── entry_guid ──
 
 
@@ -111,28 +120,123 @@ def test_format_news_output_no_summary():
     assert result == "TestCo: Title Only"
 
 
-# ── is_already_seen ──
+# ── fetch_seen_guids ──
+
+
+def _seen_query(mock_sb):
+    return mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.in_.return_value.execute
+
+
+@pytest.fixture(autouse=True)
+def empty_seen_set():
+    with patch("src.steps.rss_monitor._seen", set()):
+        yield
+
+
+@patch("src.clients.repo.client")
+def test_fetch_seen_guids_single_query(mock_sb):
+    _seen_query(mock_sb).return_value = MagicMock(data=[{"monitor_id": "guid-1"}])
+    assert _fetch_seen_guids(SAMPLE_FEED, ["guid-1", "guid-2", "guid-3"]) == {"guid-1"}
+    assert _seen_query(mock_sb).call_count == 1
+    mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.in_.assert_called_once_with(
+        "monitor_id", ["guid-1", "guid-2", "guid-3"]
+    )
+
+
+@patch("src.clients.repo.client")
+def test_fetch_seen_guids_uses_warm_set(mock_sb):
+    _seen_query(mock_sb).return_value = MagicMock(data=[{"monitor_id": "guid-1"}])
+    _fetch_seen_guids(SAMPLE_FEED, ["guid-1"])
+    assert _fetch_seen_guids(SAMPLE_FEED, ["guid-1"]) == {"guid-1"}
+    assert _seen_query(mock_sb).call_count == 1
+
+
+@patch("src.clients.repo.client")
+def test_fetch_seen_guids_none_seen(mock_sb):
+    _seen_query(mock_sb).return_value = MagicMock(data=[])
+    assert _fetch_seen_guids(SAMPLE_FEED, ["guid-1"]) == set()
+
+
+# ── fetch_feed ──
+
+
+_SAMPLE_RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>T</title>
+<item><guid>g1</guid><title>Post 1</title><link>https://example.com/1</link></item>
+</channel></rss>"""
+
+
+def _response(status_code=200, content=_SAMPLE_RSS, headers=None):
+    return MagicMock(status_code=status_code, content=content, headers=headers or {})
 
 
-@patch("src.steps.rss_monitor.supabase")
-def test_is_already_seen_true(mock_sb):
-    mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(data=[{"id": 1}])
-    assert _is_already_seen(SAMPLE_FEED, "guid-1") is True
+@patch("src.steps.rss_monitor.requests")
+def test_fetch_feed_uses_feed_timeout(mock_requests):
+    mock_requests.get.return_value = _response()
+    entries = _fetch_feed(SAMPLE_FEED)
+    assert [e["id"] for e in entries] == ["g1"]
+    _, kwargs = mock_requests.get.call_args
+    assert kwargs["timeout"] == SAMPLE_FEED.timeout
 
 
-@patch("src.steps.rss_monitor.supabase")
-def test_is_already_seen_false(mock_sb):
-    mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(data=[])
-    assert _is_already_seen(SAMPLE_FEED, "guid-1") is False
+@patch("src.steps.rss_monitor.requests")
+def test_fetch_feed_sends_validators_and_handles_304(mock_requests, validator_cache):
+    validator_cache.stage(SAMPLE_FEED.feed_id, '"v1"', "Wed, 04 Mar 2026 10:00:00 GMT", "h")
+    validator_cache.commit(SAMPLE_FEED.feed_id)
+    mock_requests.get.return_value = _response(status_code=304, content=b"")
+
+    assert _fetch_feed(SAMPLE_FEED) == []
+    _, kwargs = mock_requests.get.call_args
+    assert kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert kwargs["headers"]["If-Modified-Since"] == "Wed, 04 Mar 2026 10:00:00 GMT"
+
+
+@patch("src.clients.repo.client")
+@patch("src.steps.rss_monitor._fetch_seen_guids", return_value={"g1"})
+@patch("src.steps.rss_monitor.requests")
+def test_identical_body_skips_parse_after_commit(mock_requests, mock_seen, mock_sb, validator_cache):
+    mock_requests.get.return_value = _response(headers={"ETag": '"v2"'})
+
+    _process_feed(SAMPLE_FEED)
+    assert validator_cache.get(SAMPLE_FEED.feed_id)["etag"] == '"v2"'
+
+    with patch("src.steps.rss_monitor.feedparser.parse") as mock_parse:
+        assert _fetch_feed(SAMPLE_FEED) == []
+        mock_parse.assert_not_called()
+
+
+@patch("src.steps.rss_monitor.requests")
+def test_dry_run_does_not_commit_validators(mock_requests, validator_cache):
+    mock_requests.get.return_value = _response(headers={"ETag": '"v3"'})
+    with patch("src.steps.rss_monitor._fetch_seen_guids", return_value=set()):
+        _process_feed(SAMPLE_FEED, dry_run=True)
+    assert validator_cache.get(SAMPLE_FEED.feed_id) == {}
+
+
+def test_validator_cache_roundtrip(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = FeedValidatorCache(path)
+    cache.stage("f", "e", None, "h")
+    cache.commit("f")
+    cache.save()
+    assert FeedValidatorCache(path).request_headers("f") == {"If-None-Match": "e"}
 
 
 # ── process_feed ──
 
 
-@patch("src.steps.rss_monitor._is_already_seen", return_value=False)
+def _echo_inserts(mock_sb):
+    """Make supabase.table(...).insert(rows).execute() return the rows as data."""
+    mock_sb.table.return_value.insert.side_effect = lambda rows: MagicMock(
+        execute=MagicMock(return_value=MagicMock(data=rows))
+    )
+
+
+@patch("src.steps.rss_monitor._fetch_seen_guids", return_value=set())
 @patch("src.steps.rss_monitor._fetch_feed")
-@patch("src.steps.rss_monitor.supabase")
+@patch("src.clients.repo.client")
 def test_process_feed_inserts_new(mock_sb, mock_fetch, mock_seen):
+    _echo_inserts(mock_sb)
     now = datetime.now()
     mock_fetch.return_value = [
         {"id": "g1", "title": "Post 1", "summary": "S1", "link": "https://example.com/1", "published_parsed": _make_time_struct(now)},
@@ -140,12 +244,15 @@ def test_process_feed_inserts_new(mock_sb, mock_fetch, mock_seen):
     ]
     count = _process_feed(SAMPLE_FEED)
     assert count == 2
-    assert mock_sb.table.return_value.insert.call_count == 2
+    # One multi-row insert for the whole feed
+    assert mock_sb.table.return_value.insert.call_count == 1
+    rows = mock_sb.table.return_value.insert.call_args[0][0]
+    assert [r["monitor_id"] for r in rows] == ["g1", "g2"]
 
 
-@patch("src.steps.rss_monitor._is_already_seen", return_value=True)
+@patch("src.steps.rss_monitor._fetch_seen_guids", return_value={"g1"})
 @patch("src.steps.rss_monitor._fetch_feed")
-@patch("src.steps.rss_monitor.supabase")
+@patch("src.clients.repo.client")
 def test_process_feed_skips_seen(mock_sb, mock_fetch, mock_seen):
     now = datetime.now()
     mock_fetch.return_value = [
@@ -156,9 +263,9 @@ def test_process_feed_skips_seen(mock_sb, mock_fetch, mock_seen):
     mock_sb.table.return_value.insert.assert_not_called()
 
 
-@patch("src.steps.rss_monitor._is_already_seen", return_value=False)
+@patch("src.steps.rss_monitor._fetch_seen_guids", return_value=set())
 @patch("src.steps.rss_monitor._fetch_feed")
-@patch("src.steps.rss_monitor.supabase")
+@patch("src.clients.repo.client")
 def test_process_feed_dry_run(mock_sb, mock_fetch, mock_seen):
     now = datetime.now()
     mock_fetch.return_value = [
@@ -175,9 +282,9 @@ def test_process_feed_fetch_failure(mock_fetch):
     assert count == 0
 
 
-@patch("src.steps.rss_monitor._is_already_seen", return_value=False)
+@patch("src.steps.rss_monitor._fetch_seen_guids", return_value=set())
 @patch("src.steps.rss_monitor._fetch_feed")
-@patch("src.steps.rss_monitor.supabase")
+@patch("src.clients.repo.client")
 def test_process_feed_skips_old_entries(mock_sb, mock_fetch, mock_seen):
     old_date = datetime.now() - timedelta(days=10)
     mock_fetch.return_value = [
@@ -187,6 +294,18 @@ def test_process_feed_skips_old_entries(mock_sb, mock_fetch, mock_seen):
     assert count == 0
 
 
+@patch("src.steps.rss_monitor._fetch_seen_guids", return_value=set())
+@patch("src.steps.rss_monitor._fetch_feed")
+@patch("src.clients.repo.client")
+def test_process_feed_one_lookup_and_no_repeat_inserts(mock_sb, mock_fetch, mock_seen):
+    _echo_inserts(mock_sb)
+    now = datetime.now()
+    entry = {"id": "g1", "title": "Post", "link": "https://example.com/1", "published_parsed": _make_time_struct(now)}
+    mock_fetch.return_value = [entry, dict(entry), {**entry, "id": "g2"}]
+    assert _process_feed(SAMPLE_FEED) == 2
+    mock_seen.assert_called_once_with(SAMPLE_FEED, ["g1", "g1", "g2"])
+
+
 # ── run (all feeds) ──
 
 
@@ -204,6 +323,17 @@ def test_run_processes_all_feeds(mock_process):
     assert mock_process.call_count == len(FEEDS)
 
 
+def test_run_survives_feed_error():
+    def process(feed, dry_run):
+        if feed.feed_id == FEEDS[0].feed_id:
+            raise RuntimeError("db down")
+        return 1
+
+    with patch("src.steps.rss_monitor._process_feed", side_effect=process):
+        total = run()
+    assert total == len(FEEDS) - 1
+
+
 # ── feeds registry ──
 
 
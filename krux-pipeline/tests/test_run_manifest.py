@@ -0,0 +1,81 @@
+from src.utils.run_manifest import RunManifest
+from src.utils.stage_graph import Stage, StageGraph
+
+
+def _graph(manifest, calls, fail=()):
+    def research(event):
+        calls.append(("research", event["event_id"]))
+        if event["event_id"] in fail:
+            raise RuntimeError("research down")
+        return {"event_id": event["event_id"], "output": "brief"}
+
+    def summarize(article):
+        calls.append(("summary", article["event_id"]))
+        return {"id": len(calls), "event_id": article["event_id"]}
+
+    return StageGraph([
+        Stage("research", research, workers=2, key=lambda e: e["event_id"]),
+        Stage("summary", summarize, after="research", key=lambda a: a["event_id"]),
+    ], manifest=manifest)
+
+
+def test_manifest_round_trips_steps_and_items(tmp_path):
+    manifest = RunManifest.create(tmp_path, {"date": "2026-03-04", "step": None})
+    manifest.mark_step("rss_monitor", "done")
+    manifest.mark_item("research", "e1", "queued", input={"event_id": "e1"})
+    manifest.mark_item("research", "e1", "done", output={"event_id": "e1", "output": "x"})
+
+    loaded = RunManifest.load(tmp_path, manifest.run_id)
+
+    assert loaded.args == {"date": "2026-03-04", "step": None}
+    assert loaded.step_done("rss_monitor")
+    assert loaded.stage_items("research")["e1"] == {
+        "state": "done", "input": {"event_id": "e1"}, "output": {"event_id": "e1", "output": "x"},
+    }
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    manifest = RunManifest.create(tmp_path, {})
+    manifest.mark_step("stream", "running")
+    with open(manifest.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "step", "step": "str')
+
+    assert RunManifest.load(tmp_path, manifest.run_id).steps == {"stream": "running"}
+
+
+def test_resume_redoes_only_unfinished_work(tmp_path):
+    manifest = RunManifest.create(tmp_path, {})
+    calls = []
+    events = [{"event_id": "a"}, {"event_id": "b"}]
+    _graph(manifest, calls, fail={"b"}).run({"research": events})
+    assert ("summary", "a") in calls and ("summary", "b") not in calls
+
+    resumed = RunManifest.load(tmp_path, manifest.run_id)
+    calls.clear()
+    graph = _graph(resumed, calls)
+    stats = graph.run(graph.resume_inputs(resumed))
+
+    assert sorted(calls) == [("research", "b"), ("summary", "b")]
+    assert stats["research"].succeeded == 1
+
+
+def test_resume_hands_finished_outputs_to_stages_that_never_saw_them(tmp_path):
+    manifest = RunManifest.create(tmp_path, {})
+    manifest.mark_item("research", "a", "queued", input={"event_id": "a"})
+    manifest.mark_item("research", "a", "done", output={"event_id": "a", "output": "brief"})
+
+    calls = []
+    graph = _graph(manifest, calls)
+    assert graph.resume_inputs(manifest) == {"summary": [{"event_id": "a", "output": "brief"}]}
+
+
+def test_stages_without_checkpoint_stay_out_of_the_manifest_and_rerun_from_upstream(tmp_path):
+    manifest = RunManifest.create(tmp_path, {})
+    graph = StageGraph([
+        Stage("prompt", lambda x: {"id": x["id"]}, key=lambda x: str(x["id"])),
+        Stage("upload", lambda job: None, after="prompt", key=lambda job: str(job["id"]), checkpoint=False),
+    ], manifest=manifest)
+    graph.run({"prompt": [{"id": 1}]})
+
+    assert "upload" not in manifest.counts()
+    assert graph.resume_inputs(manifest) == {"upload": [{"id": 1}]}
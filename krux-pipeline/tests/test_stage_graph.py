@@ -0,0 +1,144 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.retry import CircuitOpenError
+from src.utils.stage_graph import Stage, StageGraph
+
+
+def test_items_stream_downstream_before_upstream_finishes():
+    finished_a, events = [], []
+    lock = threading.Lock()
+
+    def slow_a(x):
+        time.sleep(0.05 * x)
+        with lock:
+            finished_a.append(x)
+        return x
+
+    def b(x):
+        with lock:
+            events.append((x, len(finished_a)))
+        return None
+
+    stats = StageGraph([Stage("a", slow_a, workers=4), Stage("b", b, after="a")]).run({"a": [1, 2, 3, 4]})
+
+    assert stats["a"].succeeded == stats["b"].succeeded == 4
+    # item 1 reached b while later items were still in a
+    assert events[0][0] == 1 and events[0][1] < 4
+
+
+def test_failed_items_are_dropped_without_stopping_others():
+    def a(x):
+        if x == 2:
+            raise ValueError("boom")
+        if x == 3:
+            raise CircuitOpenError("openai circuit open")
+        return x * 10
+
+    seen = []
+    stats = StageGraph([
+        Stage("a", a, workers=2),
+        Stage("b", lambda x: seen.append(x), after="a"),
+    ]).run({"a": [1, 2, 3, 4]})
+
+    assert (stats["a"].succeeded, stats["a"].failed) == (2, 2)
+    assert sorted(seen) == [10, 40]
+
+
+def test_items_can_enter_mid_graph_and_fan_out():
+    seen = {"b": [], "c": []}
+    stats = StageGraph([
+        Stage("a", lambda x: x + 1),
+        Stage("b", lambda x: seen["b"].append(x), after="a"),
+        Stage("c", lambda x: seen["c"].append(x), after="a"),
+    ]).run({"a": [1], "b": [100]})
+
+    assert sorted(seen["b"]) == [2, 100]
+    assert seen["c"] == [2]
+    assert stats["b"].succeeded == 2
+
+
+def test_stage_concurrency_is_bounded():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work(x):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    StageGraph([Stage("a", work, workers=2)]).run({"a": list(range(8))})
+    assert peak == 2
+
+
+def test_bounded_queue_holds_back_upstream():
+    lock = threading.Lock()
+    produced, consumed, backlog = [0], [0], []
+
+    def fast(x):
+        with lock:
+            produced[0] += 1
+        return x
+
+    def slow(x):
+        time.sleep(0.01)
+        with lock:
+            consumed[0] += 1
+            backlog.append(produced[0] - consumed[0])
+
+    graph = StageGraph([
+        Stage("fast", fast, workers=2),
+        Stage("slow", slow, workers=1, after="fast", queue_size=2),
+    ])
+    stats = graph.run({"fast": list(range(20))})
+
+    assert stats["slow"].succeeded == 20
+    # at most 1 running + 2 queued downstream, plus 2 fast workers blocked handing off
+    assert max(backlog) <= 5
+
+
+def test_rejects_unknown_upstream():
+    with pytest.raises(ValueError):
+        StageGraph([Stage("b", lambda x: x, after="missing")])
+
+
+@patch("src.steps.stream.images")
+@patch("src.steps.stream.summary")
+@patch("src.steps.stream.research")
+def test_collect_inputs_starts_items_at_their_first_missing_stage(mock_research, mock_summary, mock_images):
+    from src.steps import stream
+
+    mock_research.TOPIC_PIPELINE = [("Funding", "sys")]
+    mock_research.fetch_curated_by_topic.return_value = [
+        {"event_id": "new"}, {"event_id": "new"}, {"event_id": "researched"}, {"event_id": "done"},
+    ]
+    mock_research.fetch_researched_event_ids.return_value = {"researched", "done"}
+    mock_summary.fetch_researched_articles.return_value = [
+        {"event_id": "researched"}, {"event_id": "done"}, {"event_id": "yesterday"},
+    ]
+    mock_summary.fetch_summarized_event_ids.return_value = {"done"}
+    mock_images.IMAGE_ROOT_STAGE = "image-prompt"
+    mock_images.fetch_articles_without_images.return_value = [{"id": 7}]
+
+    inputs = stream.collect_inputs("2026-03-05", "2026-03-06")
+
+    assert [event["event_id"] for event in inputs["research"]] == ["new"]
+    assert inputs["summary"] == [{"event_id": "researched"}]
+    assert inputs["image-prompt"] == [{"id": 7}]
+
+
+def test_stream_graph_runs_the_image_stages_after_summary():
+    from src.steps import stream
+
+    graph = stream.build_graph()
+
+    assert graph.children["summary"] == ["image-prompt"]
+    assert graph.children["image-prompt"] == ["image-generate"]
+    assert graph.children["image-encode"] == ["image-upload"]
@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+from src.steps.summary import run
+
+
+def _article(i):
+    return {"id": i, "event_id": f"e{i}", "news_date": "2026-03-04", "output": "notes", "topic": "Others"}
+
+
+@patch("src.clients.repo.client")
+@patch("src.steps.summary.generate_summary")
+@patch("src.steps.summary.fetch_researched_articles")
+def test_run_prefetches_existing_articles(mock_fetch, mock_generate, mock_sb):
+    mock_fetch.return_value = [_article(i) for i in range(3)]
+    mock_generate.side_effect = lambda a: {"headline": "h", "output": "o", "sources": []}
+    in_query = mock_sb.table.return_value.select.return_value.in_
+    in_query.return_value.execute.return_value = MagicMock(data=[{"event_id": "e1"}])
+
+    assert run("2026-03-04", "2026-03-05") == 3
+    in_query.assert_called_once_with("event_id", ["e0", "e1", "e2"])
+    assert mock_generate.call_count == 2
+    assert mock_sb.table.return_value.insert.call_count == 2
+
+
+def _batch_entry(custom_id, kind, summary=None):
+    entry = MagicMock(custom_id=custom_id)
+    entry.result.type = kind
+    if summary is not None:
+        entry.result.message.content = [MagicMock(input=summary)]
+    return entry
+
+
+@patch("src.steps.summary.time.sleep")
+@patch("src.steps.summary.claude")
+def test_batch_maps_results_by_event_id(mock_claude, mock_sleep):
+    from src.steps.summary import generate_summaries_batch
+
+    batches = mock_claude.messages.batches
+    batches.create.return_value = MagicMock(id="b1", processing_status="in_progress")
+    batches.retrieve.return_value = MagicMock(id="b1", processing_status="ended")
+    batches.results.return_value = [
+        _batch_entry("summary-1", "succeeded", {"headline": "two"}),
+        _batch_entry("summary-0", "errored"),
+    ]
+
+    result = generate_summaries_batch([_article(0), _article(1)], poll_seconds=0)
+
+    assert result == {"e1": {"headline": "two"}}
+    requests = batches.create.call_args.kwargs["requests"]
+    assert [r["custom_id"] for r in requests] == ["summary-0", "summary-1"]
+    assert requests[0]["params"]["tool_choice"] == {"type": "tool", "name": "write_article"}
+
+
+@patch("src.clients.repo.client")
+@patch("src.steps.summary.generate_summary")
+@patch("src.steps.summary.generate_summaries_batch")
+@patch("src.steps.summary.fetch_researched_articles")
+def test_run_batch_falls_back_to_sync_for_stragglers(mock_fetch, mock_batch, mock_generate, mock_sb):
+    mock_fetch.return_value = [_article(i) for i in range(6)]
+    mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+    mock_batch.return_value = {
+        f"e{i}": {"headline": f"h{i}", "output": "o", "sources": []} for i in range(5)
+    }
+    mock_generate.return_value = {"headline": "sync", "output": "o", "sources": []}
+
+    assert run("2026-03-04", "2026-03-05", batch=True) == 6
+    mock_generate.assert_called_once()
+    assert mock_generate.call_args[0][0]["event_id"] == "e5"
+
+
+@patch("src.clients.repo.client")
+@patch("src.steps.summary.generate_summary")
+@patch("src.steps.summary.claude")
+@patch("src.steps.summary.fetch_researched_articles")
+def test_batch_dry_run_submits_nothing(mock_fetch, mock_claude, mock_generate, mock_sb):
+    mock_fetch.return_value = [_article(i) for i in range(6)]
+    mock_sb.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+
+    assert run("2026-03-04", "2026-03-05", dry_run=True, batch=True) == 6
+    mock_claude.messages.batches.create.assert_not_called()
+    mock_generate.assert_not_called()
@@ -0,0 +1,110 @@
+"""
+circuit_breaker.py — Per-provider circuit breakers.
+
+Scenes run in parallel against the same providers, so once fal.ai (or
+Claude) has failed several times in a row every remaining call fails fast
+for a cool-down window instead of sleeping through its own retries. After
+the window one probe call is let through; its result closes or re-opens
+the circuit. Only provider-side failures (429, 5xx, connection errors and
+timeouts) count; a bad request or unusable model output is the caller's bug
+and never trips a circuit.
+"""
+
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+def _status_code(exc: BaseException) -> int | None:
+    """HTTP status of an SDK / requests error, if it carries one."""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_provider_failure(exc: BaseException) -> bool:
+    """Whether an error says the provider is down or overloaded (vs. a bad request)."""
+    code = _status_code(exc)
+    if code is not None:
+        return code == 429 or code >= 500
+    name = type(exc).__name__
+    return isinstance(exc, (ConnectionError, TimeoutError)) or "Connection" in name or "Timeout" in name
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 4, reset_seconds: float = 90.0):
+        self.name              = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds     = reset_seconds
+        self.failures          = 0
+        self.trips             = 0
+        self._opened_at        = None
+        self._probing          = False
+        self._lock             = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the provider is cooling down."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(
+                    f"{self.name} circuit open after {self.failures} consecutive failures"
+                )
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"  [circuit] {self.name} closed")
+            self.failures   = 0
+            self._opened_at = None
+            self._probing   = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        with self._lock:
+            probing, self._probing = self._probing, False
+            if not is_provider_failure(exc):
+                return
+            self.failures += 1
+            if probing or (self._opened_at is None and self.failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                print(
+                    f"  [circuit] {self.name} OPEN after {self.failures} consecutive failures "
+                    f"— failing fast for {self.reset_seconds:.0f}s"
+                )
+
+
+_circuits: dict[str, CircuitBreaker] = {}
+_circuits_lock = threading.Lock()
+
+
+def circuit_for(name: str) -> CircuitBreaker:
+    with _circuits_lock:
+        if name not in _circuits:
+            _circuits[name] = CircuitBreaker(name)
+        return _circuits[name]
+
+
+def circuit_summary() -> str:
+    """One line for the run summary, e.g. "anthropic=closed, fal=open (tripped 1x)"."""
+    with _circuits_lock:
+        circuits = sorted(_circuits.values(), key=lambda c: c.name)
+    return ", ".join(
+        f"{c.name}={c.state}" + (f" (tripped {c.trips}x)" if c.trips else "") for c in circuits
+    ) or "—"
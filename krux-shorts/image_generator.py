@@ -16,6 +16,7 @@ import anthropic
 from openai import OpenAI
 
 from config import ANTHROPIC_API_KEY, CLAUDE_SONNET, OPENAI_API_KEY, OUT_DIR
+from prompt_cache import cached_system, report_cache_usage
 from prompts import IMAGE_PROMPT_SYSTEM
 
 _claude  = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
@@ -36,9 +37,10 @@ def _generate_image_prompt(scene: dict) -> str:
             resp = _claude.messages.create(
                 model=CLAUDE_SONNET,
                 max_tokens=400,
-                system=IMAGE_PROMPT_SYSTEM,
+                system=cached_system(IMAGE_PROMPT_SYSTEM),
                 messages=[{"role": "user", "content": user_msg}],
             )
+            report_cache_usage("image_gen", scene["id"], resp)
             return resp.content[0].text.strip()
         except Exception as exc:
             print(f"  [image_gen] Claude prompt attempt {attempt} for {scene['id']} failed: {exc}")
@@ -86,4 +86,6 @@ print(f"\n{'=' * 60}")
 print(f"  PIPELINE COMPLETE  ({elapsed:.0f}s total)")
 print(f"  Output: {output_path}")
 print(f"  Title:  {storyboard['title']}")
+from circuit_breaker import circuit_summary
+print(f"  Circuits: {circuit_summary()}")
 print(f"{'=' * 60}\n")
@@ -0,0 +1,22 @@
+"""
+prompt_cache.py — Anthropic prompt-caching helpers.
+
+Every scene reuses the same large system prompt, so it is sent as a cached
+content block and each call reports how many input tokens were read from
+versus written to the cache.
+"""
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def cached_system(text: str) -> list[dict]:
+    """System prompt as a content block with a cache breakpoint."""
+    return [{"type": "text", "text": text, "cache_control": _EPHEMERAL}]
+
+
+def report_cache_usage(tag: str, label: str, resp) -> None:
+    usage = getattr(resp, "usage", None)
+    read  = getattr(usage, "cache_read_input_tokens", 0) or 0
+    write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    fresh = getattr(usage, "input_tokens", 0) or 0
+    print(f"  [{tag}] {label} tokens — input: {fresh}, cache read: {read}, cache write: {write}")
@@ -0,0 +1,132 @@
+"""
+prompt_packer.py — Fit prompt payloads to a token budget.
+
+Projects records onto the fields a prompt actually uses, caps long fields by
+token count instead of ad-hoc character slices, and reports tokens saved.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+try:  # exact counts when tiktoken is installed; otherwise a ~4 chars/token estimate
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except ImportError:  # pragma: no cover - depends on the environment
+    _ENCODING = None
+
+_MIN_TRUNCATED_TOKENS = 32  # don't bother squeezing in a field shorter than this
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:max_tokens]).rstrip() + "…"
+    return text[:max_tokens * 4].rstrip() + "…"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+@dataclass
+class PackResult:
+    items: list[dict]
+    tokens: int
+    original_tokens: int
+    dropped_records: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+    def to_json(self) -> str:
+        return _dumps(self.items)
+
+
+def pack_records(
+    records: list[dict],
+    required: list[str],
+    optional: list[str] | None = None,
+    budget: int | None = None,
+    caps: dict[str, int] | None = None,
+    label: str = "prompt",
+) -> PackResult:
+    """Project records onto the fields a prompt needs and fit them to a token budget.
+
+    ``required`` fields are always sent (subject to ``caps``); records that do
+    not fit the budget with just those fields are dropped from the end.
+    ``optional`` fields are then added in priority order — field by field,
+    record by record — while budget remains, truncating long strings to fit.
+    Keys not listed, and empty values, are never sent. The result is
+    deterministic for a given input.
+    """
+    optional = optional or []
+    caps = caps or {}
+    original_tokens = count_tokens(_dumps(records))
+
+    def fit(key, value):
+        if isinstance(value, str) and key in caps:
+            return truncate_tokens(value, caps[key])
+        return value
+
+    items: list[dict] = []
+    used = 2  # the enclosing []
+    for record in records:
+        item = {k: fit(k, record[k]) for k in required if not _is_empty(record.get(k))}
+        cost = count_tokens(_dumps(item)) + 1
+        if budget is not None and used + cost > budget:
+            break
+        items.append(item)
+        used += cost
+    dropped = len(records) - len(items)
+
+    for key in optional:
+        for record, item in zip(records, items):
+            value = record.get(key)
+            if _is_empty(value):
+                continue
+            value = fit(key, value)
+            cost = count_tokens(f'"{key}": {_dumps(value)}, ')
+            if budget is not None and used + cost > budget:
+                room = budget - used - count_tokens(f'"{key}": "", ') - 2  # slack for the ellipsis
+                if not isinstance(value, str) or room < _MIN_TRUNCATED_TOKENS:
+                    continue
+                value = truncate_tokens(value, room)
+                cost = count_tokens(f'"{key}": {_dumps(value)}, ')
+            item[key] = value
+            used += cost
+
+    result = PackResult(items, count_tokens(_dumps(items)), original_tokens, dropped)
+    logger.info(
+        "Packed %s: %d -> %d tokens (saved %d), %d/%d records",
+        label, result.original_tokens, result.tokens, result.saved_tokens,
+        len(items), len(records),
+    )
+    return result
+
+
+def pack_record(
+    record: dict,
+    required: list[str],
+    optional: list[str] | None = None,
+    budget: int | None = None,
+    caps: dict[str, int] | None = None,
+    label: str = "prompt",
+) -> PackResult:
+    """pack_records for a single dict; result.items holds at most one item."""
+    return pack_records([record], required, optional, budget, caps, label)
@@ -7,18 +7,36 @@ Actual schema (discovered 2026-03-24):
   research_assistant:    id, event_id, output, news_date, topic, created_at
 """
 
+import functools
 import json
 import time
 
 import anthropic
-from supabase import create_client
+import httpx
+from supabase import Client, create_client
+from supabase.lib.client_options import SyncClientOptions
 
 from config import ANTHROPIC_API_KEY, CLAUDE_OPUS, SUPABASE_KEY, SUPABASE_URL
+from prompt_packer import pack_records
 from prompts import STORY_SELECTION_SYSTEM
 
+_SELECT_TOKEN_BUDGET = 8_000
+
 
 # ── Supabase helpers ──────────────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=1)
+def _supabase() -> Client:
+    """One Supabase client per process, on a pooled HTTP/2 connection (needs h2)."""
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    http_client = httpx.Client(http2=http2, timeout=60)
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=SyncClientOptions(httpx_client=http_client))
+
+
 def _fetch_articles(sb) -> list[dict]:
     """Fetch the 30 most recent articles ordered by created_at DESC."""
     resp = (
@@ -78,22 +96,23 @@ def _normalise(article: dict, research_map: dict[str, str]) -> dict:
 def _call_claude_select(stories: list[dict]) -> dict:
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
-    candidates = [
-        {
-            "event_id":  s["event_id"],
-            "headline":  s["headline"],
-            "summary":   s["summary"][:500],
-            "topic":     s["topic"],
-            "research":  s["research"][:600] if s["research"] else "",
-            "news_date": s["news_date"],
-        }
-        for s in stories
-    ]
+    packed = pack_records(
+        stories,
+        required=["event_id", "headline", "summary"],
+        optional=["topic", "news_date", "research"],
+        budget=_SELECT_TOKEN_BUDGET,
+        caps={"summary": 125, "research": 150},
+        label="story selection",
+    )
+    print(
+        f"  [story_selector] Prompt packed to {packed.tokens} tokens "
+        f"(saved {packed.saved_tokens}, {len(packed.items)}/{len(stories)} stories)"
+    )
 
     user_msg = (
         f"Here are the most recent AI news stories. "
         f"Pick the ONE best for a cinematic short-form video:\n\n"
-        f"{json.dumps(candidates, indent=2)}"
+        f"{packed.to_json()}"
     )
 
     for attempt in range(1, 4):
@@ -124,7 +143,7 @@ def select_story() -> dict:
       event_id, headline, summary, research, source_url, news_date, topic,
       icp_reason, narrative_angle, tone
     """
-    sb = create_client(SUPABASE_URL, SUPABASE_KEY)
+    sb = _supabase()
 
     articles = _fetch_articles(sb)
     if not articles:
@@ -16,7 +16,9 @@ import anthropic
 import fal_client
 import requests
 
+from circuit_breaker import circuit_for
 from config import ANTHROPIC_API_KEY, CLAUDE_SONNET, OUT_DIR
+from prompt_cache import cached_system, report_cache_usage
 from prompts import ANIMATION_PROMPT_SYSTEM
 
 _claude = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
@@ -37,16 +39,21 @@ def _generate_animation_prompt(scene: dict) -> str:
         f"Scene description: {scene['scene_description']}\n"
         f"Animation intent: {scene['animation_intent']}"
     )
+    circuit = circuit_for("anthropic")
     for attempt in range(1, 4):
+        circuit.before_call()
         try:
             resp = _claude.messages.create(
                 model=CLAUDE_SONNET,
                 max_tokens=350,
-                system=ANIMATION_PROMPT_SYSTEM,
+                system=cached_system(ANIMATION_PROMPT_SYSTEM),
                 messages=[{"role": "user", "content": user_msg}],
             )
+            circuit.record_success()
+            report_cache_usage("animator", scene["id"], resp)
             return resp.content[0].text.strip()
         except Exception as exc:
+            circuit.record_failure(exc)
             print(f"  [animator] Claude attempt {attempt} for {scene['id']} failed: {exc}")
             if attempt < 3:
                 time.sleep(2 ** attempt)
@@ -71,8 +78,10 @@ def _animate_with_kling(image_url: str, animation_prompt: str, scene_id: str) ->
         "aspect_ratio": "9:16",
     }
 
+    circuit = circuit_for("fal")
     last_exc = None
     for model in KLING_MODELS:
+        circuit.before_call()
         try:
             print(f"  [animator] {scene_id} — submitting to {model}...")
 
@@ -94,10 +103,12 @@ def _animate_with_kling(image_url: str, animation_prompt: str, scene_id: str) ->
                 on_queue_update=_on_update,
             )
             video_url = result["video"]["url"]
+            circuit.record_success()
             print(f"  [animator] {scene_id} — clip ready: {video_url[:80]}...")
             return video_url
 
         except Exception as exc:
+            circuit.record_failure(exc)
             last_exc = exc
             print(f"  [animator] {scene_id} model {model} failed: {exc}")
             time.sleep(2)